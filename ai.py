@@ -0,0 +1,97 @@
+"""AI move selection as plain functions of a board, with no pygame or Game state.
+
+``choose_move`` is what ``Game.ai_move`` and the background ``AIWorker`` both
+call, so the same policies run in-process, on a thread or in a worker process.
+The NumPy-backed engines (perfect play table, tablebases, MCTS) are imported
+on first use, so worker processes that only need the rules start quickly.
+"""
+import random
+from typing import Optional
+
+from bitboard import BitBoard, STANDARD
+from search import DEFAULT_TIME_BUDGET_MS, Searcher
+
+DIFFICULTIES = ("easy", "hard", "perfect", "mcts")
+
+# Per-process MCTS engine, so tree reuse also works inside worker processes
+_mcts_searcher = None
+
+
+def default_mcts_searcher() -> "MCTSSearcher":
+    global _mcts_searcher
+    if _mcts_searcher is None:
+        from mcts import MCTSSearcher
+        _mcts_searcher = MCTSSearcher()
+    return _mcts_searcher
+
+
+def find_winning_cell(state: BitBoard, player: int) -> Optional[int]:
+    # First empty cell (in row-major order) that completes a line for player
+    for index in state.legal_moves():
+        if state.wins_with(index, player):
+            return index
+    return None
+
+
+def easy_move(state: BitBoard) -> Optional[int]:
+    # Random move with preference for center and corners
+    geometry = state.geometry
+    empty_cells = state.legal_moves()
+    if not empty_cells:
+        return None
+    weights = []
+    for index in empty_cells:
+        bit = 1 << index
+        if bit & geometry.center_mask:
+            weight = 3
+        elif bit & geometry.corner_mask:
+            weight = 2
+        else:  # Edges
+            weight = 1
+        weights.append(weight)
+    return random.choices(empty_cells, weights)[0]
+
+
+def choose_move(state: BitBoard, player: int, difficulty: str,
+                time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                searcher: Optional[Searcher] = None) -> Optional[int]:
+    """Cell index the AI plays for player, or None if the board is full.
+
+    searcher, if given, runs the hard/mcts search instead of a default one.
+    """
+    if not state.legal_mask():
+        return None
+
+    if difficulty == "perfect" and state.geometry.key == STANDARD.key:
+        # O(1) lookup in the precomputed table of optimal moves
+        import perfect_play
+        best_moves = perfect_play.get_table().best_moves(state, player)
+        if best_moves:
+            return random.choice(best_moves)
+
+    if difficulty != "easy":
+        # Exact answers for boards with a built tablebase (see tablebase.py)
+        from tablebase import get_tablebase
+        table = get_tablebase(state.geometry)
+        if table is not None:
+            best_moves = table.best_moves(state, player)
+            if best_moves:
+                return random.choice(best_moves)
+
+    # Take an immediate win, otherwise block the opponent's
+    for side in (player, 3 - player):
+        index = find_winning_cell(state, side)
+        if index is not None:
+            return index
+
+    if difficulty == "easy":
+        return easy_move(state)
+
+    if searcher is None:
+        if difficulty == "mcts":
+            searcher = default_mcts_searcher()
+            searcher.time_budget_ms = time_budget_ms
+        else:
+            # Iterative-deepening alpha-beta within the time budget
+            searcher = Searcher(time_budget_ms)
+    return searcher.search(state, player).move
@@ -0,0 +1,37 @@
+"""Background AI so searches never run on the render thread.
+
+``AIWorker.request_move`` returns a ``concurrent.futures.Future`` that the game
+loop polls once per frame. With ``use_processes=True`` the search runs in a
+separate process and does not compete with rendering for the GIL.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from ai import choose_move
+from bitboard import BitBoard
+from search import DEFAULT_TIME_BUDGET_MS
+
+
+class AIWorker:
+    def __init__(self, use_processes: bool = False, max_workers: int = 1):
+        self.use_processes = use_processes
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai")
+
+    def request_move(self, state: BitBoard, player: int, difficulty: str,
+                     time_budget_ms: float = DEFAULT_TIME_BUDGET_MS, searcher=None) -> Future:
+        # Snapshot the board so later moves on the UI side cannot race the search
+        if self.use_processes:
+            searcher = None  # Searchers hold tables and pools that stay in this process
+        return self._executor.submit(choose_move, state.copy(), player, difficulty,
+                                     time_budget_ms, searcher)
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
@@ -0,0 +1,81 @@
+"""Pre-rendered vertical gradient background with a horizontal wave.
+
+The gradient is drawn once per size and palette into a cached surface. Each
+frame then copies it to the screen in horizontal strips, each shifted by the
+wave offset at its centre, with a single ``Surface.blits`` call instead of a
+``pygame.draw.line`` per pixel row.
+"""
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+import pygame
+
+Color = Tuple[int, int, int]
+DEFAULT_STRIP_HEIGHT = 4
+
+
+def gradient_rows(top: Color, bottom: Color, height: int) -> np.ndarray:
+    """(height, 3) uint8 row colors, top to bottom, as the old per-line loop computed them."""
+    progress = np.arange(height) / height
+    start = np.array(top, dtype=float)
+    end = np.array(bottom, dtype=float)
+    # int() truncation, not rounding, to match the original colors exactly
+    return (start + (end - start) * progress[:, None]).astype(np.uint8)
+
+
+class GradientBackground:
+    """Cached gradient from top to bottom color, rebuilt only when the size or palette changes."""
+
+    def __init__(self, top: Color, bottom: Color, strip_height: int = DEFAULT_STRIP_HEIGHT):
+        self.top = top
+        self.bottom = bottom
+        self.strip_height = strip_height
+        self.builds = 0  # Number of times the gradient was rendered, for tests and profiling
+        self._surface: Optional[pygame.Surface] = None
+        self._key = None
+        self._strips = []
+        self._centers = None
+
+    def set_palette(self, top: Color, bottom: Color):
+        self.top, self.bottom = top, bottom
+
+    def invalidate(self):
+        self._surface = None
+        self._key = None
+
+    def surface_for(self, size: Tuple[int, int]) -> pygame.Surface:
+        key = (tuple(size), self.top, self.bottom, self.strip_height)
+        if key != self._key:
+            self._build(*size)
+            self._key = key
+        return self._surface
+
+    def _build(self, width: int, height: int):
+        rows = gradient_rows(self.top, self.bottom, height)
+        # surfarray is indexed (x, y), so repeat each row color across the width
+        pixels = np.broadcast_to(rows[None, :, :], (width, height, 3))
+        surface = pygame.surfarray.make_surface(np.ascontiguousarray(pixels))
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surface = surface.convert()  # Match the display format so blits are plain copies
+        self._surface = surface
+        self._strips = [(y, min(self.strip_height, height - y)) for y in range(0, height, self.strip_height)]
+        self._centers = np.array([y + h / 2 for y, h in self._strips])
+        self.builds += 1
+
+    def draw(self, target: pygame.Surface, wave: Optional[Callable[[np.ndarray], np.ndarray]] = None):
+        """Blit the gradient onto target, each strip shifted by wave(y) pixels.
+
+        wave takes an array of strip centre y coordinates and returns their x
+        offsets; the uncovered edge is left as it is on target.
+        """
+        width, height = target.get_size()
+        surface = self.surface_for((width, height))
+        if wave is None:
+            target.blit(surface, (0, 0))
+            return
+        offsets = np.rint(wave(self._centers)).astype(int).tolist()
+        # The gradient is constant along each row, so a shifted strip is just a narrower
+        # one; draw.line included its end point, hence the extra pixel for negative offsets
+        target.blits([(surface, (max(0, offset), y),
+                       (0, y, width - offset if offset >= 0 else width + offset + 1, h))
+                      for (y, h), offset in zip(self._strips, offsets)], doreturn=False)
@@ -0,0 +1,103 @@
+"""Vectorized winner detection and heuristic scoring for many boards at once.
+
+Every function takes an ``(N, H, W)`` integer array of boards (0 empty, 1 X,
+2 O) and does a handful of NumPy operations over the precomputed
+``Geometry.line_index_array``, instead of a Python loop per board. Results
+match ``BitBoard.winner`` and ``search.evaluate`` board for board.
+"""
+from typing import Optional, Sequence
+
+import numpy as np
+
+from bitboard import BitBoard, Geometry, get_geometry
+from search import WIN_SCORE
+
+IN_PROGRESS = -1  # batch_winners value for a game that is not over (check_winner's None)
+
+
+def _geometry_for(boards: np.ndarray, win_length: Optional[int]) -> Geometry:
+    if boards.ndim != 3:
+        raise ValueError(f"expected an (N, H, W) array of boards, got shape {boards.shape}")
+    _, height, width = boards.shape
+    if win_length is None:
+        win_length = min(width, height)  # Same default as BitBoard.from_array
+    return get_geometry(width, height, win_length)
+
+
+def _line_counts(boards: np.ndarray, geometry: Geometry):
+    # (N, lines) counts of X and O stones in every k-window
+    flat = boards.reshape(len(boards), -1)
+    lines = flat[:, geometry.line_index_array]
+    return (lines == 1).sum(axis=2), (lines == 2).sum(axis=2)
+
+
+def batch_winners(boards, win_length: Optional[int] = None) -> np.ndarray:
+    """Per board: 1 or 2 for a win, 0 for a full board, IN_PROGRESS otherwise."""
+    boards = np.asarray(boards)
+    geometry = _geometry_for(boards, win_length)
+    x_counts, o_counts = _line_counts(boards, geometry)
+    return _winners(boards, geometry, x_counts, o_counts)
+
+
+def _winners(boards, geometry, x_counts, o_counts) -> np.ndarray:
+    k = geometry.win_length
+    full = (boards.reshape(len(boards), -1) != 0).all(axis=1)
+    winners = np.where(full, 0, IN_PROGRESS).astype(np.int8)
+    # X is checked last so it wins ties, like BitBoard.winner
+    winners[(o_counts == k).any(axis=1)] = 2
+    winners[(x_counts == k).any(axis=1)] = 1
+    return winners
+
+
+def _threats(geometry, x_counts, o_counts) -> np.ndarray:
+    threat = geometry.win_length - 1
+    x_threats = ((x_counts == threat) & (o_counts == 0)).sum(axis=1)
+    o_threats = ((o_counts == threat) & (x_counts == 0)).sum(axis=1)
+    return np.stack([x_threats, o_threats], axis=1)
+
+
+def batch_threats(boards, win_length: Optional[int] = None) -> np.ndarray:
+    """(N, 2) counts of open k-1 lines (k-1 stones, the rest empty) for X and O."""
+    boards = np.asarray(boards)
+    geometry = _geometry_for(boards, win_length)
+    x_counts, o_counts = _line_counts(boards, geometry)
+    return _threats(geometry, x_counts, o_counts)
+
+
+def batch_scores(boards, win_length: Optional[int] = None) -> np.ndarray:
+    """``search.evaluate`` for every board, from player 2's point of view."""
+    boards = np.asarray(boards)
+    geometry = _geometry_for(boards, win_length)
+    x_counts, o_counts = _line_counts(boards, geometry)
+    winners = _winners(boards, geometry, x_counts, o_counts)
+    threats = _threats(geometry, x_counts, o_counts)
+
+    flat = boards.reshape(len(boards), -1)
+    center = np.array([i for i in range(geometry.cells) if geometry.center_mask >> i & 1])
+    corners = np.array([i for i in range(geometry.cells) if geometry.corner_mask >> i & 1])
+    center_cells = flat[:, center]
+    corner_cells = flat[:, corners]
+    scores = (3 * ((center_cells == 2).sum(axis=1) - (center_cells == 1).sum(axis=1))
+              + 2 * ((corner_cells == 2).sum(axis=1) - (corner_cells == 1).sum(axis=1))
+              + 5 * (threats[:, 1] - threats[:, 0]))
+    scores = np.where(winners == 2, WIN_SCORE, scores)
+    scores = np.where(winners == 1, -WIN_SCORE, scores)
+    return np.where(winners == 0, 0, scores)
+
+
+def states_to_array(states: Sequence[BitBoard]) -> np.ndarray:
+    """Stack BitBoards of one geometry into an (N, H, W) int8 array."""
+    if not states:
+        raise ValueError("no states to convert")
+    geometry = states[0].geometry
+    cells = geometry.cells
+    if cells <= 64:
+        # Unpack all bitboards at once through uint64 shifts
+        shifts = np.arange(cells, dtype=np.uint64)
+        x_bits = np.array([state.bits[1] for state in states], dtype=np.uint64)
+        o_bits = np.array([state.bits[2] for state in states], dtype=np.uint64)
+        boards = (((x_bits[:, None] >> shifts) & 1) + 2 * ((o_bits[:, None] >> shifts) & 1))
+        boards = boards.astype(np.int8)
+    else:
+        boards = np.stack([state.to_array() for state in states]).astype(np.int8)
+    return boards.reshape(len(states), geometry.height, geometry.width)
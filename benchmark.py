@@ -0,0 +1,352 @@
+"""Headless benchmarks for the AI and renderer, checked against stored baselines.
+
+Examples::
+
+    python benchmark.py                      # run everything, compare to benchmark_baseline.json
+    python benchmark.py --save-baseline      # record this machine's numbers as the new baseline
+    python benchmark.py -k search -k winner  # only benchmarks whose name contains a filter
+    python benchmark.py --threshold 0.15     # fail on a >15% drop instead of the default 25%
+    python benchmark.py --startup            # import times and time to first frame vs. budgets
+
+Each benchmark runs a fixed amount of work on fixed positions (opening,
+midgame and endgame on 3x3, plus a 7x7 k=4 midgame), so numbers only move
+when the code does. Every result has a throughput in units/sec (search
+nodes, moves, boards or frames) and the peak Python memory allocated by one
+call. The run exits 1 when any throughput falls, or any allocation peak
+grows, by more than the threshold relative to the baseline. Baselines
+depend on the machine: save them on the hardware you compare on.
+
+``--startup`` instead checks cold starts in fresh interpreters: each module's
+cumulative ``python -X importtime`` against ``IMPORT_BUDGET_MS``, and launch to
+first frame (``main.py --time-startup``) against ``FIRST_FRAME_BUDGET_MS``.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from ai import choose_move
+from batch_eval import batch_winners, states_to_array
+from bitboard import BitBoard, Geometry, get_geometry
+from core import Match
+from mcts import MCTSSearcher
+from search import Searcher
+from transposition import TranspositionTable
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+MIN_TIME = 0.2  # Seconds per timing round
+ROUNDS = 3
+
+# Cold-start budgets in ms; the headless modules must not pull in pygame or NumPy
+IMPORT_BUDGET_MS = {"core": 60, "ai": 80, "selfplay": 100, "server": 150, "main": 600}
+FIRST_FRAME_BUDGET_MS = 1500
+
+STANDARD = get_geometry()
+LARGE = get_geometry(7, 7, 4)
+
+# Fixed positions as move sequences from the empty board, X first
+CORPUS = {
+    "opening": (STANDARD, []),
+    "midgame": (STANDARD, [4, 0, 8]),
+    "endgame": (STANDARD, [4, 0, 8, 2, 1, 7]),
+    "7x7_midgame": (LARGE, [24, 25, 17, 31, 23, 18]),
+}
+
+
+def position(name: str):
+    """(state, player to move) for a corpus entry."""
+    geometry, moves = CORPUS[name]
+    state = BitBoard(geometry=geometry)
+    for ply, index in enumerate(moves):
+        state.make(index, 1 + ply % 2)
+    return state, 1 + len(moves) % 2
+
+
+class Benchmark(NamedTuple):
+    name: str
+    unit: str
+    # Builds the callable to time; each call returns how many units of work it did
+    setup: Callable[[], Callable[[], int]]
+
+
+def _search_nodes(corpus: str, depth: int):
+    def setup():
+        state, player = position(corpus)
+
+        def run():
+            # A fresh table each time so later rounds do not just hit cached results
+            searcher = Searcher(time_budget_ms=1e9, max_depth=depth, table=TranspositionTable())
+            return searcher.search(state, player).nodes
+        return run
+    return setup
+
+
+def _ai_moves(difficulty: str, corpus: str):
+    def setup():
+        state, player = position(corpus)
+        if difficulty == "hard":
+            make = lambda: Searcher(time_budget_ms=1e9, max_depth=4, table=TranspositionTable())
+        elif difficulty == "mcts":
+            make = lambda: MCTSSearcher(iterations=200, seed=0)
+        else:
+            make = lambda: None
+
+        def run():
+            choose_move(state, player, difficulty, searcher=make())
+            return 1
+        return run
+    return setup
+
+
+def _random_states(geometry: Geometry, count: int):
+    rng = random.Random(0)
+    states = []
+    for _ in range(count):
+        state = BitBoard(geometry=geometry)
+        moves = list(range(geometry.cells))
+        rng.shuffle(moves)
+        for ply, index in enumerate(moves[:rng.randint(0, geometry.cells)]):
+            state.make(index, 1 + ply % 2)
+        states.append(state)
+    return states
+
+
+def _winner_checks(geometry: Geometry):
+    def setup():
+        states = _random_states(geometry, 1000)
+
+        def run():
+            for state in states:
+                state.winner()
+            return len(states)
+        return run
+    return setup
+
+
+def _batch_winner_checks(geometry: Geometry):
+    def setup():
+        boards = states_to_array(_random_states(geometry, 1000))
+
+        def run():
+            batch_winners(boards, geometry.win_length)
+            return len(boards)
+        return run
+    return setup
+
+
+def _idle_matches(count: int):
+    def setup():
+        def run():
+            # Peak allocation / count is the memory cost of one open match, as a server holds them
+            matches = []
+            for i in range(count):
+                match = Match(geometry=STANDARD)
+                match.play(4)
+                match.play(i % 4)
+                matches.append(match)
+            return count
+        return run
+    return setup
+
+
+def _draw_board_frames(size: int, particles: int):
+    def setup():
+        import main
+        main.open_window()
+        game = main.Game(size, size, min(size, 5))
+        game.state = "game"
+        # A fixed, half-filled board with every stone fully faded in
+        for ply, index in enumerate(range(0, game.geometry.cells, 2)):
+            game.match.state.make(index, 1 + ply % 2)
+        for row in range(size):
+            for col in range(size):
+                game.cell_alphas[row][col].current = 255
+                game.cell_scales[row][col].current = 1.0
+        game.board_rotation.current = 1.5
+        game.board_scale.current = 1.05
+        game.particles.rng = np.random.default_rng(0)
+
+        def run():
+            if len(game.particles) < particles:
+                game.particles.clear()
+                for _ in range(particles // 20):
+                    game.add_particles(400, 400, main.PARTICLE_COLORS[0])
+            game.draw_board()
+            return 1
+        return run
+    return setup
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("search_nodes_opening", "nodes", _search_nodes("opening", 9)),
+    Benchmark("search_nodes_midgame", "nodes", _search_nodes("midgame", 6)),
+    Benchmark("search_nodes_7x7", "nodes", _search_nodes("7x7_midgame", 3)),
+    Benchmark("ai_move_easy", "moves", _ai_moves("easy", "opening")),
+    Benchmark("ai_move_hard_opening", "moves", _ai_moves("hard", "opening")),
+    Benchmark("ai_move_hard_endgame", "moves", _ai_moves("hard", "endgame")),
+    Benchmark("ai_move_perfect", "moves", _ai_moves("perfect", "midgame")),
+    Benchmark("ai_move_mcts_7x7", "moves", _ai_moves("mcts", "7x7_midgame")),
+    Benchmark("winner_3x3", "boards", _winner_checks(STANDARD)),
+    Benchmark("winner_7x7", "boards", _winner_checks(LARGE)),
+    Benchmark("batch_winner_7x7", "boards", _batch_winner_checks(LARGE)),
+    Benchmark("idle_matches_10k", "matches", _idle_matches(10000)),
+    Benchmark("draw_board_3x3", "frames", _draw_board_frames(3, 0)),
+    Benchmark("draw_board_3x3_1000_particles", "frames", _draw_board_frames(3, 1000)),
+    Benchmark("draw_board_15x15_4000_particles", "frames", _draw_board_frames(15, 4000)),
+]
+
+
+def measure(run: Callable[[], int], min_time: float = MIN_TIME, rounds: int = ROUNDS) -> Dict[str, float]:
+    """Best-of-rounds throughput and the peak bytes Python allocates during one call."""
+    run()  # Warm caches (perfect-play table, sprites, geometry) outside the timing
+    best = 0.0
+    for _ in range(rounds):
+        units = 0
+        start = time.perf_counter()
+        while True:
+            units += run()
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, units / elapsed)
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"per_sec": best, "peak_alloc_bytes": peak}
+
+
+def run_benchmarks(filters: Sequence[str] = (), min_time: float = MIN_TIME,
+                   rounds: int = ROUNDS) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for benchmark in BENCHMARKS:
+        if filters and not any(f in benchmark.name for f in filters):
+            continue
+        result = measure(benchmark.setup(), min_time, rounds)
+        result["unit"] = benchmark.unit
+        results[benchmark.name] = result
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Regression messages for results that are worse than baseline by more than threshold."""
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result["per_sec"] < base["per_sec"] * (1 - threshold):
+            failures.append(f"{name}: {result['per_sec']:.1f} {result['unit']}/sec is "
+                            f"{1 - result['per_sec'] / base['per_sec']:.0%} below baseline {base['per_sec']:.1f}")
+        if result["peak_alloc_bytes"] > base["peak_alloc_bytes"] * (1 + threshold) + 1024:
+            failures.append(f"{name}: peak allocation {result['peak_alloc_bytes']} bytes is above "
+                            f"baseline {base['peak_alloc_bytes']}")
+    return failures
+
+
+def load_baseline(path: str) -> Optional[Dict[str, dict]]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def save_baseline(path: str, results: Dict[str, dict]):
+    with open(path, "w") as f:
+        json.dump({"benchmarks": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of module in a fresh interpreter, as reported by -X importtime."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def first_frame_ms() -> float:
+    """Launch of main.py to its first presented frame, on the dummy video driver."""
+    result = subprocess.run([sys.executable, "main.py", "--time-startup", "--ai-worker", "none"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    return float(result.stdout.split()[-2])
+
+
+def run_startup(rounds: int = ROUNDS) -> List[str]:
+    """Print the best of rounds cold starts per check; returns the budget overruns."""
+    checks = [(f"import {module}", budget, lambda module=module: import_time_ms(module))
+              for module, budget in IMPORT_BUDGET_MS.items()]
+    checks.append(("first frame", FIRST_FRAME_BUDGET_MS, first_frame_ms))
+    failures = []
+    print(f"{'startup':<34} {'ms':>9} {'budget':>9}")
+    for name, budget, timer in checks:
+        best = min(timer() for _ in range(rounds))
+        print(f"{name:<34} {best:>9.1f} {budget:>9}")
+        if best > budget:
+            failures.append(f"{name}: {best:.1f} ms is over the {budget} ms budget")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the AI and rendering benchmarks")
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed regression as a fraction of the baseline")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds per timing round")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--startup", action="store_true",
+                        help="check import times and time to first frame against their budgets instead")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        failures = run_startup(args.rounds)
+        for failure in failures:
+            print(f"OVER BUDGET {failure}", file=sys.stderr)
+        return 1 if failures else 0
+
+    results = run_benchmarks(args.filters, args.min_time, args.rounds)
+    baseline = load_baseline(args.baseline) or {}
+    print(f"{'benchmark':<34} {'per sec':>12} {'unit':<7} {'baseline':>12} {'change':>8} {'peak KB':>9}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = f"{result['per_sec'] / base['per_sec'] - 1:+.0%}" if base else "-"
+        base_text = f"{base['per_sec']:.1f}" if base else "-"
+        print(f"{name:<34} {result['per_sec']:>12.1f} {result['unit']:<7} {base_text:>12} {change:>8} "
+              f"{result['peak_alloc_bytes'] / 1024:>9.1f}")
+
+    if args.save_baseline:
+        if args.filters:
+            # Keep the entries of benchmarks that were not run
+            baseline.update(results)
+            results = baseline
+        save_baseline(args.baseline, results)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
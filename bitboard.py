@@ -0,0 +1,378 @@
+"""Compact m,n,k game state: one integer bitboard per player.
+
+Cell (row, col) maps to bit ``row * width + col``. Player 1 is X and player 2
+is O, matching the values stored in ``Game.board``. Everything that depends
+only on the board shape (line masks, rays, symmetries) lives on a cached
+``Geometry`` so boards of the same size share it; the most recently used
+``GEOMETRY_CACHE_SIZE`` shapes stay cached, since a large one holds megabytes
+of tables. Compare geometries by ``key``, not identity. NumPy is only imported by
+the array conversions, so the rules and search load without it.
+"""
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(value: int) -> int:
+        return bin(value).count("1")
+
+# Row/column steps for the four line axes: horizontal, vertical, two diagonals
+AXES = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+GEOMETRY_CACHE_SIZE = 16
+
+# Symmetry tables are indexed by chunks of this many bits on large boards
+_SYMMETRY_CHUNK_BITS = 8
+
+
+class Geometry:
+    """Shape-dependent constants for a width x height board with k in a row."""
+
+    def __init__(self, width: int, height: int, win_length: int):
+        if width < 1 or height < 1:
+            raise ValueError("board dimensions must be positive")
+        if not 1 <= win_length <= max(width, height):
+            raise ValueError(f"win length {win_length} does not fit a {width}x{height} board")
+        self.width = width
+        self.height = height
+        self.win_length = win_length
+        self.key = (width, height, win_length)
+        self.cells = width * height
+        self.full_mask = (1 << self.cells) - 1
+
+        # Every k-long window along the four axes
+        lines = []
+        for row in range(height):
+            for col in range(width):
+                for dr, dc in AXES:
+                    end_row = row + dr * (win_length - 1)
+                    end_col = col + dc * (win_length - 1)
+                    if 0 <= end_row < height and 0 <= end_col < width:
+                        lines.append(tuple((row + dr * i, col + dc * i) for i in range(win_length)))
+        # Single-cell windows would be counted once per axis
+        self.lines: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(dict.fromkeys(lines))
+        self.line_masks: Tuple[int, ...] = tuple(self.mask_of(line) for line in self.lines)
+        self._line_cells: Dict[int, Tuple[Tuple[int, int], ...]] = dict(zip(self.line_masks, self.lines))
+        self.cell_lines: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(mask for mask in self.line_masks if mask >> i & 1) for i in range(self.cells)
+        )
+
+        # For every cell and axis, the bits walking outwards in both directions (at most k-1 each)
+        rays = []
+        for i in range(self.cells):
+            row, col = divmod(i, width)
+            axes = []
+            for dr, dc in AXES:
+                axes.append((self._ray(row, col, dr, dc), self._ray(row, col, -dr, -dc)))
+            rays.append(tuple(axes))
+        self.rays = tuple(rays)
+
+        center_rows = {(height - 1) // 2, height // 2}
+        center_cols = {(width - 1) // 2, width // 2}
+        self.center_mask = self.mask_of((r, c) for r in center_rows for c in center_cols)
+        self.corner_mask = self.mask_of(
+            [(0, 0), (0, width - 1), (height - 1, 0), (height - 1, width - 1)]
+        )
+
+        # Column masks used to stop shifts from wrapping around row ends
+        left_col = self.mask_of((r, 0) for r in range(height))
+        right_col = self.mask_of((r, width - 1) for r in range(height))
+        self._not_left = self.full_mask & ~left_col
+        self._not_right = self.full_mask & ~right_col
+
+        self._build_symmetries()
+
+    def __repr__(self):
+        return f"Geometry({self.width}, {self.height}, {self.win_length})"
+
+    def __reduce__(self):
+        # Pickle by shape so worker processes rebuild (and cache) the tables themselves
+        return (get_geometry, self.key)
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def cell(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.width)
+
+    def mask_of(self, cells) -> int:
+        mask = 0
+        for row, col in cells:
+            mask |= 1 << (row * self.width + col)
+        return mask
+
+    def line_cells(self, mask: int) -> Tuple[Tuple[int, int], ...]:
+        return self._line_cells[mask]
+
+    @cached_property
+    def line_index_array(self) -> "np.ndarray":
+        """(lines, k) array of flat cell indices, for vectorized line checks."""
+        import numpy as np
+        return np.array([[self.index(row, col) for row, col in line] for line in self.lines],
+                        dtype=np.intp).reshape(len(self.lines), self.win_length)
+
+    def _ray(self, row, col, dr, dc) -> Tuple[int, ...]:
+        bits = []
+        for step in range(1, self.win_length):
+            r, c = row + dr * step, col + dc * step
+            if not (0 <= r < self.height and 0 <= c < self.width):
+                break
+            bits.append(1 << (r * self.width + c))
+        return tuple(bits)
+
+    def neighbours(self, mask: int) -> int:
+        """Cells within one king step of any cell in mask (including mask itself)."""
+        width = self.width
+        horizontal = mask | ((mask << 1) & self._not_left) | ((mask >> 1) & self._not_right)
+        grown = horizontal | (horizontal << width) | (horizontal >> width)
+        return grown & self.full_mask
+
+    def _build_symmetries(self):
+        height, width = self.height, self.width
+        maps = [
+            lambda r, c: (r, c),
+            lambda r, c: (r, width - 1 - c),
+            lambda r, c: (height - 1 - r, c),
+            lambda r, c: (height - 1 - r, width - 1 - c),
+        ]
+        if width == height:
+            maps += [
+                lambda r, c: (c, height - 1 - r),
+                lambda r, c: (width - 1 - c, r),
+                lambda r, c: (c, r),
+                lambda r, c: (width - 1 - c, height - 1 - r),
+            ]
+        # Small boards get one table per transform; large ones are split into byte chunks
+        chunk_bits = self.cells if self.cells <= 12 else _SYMMETRY_CHUNK_BITS
+        self._chunk_bits = chunk_bits
+        self._chunk_mask = (1 << chunk_bits) - 1
+        tables = []
+        for transform in maps:
+            targets = [1 << self.index(*transform(*self.cell(i))) for i in range(self.cells)]
+            chunks = []
+            for start in range(0, self.cells, chunk_bits):
+                span = targets[start:start + chunk_bits]
+                chunk = []
+                for value in range(1 << len(span)):
+                    image = 0
+                    for bit, target in enumerate(span):
+                        if value >> bit & 1:
+                            image |= target
+                    chunk.append(image)
+                chunks.append(tuple(chunk))
+            tables.append(tuple(chunks))
+        self.symmetry_tables = tuple(tables)
+
+    def _transform(self, chunks, mask: int) -> int:
+        if len(chunks) == 1:
+            return chunks[0][mask]
+        image = 0
+        shift = 0
+        for chunk in chunks:
+            image |= chunk[(mask >> shift) & self._chunk_mask]
+            shift += self._chunk_bits
+        return image
+
+    def canonical_key(self, x_bits: int, o_bits: int) -> int:
+        """Smallest packed (x, o) pair over all board symmetries."""
+        cells = self.cells
+        transform = self._transform
+        return min((transform(chunks, x_bits) << cells) | transform(chunks, o_bits)
+                   for chunks in self.symmetry_tables)
+
+
+_geometries: "OrderedDict[Tuple[int, int, int], Geometry]" = OrderedDict()
+# Servers build geometries on executor threads while the loop thread reads the cache
+_geometries_lock = threading.Lock()
+
+
+def get_geometry(width: int = 3, height: int = 3, win_length: int = 3) -> Geometry:
+    geometry = cached_geometry(width, height, win_length)
+    if geometry is not None:
+        return geometry
+    key = (width, height, win_length)
+    # Built outside the lock: a 20x20 board takes a fraction of a second
+    geometry = Geometry(width, height, win_length)
+    with _geometries_lock:
+        geometry = _geometries.setdefault(key, geometry)
+        _geometries.move_to_end(key)
+        while len(_geometries) > GEOMETRY_CACHE_SIZE:
+            _geometries.popitem(last=False)
+    return geometry
+
+
+def cached_geometry(width: int, height: int, win_length: int) -> Optional[Geometry]:
+    """Like get_geometry, but None instead of building a shape that is not cached."""
+    key = (width, height, win_length)
+    with _geometries_lock:
+        geometry = _geometries.get(key)
+        if geometry is not None:
+            _geometries.move_to_end(key)
+        return geometry
+
+
+STANDARD = get_geometry(3, 3, 3)
+
+# Classic 3x3 constants, kept for code that only ever deals with the standard board
+ROWS = STANDARD.height
+COLS = STANDARD.width
+CELLS = STANDARD.cells
+FULL_MASK = STANDARD.full_mask
+LINES = STANDARD.lines
+LINE_MASKS = STANDARD.line_masks
+CELL_LINES = STANDARD.cell_lines
+CENTER_MASK = STANDARD.center_mask
+CORNER_MASK = STANDARD.corner_mask
+SYMMETRY_TABLES = tuple(chunks[0] for chunks in STANDARD.symmetry_tables)
+
+
+def cell_bit(row: int, col: int) -> int:
+    return 1 << (row * COLS + col)
+
+
+def canonical_key(x_bits: int, o_bits: int) -> int:
+    return STANDARD.canonical_key(x_bits, o_bits)
+
+
+class BitBoard:
+    __slots__ = ("bits", "geometry")
+
+    def __init__(self, x_bits: int = 0, o_bits: int = 0, geometry: Geometry = STANDARD):
+        # bits[0] is unused so that bits[player] works for player 1 and 2
+        self.bits = [0, x_bits, o_bits]
+        self.geometry = geometry
+
+    @classmethod
+    def from_array(cls, board, geometry: Optional[Geometry] = None) -> "BitBoard":
+        import numpy as np
+        board = np.asarray(board)
+        height, width = board.shape
+        if geometry is None:
+            geometry = STANDARD if (width, height) == (3, 3) else get_geometry(width, height, min(width, height))
+        elif (geometry.width, geometry.height) != (width, height):
+            raise ValueError(f"a {width}x{height} array does not match {geometry}")
+        state = cls(geometry=geometry)
+        for row in range(height):
+            for col in range(width):
+                value = int(board[row][col])
+                if value:
+                    state.bits[value] |= 1 << (row * width + col)
+        return state
+
+    def to_array(self) -> "np.ndarray":
+        import numpy as np
+        geometry = self.geometry
+        board = np.zeros(geometry.cells)
+        for player in (1, 2):
+            bits = self.bits[player]
+            for i in range(geometry.cells):
+                if bits >> i & 1:
+                    board[i] = player
+        return board.reshape(geometry.height, geometry.width)
+
+    def copy(self) -> "BitBoard":
+        return BitBoard(self.bits[1], self.bits[2], self.geometry)
+
+    def key(self) -> Tuple[int, int]:
+        return self.bits[1], self.bits[2]
+
+    def canonical_key(self) -> int:
+        return self.geometry.canonical_key(self.bits[1], self.bits[2])
+
+    @property
+    def occupied(self) -> int:
+        return self.bits[1] | self.bits[2]
+
+    def get(self, row: int, col: int) -> int:
+        bit = 1 << (row * self.geometry.width + col)
+        if self.bits[1] & bit:
+            return 1
+        if self.bits[2] & bit:
+            return 2
+        return 0
+
+    def legal_mask(self) -> int:
+        return self.geometry.full_mask & ~self.occupied
+
+    def legal_moves(self) -> List[int]:
+        free = self.legal_mask()
+        return [i for i in range(self.geometry.cells) if free >> i & 1]
+
+    def candidate_moves(self) -> List[int]:
+        """Legal moves worth searching: everything on 3x3, cells next to stones on larger boards."""
+        geometry = self.geometry
+        occupied = self.occupied
+        if geometry.cells <= CELLS:
+            return self.legal_moves()
+        if not occupied:
+            return [i for i in range(geometry.cells) if geometry.center_mask >> i & 1]
+        free = geometry.neighbours(occupied) & ~occupied
+        return [i for i in range(geometry.cells) if free >> i & 1]
+
+    def make(self, index: int, player: int):
+        self.bits[player] |= 1 << index
+
+    def unmake(self, index: int, player: int):
+        self.bits[player] &= ~(1 << index)
+
+    def is_full(self) -> bool:
+        return self.occupied == self.geometry.full_mask
+
+    def is_win(self, player: int) -> bool:
+        bits = self.bits[player]
+        for mask in self.geometry.line_masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def wins_with(self, index: int, player: int) -> bool:
+        """Whether placing (or having placed) player's stone at index completes k in a row.
+
+        Only the four axes through the cell are walked, so this is O(k) on any board size.
+        """
+        bits = self.bits[player] | (1 << index)
+        win_length = self.geometry.win_length
+        for forward, backward in self.geometry.rays[index]:
+            count = 1
+            for bit in forward:
+                if not bits & bit:
+                    break
+                count += 1
+            for bit in backward:
+                if not bits & bit:
+                    break
+                count += 1
+            if count >= win_length:
+                return True
+        return False
+
+    def result_after(self, index: int, player: int) -> Optional[int]:
+        # Game result once player's stone at index is on the board
+        if self.wins_with(index, player):
+            return player
+        if self.is_full():
+            return 0
+        return None
+
+    def winner(self) -> Optional[int]:
+        # Same contract as Game.check_winner: 1/2 for a win, 0 for a tie, None otherwise
+        if self.is_win(1):
+            return 1
+        if self.is_win(2):
+            return 2
+        if self.is_full():
+            return 0
+        return None
+
+    def winning_line(self, player: int, index: Optional[int] = None) -> Optional[int]:
+        # Restrict the search to lines through index when the winning move is known
+        bits = self.bits[player]
+        geometry = self.geometry
+        masks = geometry.line_masks if index is None else geometry.cell_lines[index]
+        for mask in masks:
+            if bits & mask == mask:
+                return mask
+        return None
@@ -0,0 +1,82 @@
+"""Headless match state and rules, with no pygame dependency.
+
+``Match`` is what ``Game`` wraps for display and what the self-play runner,
+the game server and other batch jobs drive directly. It holds only the
+position (a ``BitBoard``: two integers), the side to move, the result and the
+move history, in ``__slots__``, so a server can keep 100k+ idle matches in
+memory at roughly 300 bytes each.
+"""
+from typing import List, Optional, Tuple
+
+from bitboard import BitBoard, Geometry, get_geometry
+
+
+class Match:
+    __slots__ = ("geometry", "state", "current_player", "winner", "history")
+
+    def __init__(self, width: int = 3, height: int = 3, win_length: int = 3,
+                 geometry: Optional[Geometry] = None):
+        self.geometry = geometry or get_geometry(width, height, win_length)
+        self.reset()
+
+    def reset(self):
+        self.state = BitBoard(geometry=self.geometry)
+        self.current_player = 1
+        self.winner: Optional[int] = None  # 1 or 2 for a win, 0 for a tie
+        self.history: List[int] = []
+
+    def load(self, board):
+        # Replace the position with an ndarray-like board; history is unknown afterwards
+        self.state = BitBoard.from_array(board, self.geometry)
+        self.history = []
+
+    @property
+    def last_move(self) -> Optional[int]:
+        return self.history[-1] if self.history else None
+
+    @property
+    def is_over(self) -> bool:
+        return self.winner is not None
+
+    def is_legal(self, index: int) -> bool:
+        return self.winner is None and 0 <= index < self.geometry.cells and not self.state.occupied >> index & 1
+
+    def play(self, index: int) -> bool:
+        """Place the current player's stone at index; False if the move is not allowed."""
+        if not self.is_legal(index):
+            return False
+        player = self.current_player
+        self.state.make(index, player)
+        self.history.append(index)
+        # Only lines through this move can have been completed
+        result = self.state.result_after(index, player)
+        if result is not None:
+            self.winner = result
+        else:
+            self.current_player = 3 - player
+        return True
+
+    def undo(self) -> Optional[int]:
+        """Take back the last move and return its index; None if there is no history."""
+        if not self.history:
+            return None
+        index = self.history.pop()
+        player = self.current_player if self.winner is not None else 3 - self.current_player
+        self.state.unmake(index, player)
+        self.current_player = player
+        self.winner = None
+        return index
+
+    def play_at(self, row: int, col: int) -> bool:
+        return self.play(self.geometry.index(row, col))
+
+    def check_winner(self) -> Optional[int]:
+        # Full-board scan, for positions loaded without a move history
+        return self.state.winner()
+
+    def winning_line(self) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """Cells of the completed line, or None if nobody has won."""
+        if not self.winner:
+            return None
+        mask = self.state.winning_line(self.winner, self.last_move)
+        return None if mask is None else self.geometry.line_cells(mask)
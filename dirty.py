@@ -0,0 +1,74 @@
+"""Dirty-rectangle bookkeeping for redrawing only what changed on screen.
+
+Every frame each widget or layer calls ``track(key, rect, signature)`` with
+its screen bounds and a value that changes whenever its pixels would. A key
+whose bounds or signature differ from last frame dirties both its old and
+new bounds, and a key that is no longer tracked dirties its old bounds.
+``end_frame`` returns the merged rectangles for ``pygame.display.update``.
+"""
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+FULL_REDRAW_FRACTION = 0.6  # Past this much of the screen, one full rect is cheaper
+
+
+class DirtyTracker:
+    def __init__(self, size: Tuple[int, int]):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self._previous: Dict[Hashable, tuple] = {}
+        self._current: Dict[Hashable, tuple] = {}
+        self._rects: List[pygame.Rect] = []
+        self._full = True  # Nothing has been drawn yet
+
+    def full(self):
+        """Redraw the whole screen next frame, e.g. after a scene change or expose event."""
+        self._full = True
+
+    def add(self, rect):
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self._rects.append(rect)
+
+    def track(self, key: Hashable, rect: Optional[pygame.Rect], signature=None):
+        rect = None if rect is None else pygame.Rect(rect)
+        entry = (rect, signature)
+        self._current[key] = entry
+        old = self._previous.get(key)
+        if old != entry:
+            for bounds in (old[0] if old else None, rect):
+                if bounds is not None:
+                    self.add(bounds)
+
+    def end_frame(self) -> List[pygame.Rect]:
+        """Rectangles to redraw and push this frame; empty when nothing changed."""
+        for key, (rect, _) in self._previous.items():
+            if key not in self._current and rect is not None:
+                self.add(rect)
+        self._previous, self._current = self._current, {}
+        rects, self._rects = self._rects, []
+        if self._full:
+            self._full = False
+            return [self.screen_rect.copy()]
+        rects = merge_rects(rects)
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > FULL_REDRAW_FRACTION * self.screen_rect.width * self.screen_rect.height:
+            return [self.screen_rect.copy()]
+        return rects
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Union overlapping rectangles until none overlap."""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+def bounding_rect(rects: List[pygame.Rect]) -> Optional[pygame.Rect]:
+    return rects[0].unionall(rects[1:]) if rects else None
@@ -0,0 +1,127 @@
+"""Load generator for server.py: many concurrent clients playing random moves.
+
+Examples::
+
+    python loadgen.py --sessions 1000 --games 5                 # against a running server.py
+    python loadgen.py --spawn --sessions 2000 --difficulty easy  # start a server in this process
+
+Each session is one connection that plays ``games`` games, choosing a random
+empty cell for every human move. Latency is measured per request, from
+sending a line to reading the reply (which includes the AI's answer), and
+the run reports moves/sec (human and AI moves) with p50/p95/p99 latency.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from server import DEFAULT_PORT, GameServer
+
+PERCENTILES = (50, 95, 99)
+
+
+async def play_session(host: str, port: int, games: int, difficulty: str, width: int, height: int,
+                       win_length: int, latencies: List[float], rng: random.Random) -> int:
+    """Play games on one connection; returns the moves made, counting the AI's."""
+    reader, writer = await asyncio.open_connection(host, port)
+
+    async def request(message: dict) -> dict:
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not line:
+            raise ConnectionError("server closed the connection")
+        reply = json.loads(line)
+        if not reply["ok"]:
+            raise ConnectionError(reply["error"])
+        return reply
+
+    moves = 0
+    try:
+        for _ in range(games):
+            reply = await request({"op": "new", "difficulty": difficulty, "width": width,
+                                   "height": height, "win_length": win_length})
+            while reply["winner"] is None:
+                empty = [i for i, cell in enumerate(reply["board"]) if cell == "."]
+                reply = await request({"op": "move", "index": rng.choice(empty)})
+                moves += 1 + (reply["ai_move"] is not None)
+        writer.write(b'{"op": "quit"}\n')
+        await writer.drain()
+    finally:
+        writer.close()
+    return moves
+
+
+async def run_load(host: str, port: int, sessions: int, games: int = 1, difficulty: str = "easy",
+                   width: int = 3, height: int = 3, win_length: int = 3,
+                   seed: Optional[int] = None) -> Dict[str, float]:
+    """Run sessions concurrent clients and summarise throughput and latency."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(play_session(host, port, games, difficulty, width, height, win_length, latencies,
+                       random.Random(rng.random())) for _ in range(sessions)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    moves = sum(r for r in results if not isinstance(r, BaseException))
+    summary = {"sessions": sessions, "failed": sum(isinstance(r, BaseException) for r in results),
+               "moves": moves, "requests": len(latencies), "seconds": elapsed,
+               "moves_per_sec": moves / elapsed if elapsed else 0.0}
+    if latencies:
+        values = np.percentile(np.array(latencies), PERCENTILES)
+        summary.update({f"p{p}_ms": float(v) for p, v in zip(PERCENTILES, values)})
+    return summary
+
+
+async def _spawn_and_run(args):
+    from ai_worker import AIWorker
+    server = GameServer(AIWorker(use_processes=args.ai_worker == "process", max_workers=args.workers),
+                        max_sessions=max(args.sessions, 1), time_budget_ms=args.ai_time_ms)
+    await server.start(args.host, 0)
+    try:
+        return await run_load(args.host, server.port, args.sessions, args.games, args.difficulty,
+                              args.width, args.height, args.win_length, args.seed)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive server.py with concurrent random players")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=100, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=1, help="games per session")
+    parser.add_argument("--difficulty", default="easy")
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--height", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--spawn", action="store_true", help="run the server in this process on a free port")
+    parser.add_argument("--ai-worker", choices=["process", "thread"], default="process",
+                        help="worker kind for --spawn")
+    parser.add_argument("--workers", type=int, default=1, help="AI worker pool size for --spawn")
+    parser.add_argument("--ai-time-ms", type=float, default=50.0, help="AI budget for --spawn")
+    args = parser.parse_args(argv)
+
+    if args.spawn:
+        summary = asyncio.run(_spawn_and_run(args))
+    else:
+        summary = asyncio.run(run_load(args.host, args.port, args.sessions, args.games, args.difficulty,
+                                       args.width, args.height, args.win_length, args.seed))
+    print(f"{summary['sessions']} sessions ({summary['failed']} failed), {summary['moves']} moves "
+          f"in {summary['seconds']:.2f}s: {summary['moves_per_sec']:.0f} moves/sec")
+    if summary["requests"]:
+        print("latency " + "  ".join(f"p{p} {summary[f'p{p}_ms']:.1f} ms" for p in PERCENTILES))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,35 @@
+import time
+STARTED = time.perf_counter()  # Launch time, for --time-startup
+
 import pygame
 import sys
+import argparse
 import numpy as np
 from typing import Tuple, Optional
 import random
 import math
-
-# Initialize Pygame
-pygame.init()
+from concurrent.futures import BrokenExecutor
+from core import Match
+from transposition import shared_table
+from search import Searcher, evaluate, DEFAULT_TIME_BUDGET_MS
+from ai import choose_move
+from ai_worker import AIWorker
+from parallel_search import ParallelSearcher
+from mcts import MCTSSearcher
+from background import GradientBackground
+from particles import ParticlePool
+from surfaces import SurfacePool
+from text_cache import get_font, shared_text_cache
+from sprites import GRID_LINE_PAD, set_alpha, shared_atlas
+from dirty import DirtyTracker, bounding_rect
+from pacing import DEFAULT_AMBIENT_FPS, DEFAULT_FPS, DEFAULT_IDLE_FPS, FramePacer
+from profiler import FrameProfiler
+from record import RecordArchive, Replay
+from tween import AnimatedValue, TweenManager
 
 # Constants
 WINDOW_SIZE = 800
-BOARD_SIZE = 600
-CELL_SIZE = BOARD_SIZE // 3
+BOARD_SIZE = 600  # Longest side of the grid; cell size follows the board dimensions
 
 # Colors
 BACKGROUND = (78, 29, 112)  # Deep purple
@@ -29,100 +47,91 @@ WINNER_LINE_COLOR = (255, 214, 10)  # Bright yellow
 STATUS_GLOW_COLOR = (144, 58, 168)  # Purple glow for better contrast
 PARTICLE_COLORS = [(255, 89, 94), (10, 255, 157), (255, 214, 10), (255, 122, 89)]  # Vibrant colors
 
-class AnimatedValue:
-    def __init__(self, start=0, end=0, duration=20):
-        self.start = start
-        self.end = end
-        self.duration = duration
-        self.current = start
-        self.progress = 0
-        self.is_animating = False
-
-    def animate_to(self, end):
-        self.start = self.current
-        self.end = end
-        self.progress = 0
-        self.is_animating = True
-
-    def update(self):
-        if self.is_animating:
-            self.progress += 1
-            progress_ratio = min(1, self.progress / self.duration)
-            # Use ease-out cubic function for smooth animation
-            t = 1 - (1 - progress_ratio) ** 3
-            self.current = self.start + (self.end - self.start) * t
-            if self.progress >= self.duration:
-                self.is_animating = False
-                self.current = self.end
+BUTTON_FONT_SIZE = 32
+STATUS_FONT_SIZE = 40
+TITLE_FONT_SIZE = 80
+
+REPLAY_SPEEDS = (0.5, 1, 2, 4, 8, 16, 32)  # Moves per second, stepped with -/+ during a replay
+
+# AI difficulty for each "Player vs AI" menu button, in order
+AI_DIFFICULTIES = ["easy", "hard", "perfect", "mcts"]
+
+# The window surface; set by open_window, so importing this module starts nothing
+screen = None
+
+
+def open_window():
+    """Start pygame's display and create the game window, once; returns the window surface."""
+    global screen
+    if screen is None or not pygame.display.get_init():
+        pygame.display.init()
+        screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
+        pygame.display.set_caption("Tic Tac Toe!")
+    return screen
 
 class Button:
-    def __init__(self, x, y, width, height, text):
+    def __init__(self, x, y, width, height, text, tweens=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
         self.is_hovered = False
-        self.scale = AnimatedValue(1.0, 1.0)
-        self.alpha = AnimatedValue(255, 255)
+        self.scale = AnimatedValue(1.0, 1.0, tweens=tweens)
+        self.alpha = AnimatedValue(255, 255, tweens=tweens)
         self.bounce_offset = 0
         self.bounce_speed = random.uniform(0.02, 0.03)  # Much slower bounce
         self.time_offset = random.uniform(0, 2 * math.pi)
-        self.hover_glow = AnimatedValue(0, 0, duration=15)  # Smooth hover transition
+        self.hover_glow = AnimatedValue(0, 0, duration=15, tweens=tweens)  # Smooth hover transition
+        self._layout()
 
-    def draw(self, surface):
-        self.scale.update()
-        self.alpha.update()
-        self.hover_glow.update()
+    def update(self, bounce=True):
+        # Lay out for this frame (the game's TweenManager advances scale, alpha and glow);
+        # draw only renders the result
         
         # Add a very subtle bounce effect
-        self.bounce_offset = math.sin(pygame.time.get_ticks() * self.bounce_speed + self.time_offset) * 2
-        
+        if bounce:
+            self.bounce_offset = math.sin(pygame.time.get_ticks() * self.bounce_speed + self.time_offset) * 2
+        else:
+            self.bounce_offset = 0
+        self._layout()
+
+    def _layout(self):
         # Create a scaled rect for hover effect
         scaled_width = int(self.rect.width * self.scale.current)
         scaled_height = int(self.rect.height * self.scale.current)
         scaled_x = self.rect.centerx - scaled_width // 2
         scaled_y = self.rect.centery - scaled_height // 2 + self.bounce_offset
-        scaled_rect = pygame.Rect(scaled_x, scaled_y, scaled_width, scaled_height)
+        self.scaled_rect = pygame.Rect(scaled_x, scaled_y, scaled_width, scaled_height)
+
+    @property
+    def bounds(self):
+        # Screen area the button covers, including its hover glow
+        return self.scaled_rect.inflate(40, 40)
+
+    @property
+    def signature(self):
+        return (tuple(self.scaled_rect), self.is_hovered, int(self.alpha.current), int(self.hover_glow.current))
 
-        # Create button surface with alpha
-        button_surface = pygame.Surface((scaled_width, scaled_height), pygame.SRCALPHA)
+    def draw(self, surface):
+        scaled_rect = self.scaled_rect
+        scaled_x, scaled_y, scaled_width, scaled_height = scaled_rect
+
+        # Playful rounded button shape, with a fun border when hovered
+        atlas = shared_atlas()
         color = BUTTON_HOVER_COLOR if self.is_hovered else BUTTON_COLOR
-        
-        # Draw a more playful button shape with rounded corners
-        pygame.draw.rect(button_surface, (*color, int(self.alpha.current)), 
-                        button_surface.get_rect(), border_radius=25)
-        
-        # Add a fun border
-        if self.is_hovered:
-            border_color = (*GRID_COLOR, int(self.alpha.current))
-            pygame.draw.rect(button_surface, border_color,
-                           button_surface.get_rect(), border_radius=25, width=3)
+        button_surface = atlas.button_face((scaled_width, scaled_height), color, int(self.alpha.current),
+                                           GRID_COLOR if self.is_hovered else None)
         
         # Add a glow effect when hovered with smooth transition
         glow_alpha = int(self.hover_glow.current)
         if self.is_hovered and glow_alpha > 0:
-            glow_surface = pygame.Surface((scaled_width + 40, scaled_height + 40), pygame.SRCALPHA)
-            for i in range(20, 0, -2):
-                alpha = int((30 - (i * 1.5)) * glow_alpha / 255)
-                pygame.draw.rect(glow_surface, (*GRID_COLOR, alpha),
-                               pygame.Rect(20-i, 20-i, scaled_width+i*2, scaled_height+i*2),
-                               border_radius=25+i)
+            glow_surface = set_alpha(atlas.button_glow((scaled_width, scaled_height), GRID_COLOR), glow_alpha)
             surface.blit(glow_surface, (scaled_x-20, scaled_y-20))
 
         surface.blit(button_surface, (scaled_x, scaled_y))
         
         # Draw text with shadow
-        font_size = 32
-        text_font = pygame.font.Font(None, font_size)
-        
-        # Draw shadow
-        shadow_surface = text_font.render(self.text, True, (0, 0, 0))
-        shadow_rect = shadow_surface.get_rect(center=(scaled_rect.centerx + 2, scaled_rect.centery + 2))
-        shadow_surface.set_alpha(100)
-        surface.blit(shadow_surface, shadow_rect)
-        
-        # Draw main text
-        text_surface = text_font.render(self.text, True, TEXT_COLOR)
-        text_rect = text_surface.get_rect(center=scaled_rect.center)
-        surface.blit(text_surface, text_rect)
+        text_surface = shared_text_cache().shadowed(BUTTON_FONT_SIZE, self.text, TEXT_COLOR,
+                                                    (0, 0, 0), [(2, 2)], shadow_alpha=100)
+        surface.blit(text_surface, text_surface.get_rect(center=scaled_rect.center))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -130,61 +139,47 @@ class Button:
                 return True
         return False
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(4, 12)  # Bigger particles
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(3, 8)  # Faster particles
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        self.life = 1.0
-        self.decay = random.uniform(0.01, 0.03)  # Slower decay for longer-lasting particles
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2  # Stronger gravity effect
-        self.size = max(1, self.size * 0.99)  # Gradually shrink
-        self.life -= self.decay
-        return self.life > 0
-
-    def draw(self, surface):
-        alpha = int(self.life * 255)
-        size = int(self.size)
-        # Draw a more playful particle (small star-like shape)
-        points = []
-        for i in range(8):
-            angle = i * math.pi / 4
-            if i % 2 == 0:
-                radius = size
-            else:
-                radius = size / 2
-            points.append((
-                self.x + math.cos(angle) * radius,
-                self.y + math.sin(angle) * radius
-            ))
-        if len(points) >= 3:  # Need at least 3 points to draw a polygon
-            pygame.draw.polygon(surface, (*self.color, alpha), points)
-
 class Game:
-    def __init__(self):
+    def __init__(self, width=3, height=3, win_length=3, ai_time_budget_ms=DEFAULT_TIME_BUDGET_MS):
         self.state = "menu"
-        self.board = np.zeros((3, 3))
-        self.current_player = 1
-        self.winner = None
+        # Rules and position live in a headless Match; Game adds display and effects
+        self.match = Match(width, height, win_length)
+        self.geometry = self.match.geometry
+        self._board_view = None
+        self._board_view_key = None
+        self.transposition_table = shared_table()
+        self.searcher = Searcher(ai_time_budget_ms, table=self.transposition_table)
+        # Kept per game so the search tree carries over between AI turns
+        self.mcts = MCTSSearcher(ai_time_budget_ms)
+        # Set an AIWorker to run AI turns off the render thread (see run)
+        self.ai_worker = None
+        self._ai_request = None
         self.game_mode = None
+        # Set by start_replay; moves come from the record instead of clicks
+        self.replay = None
+        self._replay_ticks = None
+        # Shown on the status line in place of the turn until the next move
+        self.notice = None
         self.ai_difficulty = "medium"
         self.hover_cell = None
         self.animations = []
         self.winning_line = None
-        self.particles = []
-        
-        # Initialize fonts
-        self.font = pygame.font.Font(None, 40)
-        self.large_font = pygame.font.Font(None, 80)
+        self.particles = ParticlePool()
+        self.surfaces = SurfacePool()
+        self.background = GradientBackground(BACKGROUND, MENU_BG)
+        # Background wave, button bounce, grid pulse and idle sparkles, drawn at the ambient
+        # frame rate when nothing else moves; with these off, unchanged frames are not redrawn
+        self.animated_background = True
+        self.dirty = DirtyTracker((WINDOW_SIZE, WINDOW_SIZE))
+        self._drawn_state = None
+        # Stage timers and the F3 overlay; costs next to nothing while disabled
+        self.profiler = FrameProfiler()
+        # Milliseconds from launch to the first presented frame, set by run
+        self.first_frame_ms = None
+        # Every AnimatedValue below runs on this clock-driven scheduler
+        self.tweens = TweenManager()
+        self._update_layout()
+        self.text_cache = shared_text_cache()
         
         # Create menu buttons
         button_width = 300
@@ -192,234 +187,396 @@ class Game:
         center_x = WINDOW_SIZE // 2 - button_width // 2
         
         self.menu_buttons = [
-            Button(center_x, 250, button_width, button_height, "Player vs Player"),
-            Button(center_x, 350, button_width, button_height, "Player vs AI (Easy)"),
-            Button(center_x, 450, button_width, button_height, "Player vs AI (Hard)")
+            Button(center_x, 250, button_width, button_height, "Player vs Player", self.tweens),
+            Button(center_x, 350, button_width, button_height, "Player vs AI (Easy)", self.tweens),
+            Button(center_x, 450, button_width, button_height, "Player vs AI (Hard)", self.tweens),
+            Button(center_x, 550, button_width, button_height, "Player vs AI (Perfect)", self.tweens),
+            Button(center_x, 650, button_width, button_height, "Player vs AI (MCTS)", self.tweens)
         ]
 
         # Create back to menu and reset buttons
-        self.back_button = Button(20, 20, 200, 50, "Back to Menu")
-        self.reset_button = Button(WINDOW_SIZE - 220, 20, 200, 50, "Reset Game")
+        self.back_button = Button(20, 20, 200, 50, "Back to Menu", self.tweens)
+        self.reset_button = Button(WINDOW_SIZE - 220, 20, 200, 50, "Reset Game", self.tweens)
         
         # Animation properties
-        self.cell_alphas = [[AnimatedValue(0, 0) for _ in range(3)] for _ in range(3)]
-        self.cell_scales = [[AnimatedValue(0.5, 1.0) for _ in range(3)] for _ in range(3)]
-        self.board_rotation = AnimatedValue(0, 0, duration=40)
-        self.board_scale = AnimatedValue(1, 1, duration=30)
-        self.status_alpha = AnimatedValue(255, 255, duration=30)  # Start fully visible
+        width, height = self.geometry.width, self.geometry.height
+        tweens = self.tweens
+        self.cell_alphas = [[AnimatedValue(0, 0, tweens=tweens) for _ in range(width)] for _ in range(height)]
+        self.cell_scales = [[AnimatedValue(0.5, 1.0, tweens=tweens) for _ in range(width)] for _ in range(height)]
+        self.board_rotation = AnimatedValue(0, 0, duration=40, tweens=tweens)
+        self.board_scale = AnimatedValue(1, 1, duration=30, tweens=tweens)
+        self.status_alpha = AnimatedValue(255, 255, duration=30, tweens=tweens)  # Start fully visible
+
+    @property
+    def board(self):
+        # Read-only ndarray view of the bitboards, rebuilt only when the position changes
+        key = self._state.key()
+        if key != self._board_view_key:
+            view = self._state.to_array()
+            view.flags.writeable = False
+            self._board_view = view
+            self._board_view_key = key
+        return self._board_view
+
+    @board.setter
+    def board(self, value):
+        self.match.load(value)
+
+    @property
+    def _state(self):
+        return self.match.state
+
+    @property
+    def current_player(self):
+        return self.match.current_player
+
+    @current_player.setter
+    def current_player(self, value):
+        self.match.current_player = value
+
+    @property
+    def winner(self):
+        return self.match.winner
+
+    @winner.setter
+    def winner(self, value):
+        self.match.winner = value
+
+    @property
+    def last_move(self):
+        return self.match.last_move
+
+    # Fonts load on first draw, so a Game can be built without a window
+    @property
+    def font(self):
+        return get_font(STATUS_FONT_SIZE)
+
+    @property
+    def large_font(self):
+        return get_font(TITLE_FONT_SIZE)
+
+    def _update_layout(self):
+        # Cell size follows the board dimensions so every variant fits in BOARD_SIZE
+        geometry = self.geometry
+        self.cell_size = BOARD_SIZE // max(geometry.width, geometry.height)
+        self.grid_width = self.cell_size * geometry.width
+        self.grid_height = self.cell_size * geometry.height
+        # Top-left corner of the grid in window coordinates
+        self.grid_x = (WINDOW_SIZE - self.grid_width) // 2
+        self.grid_y = (WINDOW_SIZE - self.grid_height) // 2
+
+    def cell_at(self, pos):
+        # Board cell under a window position, or None outside the grid
+        x = pos[0] - self.grid_x
+        y = pos[1] - self.grid_y
+        if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+            return (y // self.cell_size, x // self.cell_size)
+        return None
+
+    def cell_center(self, row, col):
+        # Window coordinates of the middle of a cell
+        return (self.grid_x + col * self.cell_size + self.cell_size // 2,
+                self.grid_y + row * self.cell_size + self.cell_size // 2)
 
     def add_particles(self, x, y, color):
-        for _ in range(20):
-            self.particles.append(Particle(x, y, color))
+        self.particles.spawn(x, y, color, 20)
 
     def update_particles(self):
-        self.particles = [p for p in self.particles if p.update()]
+        with self.profiler.stage("update_particles"):
+            self.particles.update()
 
     def draw_particles(self):
-        particle_surface = pygame.Surface((WINDOW_SIZE, WINDOW_SIZE), pygame.SRCALPHA)
-        for particle in self.particles:
-            particle.draw(particle_surface)
-        screen.blit(particle_surface, (0, 0))
+        with self.profiler.stage("particles"):
+            self.particles.draw(screen)
+
+    @property
+    def buttons(self):
+        # Buttons shown in the current screen
+        return self.menu_buttons if self.state == "menu" else [self.back_button, self.reset_button]
+
+    def update_animations(self):
+        # Advance everything that moves by one frame, whether or not it gets redrawn;
+        # tweens go by elapsed time, so they keep their speed at any frame rate
+        self.tweens.update()
+        for button in self.buttons:
+            button.update(self.animated_background)
+        # Idle sparkles only join other motion; alone they would keep the loop at full rate
+        sparkles = self.animated_background and self._is_transitioning()
+        if self.state == "menu":
+            # Add random particles for fun
+            if sparkles and random.random() < 0.1:
+                x = random.randint(0, WINDOW_SIZE)
+                y = random.randint(0, WINDOW_SIZE)
+                self.add_particles(x, y, random.choice(PARTICLE_COLORS))
+        else:
+            self.advance_replay()
+            # Add particles along the winning line
+            if self.winning_line and sparkles and random.random() < 0.2:
+                (start_x, start_y), (end_x, end_y) = self.winning_line
+                progress = random.random()
+                self.add_particles(start_x + (end_x - start_x) * progress,
+                                   start_y + (end_y - start_y) * progress, random.choice(PARTICLE_COLORS))
+        self.update_particles()
+
+    def track_dirty(self):
+        # Report every widget's bounds and look, and collect what has to be redrawn
+        dirty = self.dirty
+        if self.state != self._drawn_state or self.animated_background:
+            # A new screen, or a background that moves everywhere
+            self._drawn_state = self.state
+            dirty.full()
+        for button in self.buttons:
+            dirty.track(button, button.bounds, button.signature)
+        if self.state == "game":
+            # Tilting or scaling moves the whole board; otherwise only changed cells are redrawn
+            dirty.track("board", self.board_bounds(),
+                        (self.board_rotation.current, self.board_scale.current, self.winner, self.winning_line))
+            board = self.board
+            for row in range(self.geometry.height):
+                for col in range(self.geometry.width):
+                    dirty.track(("cell", row, col), self.cell_bounds(row, col),
+                                (board[row, col], self.cell_alphas[row][col].current,
+                                 self.cell_scales[row][col].current, self.hover_cell == (row, col)))
+            text, color = self.status_text()
+            status = self.text_cache.shadowed(STATUS_FONT_SIZE, text, color, TEXT_SHADOW_COLOR,
+                                              [(3, 3), (2, 2), (1, 1)], shadow_alpha=178)
+            dirty.track("status", status.get_rect(center=(WINDOW_SIZE//2, 50)),
+                        (text, color, int(self.status_alpha.current)))
+        dirty.track("particles", self.particles.bounds(), (self.particles.frames, len(self.particles)))
+        if self.profiler.enabled:
+            dirty.track("profiler", self.profiler_overlay_rect(), self.profiler.frames)
+        return dirty.end_frame()
+
+    def render_frame(self):
+        """Advance one frame and draw what changed; returns the rects to push to the display."""
+        profiler = self.profiler
+        profiler.begin_frame()
+        with profiler.stage("update"):
+            self.update_animations()
+        rects = self.track_dirty()
+        if not rects:
+            # Idle frames are not timed, so they do not pull the percentiles down
+            profiler.begin_frame()
+            return rects
+        self.surfaces.begin_frame()
+        screen.set_clip(bounding_rect(rects))
+        screen.fill(BACKGROUND)
+        if self.state == "menu":
+            self.draw_menu()
+        else:
+            self.draw_board()
+        if profiler.enabled:
+            self.draw_profiler_overlay()
+        screen.set_clip(None)
+        profiler.end_frame()
+        return rects
+
+    def profiler_overlay_rect(self):
+        return pygame.Rect(10, WINDOW_SIZE - 20 - 18 * len(self.profiler.samples), 470, 18 * len(self.profiler.samples) + 10)
+
+    def draw_profiler_overlay(self):
+        # Rolling percentiles in milliseconds (counts for ai_nodes), drawn last
+        rect = self.profiler_overlay_rect()
+        panel = self.surfaces.acquire("profiler", rect.size)
+        panel.fill((0, 0, 0, 170))
+        font = get_font(20, None)
+        for i, line in enumerate(self.profiler.overlay_lines()):
+            panel.blit(font.render(line, True, TEXT_COLOR), (8, 6 + 18 * i))
+        screen.blit(panel, rect)
 
     def draw_menu(self):
-        # Create sophisticated gradient background with animated waves
-        t = pygame.time.get_ticks() / 1000
-        for y in range(WINDOW_SIZE):
-            progress = y / WINDOW_SIZE
-            color = tuple(int(a + (b - a) * progress) for a, b in zip(BACKGROUND, MENU_BG))
-            # Add multiple wave effects
-            wave1 = math.sin(y / 30 + t) * 8
-            wave2 = math.cos(y / 20 + t * 0.7) * 5
-            wave = wave1 + wave2
-            pygame.draw.line(screen, color, (max(0, wave), y), 
-                           (WINDOW_SIZE + min(0, wave), y))
-
-        # Draw title with improved shadow and glow
-        title_text = "Tic Tac Toe!"
-        title_surface = self.large_font.render(title_text, True, TEXT_COLOR)
-        title_rect = title_surface.get_rect(center=(WINDOW_SIZE//2, 120))
-        
-        # Draw multiple shadows for depth
-        shadow_offsets = [(4, 4), (3, 3), (2, 2)]
-        for offset_x, offset_y in shadow_offsets:
-            shadow_surface = self.large_font.render(title_text, True, TEXT_SHADOW_COLOR)
-            shadow_rect = shadow_surface.get_rect(center=(WINDOW_SIZE//2 + offset_x, 120 + offset_y))
-            screen.blit(shadow_surface, shadow_rect)
-        
-        # Draw main title
-        screen.blit(title_surface, title_rect)
-        
-        # Add random particles for fun
-        if random.random() < 0.1:
-            x = random.randint(0, WINDOW_SIZE)
-            y = random.randint(0, WINDOW_SIZE)
-            self.add_particles(x, y, random.choice(PARTICLE_COLORS))
+        profile = self.profiler.stage
+        with profile("background"):
+            # Create sophisticated gradient background with animated waves
+            if self.animated_background:
+                t = pygame.time.get_ticks() / 1000
+                # Add multiple wave effects
+                self.background.draw(screen, lambda y: np.sin(y / 30 + t) * 8 + np.cos(y / 20 + t * 0.7) * 5)
+            else:
+                self.background.draw(screen)
+
+        with profile("text"):
+            # Title and its multiple shadows for depth, composited once
+            title_surface = self.text_cache.shadowed(TITLE_FONT_SIZE, "Tic Tac Toe!", TEXT_COLOR,
+                                                     TEXT_SHADOW_COLOR, [(4, 4), (3, 3), (2, 2)])
+            screen.blit(title_surface, title_surface.get_rect(center=(WINDOW_SIZE//2, 120)))
         
-        # Draw buttons
-        for button in self.menu_buttons:
-            button.draw(screen)
+        with profile("buttons"):
+            for button in self.menu_buttons:
+                button.draw(screen)
         
         # Draw particles
-        self.update_particles()
         self.draw_particles()
 
+    def board_bounds(self):
+        # Screen rect of the rotated, scaled board surface
+        width, height = self.grid_width + 100, self.grid_height + 100
+        angle = math.radians(self.board_rotation.current)
+        scale = self.board_scale.current
+        cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+        rect = pygame.Rect(0, 0, (width * cos + height * sin) * scale + 2, (width * sin + height * cos) * scale + 2)
+        rect.center = (WINDOW_SIZE//2, WINDOW_SIZE//2)
+        return rect
+
+    def cell_bounds(self, row, col):
+        # Screen rect covering a cell once the board is rotated and scaled around the window centre
+        angle = math.radians(self.board_rotation.current)
+        scale = self.board_scale.current
+        cos, sin = math.cos(angle) * scale, math.sin(angle) * scale
+        left = col * self.cell_size - self.grid_width / 2
+        top = row * self.cell_size - self.grid_height / 2
+        xs, ys = [], []
+        for x in (left, left + self.cell_size):
+            for y in (top, top + self.cell_size):
+                # rotozoom turns counterclockwise on screen, with y pointing down
+                xs.append(x * cos + y * sin)
+                ys.append(y * cos - x * sin)
+        centre = WINDOW_SIZE // 2
+        rect = pygame.Rect(centre + min(xs), centre + min(ys), max(xs) - min(xs), max(ys) - min(ys))
+        return rect.inflate(8, 8)
+
+    def status_text(self):
+        # Status line text and color
+        if self.winner is not None:
+            if self.winner == 0:
+                return "It's a Tie!", STATUS_TEXT_COLOR
+            winner_symbol = 'X' if self.winner == 1 else 'O'
+            winner_color = PLAYER_X_COLOR if self.winner == 1 else PLAYER_O_COLOR
+            return f"Player {winner_symbol} wins!", winner_color
+        color = PLAYER_X_COLOR if self.current_player == 1 else PLAYER_O_COLOR
+        if self.ai_thinking:
+            dots = "." * (pygame.time.get_ticks() // 400 % 3 + 1)
+            return f"AI is thinking{dots}", color
+        current_symbol = 'X' if self.current_player == 1 else 'O'
+        if self.notice is not None:
+            return self.notice, color
+        if self.replay is not None:
+            return f"Replay {self.replay.position}/{len(self.replay.record.moves)} at {self.replay.moves_per_second:g}/s", color
+        return f"Player {current_symbol}'s turn", color
+
     def draw_board(self):
-        # Update animations
-        self.board_rotation.update()
-        self.board_scale.update()
-        self.status_alpha.update()
-        
-        # Create gradient background with wave effect
-        for y in range(WINDOW_SIZE):
-            progress = y / WINDOW_SIZE
-            color = tuple(int(a + (b - a) * progress) for a, b in zip(BACKGROUND, MENU_BG))
-            wave = math.sin(y / 40 + pygame.time.get_ticks() / 1500) * 3
-            pygame.draw.line(screen, color, (max(0, wave), y), 
-                           (WINDOW_SIZE + min(0, wave), y))
-
-        offset = (WINDOW_SIZE - BOARD_SIZE) // 2
-
-        # Create a surface for the board
-        board_surface = pygame.Surface((BOARD_SIZE + 100, BOARD_SIZE + 100), pygame.SRCALPHA)
-        board_rect = board_surface.get_rect(center=(WINDOW_SIZE//2, WINDOW_SIZE//2))
-
-        # Draw grid with enhanced glow effect
-        for i in range(1, 3):
-            for thickness in range(6, 0, -1):
-                alpha = 60 if thickness == 6 else 25
-                pulse = (math.sin(pygame.time.get_ticks() / 1000 + i) + 1) / 2
-                alpha = int(alpha * (0.7 + pulse * 0.3))
-                
-                # Vertical lines
-                pygame.draw.line(board_surface, (*GRID_COLOR, alpha),
-                               (50 + i * CELL_SIZE, 50),
-                               (50 + i * CELL_SIZE, BOARD_SIZE + 50), thickness)
-                # Horizontal lines
-                pygame.draw.line(board_surface, (*GRID_COLOR, alpha),
-                               (50, 50 + i * CELL_SIZE),
-                               (BOARD_SIZE + 50, 50 + i * CELL_SIZE), thickness)
+        profile = self.profiler.stage
+        with profile("background"):
+            # Create gradient background with wave effect
+            if self.animated_background:
+                t = pygame.time.get_ticks() / 1500
+                self.background.draw(screen, lambda y: np.sin(y / 40 + t) * 3)
+            else:
+                self.background.draw(screen)
+
+        # Reuse the board surface; everything is drawn within the grid plus the widest stroke
+        grid_width, grid_height = self.grid_width, self.grid_height
+        board_size = (grid_width + 100, grid_height + 100)
+        board_surface = self.surfaces.acquire("board", board_size)
+        self.surfaces.mark_dirty("board", board_size, pygame.Rect(50, 50, grid_width, grid_height).inflate(24, 24))
+
+        with profile("grid"):
+            self._draw_grid(board_surface)
+        with profile("pieces"):
+            self._draw_pieces(board_surface)
+        with profile("rotozoom"):
+            self._blit_board(board_surface)
+
+        with profile("buttons"):
+            # Draw back to menu and reset buttons
+            self.back_button.draw(screen)
+            self.reset_button.draw(screen)
+
+        with profile("text"):
+            self._draw_status()
+
+        # Draw particles
+        self.draw_particles()
+
+    def _draw_grid(self, board_surface):
+        cell_size = self.cell_size
+        grid_width, grid_height = self.grid_width, self.grid_height
+        width, height = self.geometry.width, self.geometry.height
+
+        # Draw grid with enhanced glow effect, from pre-rendered line sprites
+        atlas = shared_atlas()
+        vertical_line = atlas.grid_line(grid_height, True, GRID_COLOR)
+        horizontal_line = atlas.grid_line(grid_width, False, GRID_COLOR)
+        pad = GRID_LINE_PAD
+        for i in range(1, max(width, height)):
+            pulse = (math.sin(pygame.time.get_ticks() / 1000 + i) + 1) / 2 if self.animated_background else 1
+            alpha = 255 * (0.7 + pulse * 0.3)
+            if i < width:
+                board_surface.blit(set_alpha(vertical_line, alpha), (50 + i * cell_size - pad, 50 - pad))
+            if i < height:
+                board_surface.blit(set_alpha(horizontal_line, alpha), (50 - pad, 50 + i * cell_size - pad))
+
+    def _draw_pieces(self, board_surface):
+        atlas = shared_atlas()
+        cell_size = self.cell_size
+        width, height = self.geometry.width, self.geometry.height
 
         # Draw hover effect with pulsing animation
         if self.hover_cell and self.winner is None:
             row, col = self.hover_cell
             if self.board[row][col] == 0:
-                pulse = (math.sin(pygame.time.get_ticks() / 500) + 1) / 2
+                pulse = (math.sin(pygame.time.get_ticks() / 500) + 1) / 2 if self.animated_background else 1
                 hover_alpha = int(100 * (0.7 + pulse * 0.3))
-                rect = pygame.Rect(50 + col * CELL_SIZE, 50 + row * CELL_SIZE,
-                                 CELL_SIZE, CELL_SIZE)
-                hover_surface = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+                rect = pygame.Rect(50 + col * cell_size, 50 + row * cell_size,
+                                 cell_size, cell_size)
+                hover_surface = self.surfaces.acquire("hover", (cell_size, cell_size))
                 pygame.draw.rect(hover_surface, (*HOVER_COLOR[:3], hover_alpha), 
                                hover_surface.get_rect(), border_radius=10)
                 board_surface.blit(hover_surface, rect)
 
         # Draw X's and O's with enhanced animations
-        for row in range(3):
-            for col in range(3):
+        for row in range(height):
+            for col in range(width):
                 cell_value = self.board[row][col]
                 if cell_value != 0:
-                    self.cell_alphas[row][col].update()
-                    self.cell_scales[row][col].update()
-                    
-                    center_x = 50 + col * CELL_SIZE + CELL_SIZE // 2
-                    center_y = 50 + row * CELL_SIZE + CELL_SIZE // 2
+                    center_x = 50 + col * cell_size + cell_size // 2
+                    center_y = 50 + row * cell_size + cell_size // 2
                     scale = self.cell_scales[row][col].current
                     alpha = int(self.cell_alphas[row][col].current)
                     
+                    # Glyph with its glow, pre-rendered at this scale
                     if cell_value == 1:  # X
-                        color = (*PLAYER_X_COLOR, alpha)
-                        size = int(CELL_SIZE * 0.3 * scale)
-                        thickness = max(1, int(15 * scale))
-                        
-                        # Draw X with glow effect
-                        for i in range(3):
-                            glow_alpha = alpha // (i + 2)
-                            glow_thickness = thickness + i * 2
-                            pygame.draw.line(board_surface, (*PLAYER_X_COLOR, glow_alpha),
-                                           (center_x - size - i, center_y - size - i),
-                                           (center_x + size + i, center_y + size + i),
-                                           glow_thickness)
-                            pygame.draw.line(board_surface, (*PLAYER_X_COLOR, glow_alpha),
-                                           (center_x + size + i, center_y - size - i),
-                                           (center_x - size - i, center_y + size + i),
-                                           glow_thickness)
-                        
+                        glyph = atlas.x_glyph(cell_size, scale, PLAYER_X_COLOR)
                     else:  # O
-                        color = (*PLAYER_O_COLOR, alpha)
-                        radius = int(CELL_SIZE * 0.3 * scale)
-                        thickness = max(1, int(15 * scale))
-                        
-                        # Draw O with glow effect
-                        for i in range(3):
-                            glow_alpha = alpha // (i + 2)
-                            glow_thickness = thickness + i * 2
-                            pygame.draw.circle(board_surface, (*PLAYER_O_COLOR, glow_alpha),
-                                            (center_x, center_y), radius + i, glow_thickness)
+                        glyph = atlas.o_glyph(cell_size, scale, PLAYER_O_COLOR)
+                    set_alpha(glyph, alpha)
+                    board_surface.blit(glyph, glyph.get_rect(center=(center_x, center_y)))
 
         # Draw winning line with particle effects
         if self.winning_line:
-            start_pos, end_pos = self.winning_line
-            start_x = 50 + start_pos[1] * CELL_SIZE + CELL_SIZE // 2
-            start_y = 50 + start_pos[0] * CELL_SIZE + CELL_SIZE // 2
-            end_x = 50 + end_pos[1] * CELL_SIZE + CELL_SIZE // 2
-            end_y = 50 + end_pos[0] * CELL_SIZE + CELL_SIZE // 2
+            # winning_line is in window coordinates; the board surface has a 50px margin
+            (start_x, start_y), (end_x, end_y) = [
+                (x - self.grid_x + 50, y - self.grid_y + 50) for x, y in self.winning_line
+            ]
             
             # Draw line with glow effect
             for thickness in range(12, 0, -2):
                 alpha = 150 if thickness == 12 else 60
                 pygame.draw.line(board_surface, (*WINNER_LINE_COLOR, alpha),
                                (start_x, start_y), (end_x, end_y), thickness)
-            
-            # Add particles along the winning line
-            if random.random() < 0.2:
-                progress = random.random()
-                particle_x = start_x + (end_x - start_x) * progress
-                particle_y = start_y + (end_y - start_y) * progress
-                self.add_particles(particle_x, particle_y, random.choice(PARTICLE_COLORS))
 
+    def _blit_board(self, board_surface):
         # Apply board rotation and scale
-        rotated_surface = pygame.transform.rotozoom(board_surface, 
-                                                  self.board_rotation.current,
-                                                  self.board_scale.current)
+        if self.board_rotation.current == 0 and self.board_scale.current == 1:
+            rotated_surface = board_surface
+        else:
+            # rotozoom always returns a new surface
+            rotated_surface = pygame.transform.rotozoom(board_surface, 
+                                                      self.board_rotation.current,
+                                                      self.board_scale.current)
+            self.surfaces.note_transient()
         rotated_rect = rotated_surface.get_rect(center=(WINDOW_SIZE//2, WINDOW_SIZE//2))
         screen.blit(rotated_surface, rotated_rect)
 
-        # Draw back to menu and reset buttons
-        self.back_button.draw(screen)
-        self.reset_button.draw(screen)
-
+    def _draw_status(self):
         # Draw game status with improved visibility
-        if self.winner is not None:
-            if self.winner == 0:
-                status = "It's a Tie!"
-                status_color = STATUS_TEXT_COLOR
-            else:
-                winner_symbol = 'X' if self.winner == 1 else 'O'
-                winner_color = PLAYER_X_COLOR if self.winner == 1 else PLAYER_O_COLOR
-                status = f"Player {winner_symbol} wins!"
-                status_color = winner_color
-        else:
-            current_symbol = 'X' if self.current_player == 1 else 'O'
-            current_color = PLAYER_X_COLOR if self.current_player == 1 else PLAYER_O_COLOR
-            status = f"Player {current_symbol}'s turn"
-            status_color = current_color
-
-        # Draw status text with improved shadow
-        shadow_offsets = [(3, 3), (2, 2), (1, 1)]
-        for offset_x, offset_y in shadow_offsets:
-            shadow_surface = self.font.render(status, True, TEXT_SHADOW_COLOR)
-            shadow_rect = shadow_surface.get_rect(center=(WINDOW_SIZE//2 + offset_x, 50 + offset_y))
-            shadow_surface.set_alpha(int(self.status_alpha.current * 0.7))
-            screen.blit(shadow_surface, shadow_rect)
-
-        # Draw main status text
-        status_surface = self.font.render(status, True, status_color)
-        status_rect = status_surface.get_rect(center=(WINDOW_SIZE//2, 50))
-        status_surface.set_alpha(int(self.status_alpha.current))
-        screen.blit(status_surface, status_rect)
+        status, status_color = self.status_text()
 
-        # Draw particles
-        self.update_particles()
-        self.draw_particles()
+        # Draw status text with improved shadow; the shadows sit at 70% of the text's alpha
+        status_surface = self.text_cache.shadowed(STATUS_FONT_SIZE, status, status_color, TEXT_SHADOW_COLOR,
+                                                  [(3, 3), (2, 2), (1, 1)], shadow_alpha=178)
+        status_surface.set_alpha(int(self.status_alpha.current))
+        screen.blit(status_surface, status_surface.get_rect(center=(WINDOW_SIZE//2, 50)))
 
     def handle_click(self, pos):
         if self.state == "menu":
@@ -431,7 +588,7 @@ class Game:
                         self.game_mode = "pvp"
                     else:
                         self.game_mode = "ai"
-                        self.ai_difficulty = "easy" if i == 1 else "hard"
+                        self.ai_difficulty = AI_DIFFICULTIES[i - 1]
                     # Ensure status is visible immediately
                     self.status_alpha.current = 255
                     self.status_alpha.end = 255
@@ -440,6 +597,7 @@ class Game:
             # Handle back button click
             if self.back_button.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, {'pos': pos})):
                 self.state = "menu"
+                self.replay = None
                 self.reset()
                 return
             
@@ -448,26 +606,27 @@ class Game:
                 self.reset()
                 return
 
-            # Handle game board clicks
-            if self.winner is None:  # Only allow moves if game is not over
-                offset = (WINDOW_SIZE - BOARD_SIZE) // 2
-                if offset <= pos[0] <= offset + BOARD_SIZE and offset <= pos[1] <= offset + BOARD_SIZE:
-                    row = (pos[1] - offset) // CELL_SIZE
-                    col = (pos[0] - offset) // CELL_SIZE
-                    if 0 <= row < 3 and 0 <= col < 3:
-                        if self.board[row][col] == 0:  # Only make move if cell is empty
-                            self.make_move(row, col)
-                            if self.game_mode == "ai" and self.winner is None:
+            # Handle game board clicks; a replay plays its own moves
+            if self.winner is None and self.replay is None:  # Only allow moves if game is not over
+                cell = self.cell_at(pos)
+                if cell is not None:
+                    row, col = cell
+                    # Only make move if cell is empty and the AI is not on its turn
+                    if self._state.get(row, col) == 0 and not self.ai_thinking:
+                        self.make_move(row, col)
+                        if self.game_mode == "ai" and self.winner is None:
+                            if self.ai_worker is not None:
+                                self.request_ai_move()
+                            else:
                                 self.ai_move()
 
     def make_move(self, row, col):
-        if self.board[row][col] == 0 and self.winner is None:
-            self.board[row][col] = self.current_player
-            
+        player = self.match.current_player
+        if self.match.play_at(row, col):
+            self.notice = None
             # Add particle effect on move
-            center_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + col * CELL_SIZE + CELL_SIZE // 2
-            center_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + row * CELL_SIZE + CELL_SIZE // 2
-            color = PLAYER_X_COLOR if self.current_player == 1 else PLAYER_O_COLOR
+            center_x, center_y = self.cell_center(row, col)
+            color = PLAYER_X_COLOR if player == 1 else PLAYER_O_COLOR
             self.add_particles(center_x, center_y, color)
             
             # Animate the cell
@@ -478,10 +637,8 @@ class Game:
             self.board_rotation.animate_to(random.uniform(-2, 2))
             self.board_scale.animate_to(1.05)
             
-            # Check for winner or tie
-            winner = self.check_winner()
+            winner = self.match.winner
             if winner is not None:  # This includes both win (1 or 2) and tie (0)
-                self.winner = winner
                 if winner != 0:  # Only set winning line if it's not a tie
                     self.winning_line = self.get_winning_line()
                 self.status_alpha.animate_to(255)  # Fade in the winner/tie status
@@ -491,263 +648,193 @@ class Game:
                     y = random.randint(0, WINDOW_SIZE)
                     self.add_particles(x, y, random.choice(PARTICLE_COLORS))
             else:
-                self.current_player = 3 - self.current_player
                 self.status_alpha.animate_to(255)  # Fade in the new player's turn status
 
     def reset(self):
-        self.board = np.zeros((3, 3))
-        self.current_player = 1
-        self.winner = None
+        self.cancel_ai()
+        self.match.reset()
+        self.notice = None
         self.winning_line = None
-        for row in range(3):
-            for col in range(3):
+        if self.replay is not None:
+            # Reset during a replay starts it over
+            self.replay = Replay(self.replay.record, self.replay.moves_per_second)
+            self._replay_ticks = None
+        for row in range(self.geometry.height):
+            for col in range(self.geometry.width):
                 self.cell_alphas[row][col].current = 0
                 self.cell_scales[row][col].current = 0.5
 
-    def ai_move(self):
-        if self.ai_difficulty == "easy":
-            # Random empty cell with some basic strategy
-            empty_cells = [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == 0]
-            if empty_cells:
-                # Check if AI can win in one move
-                for row, col in empty_cells:
-                    self.board[row][col] = 2
-                    if self.check_winner() == 2:
-                        self.board[row][col] = 0
-                        self.make_move(row, col)
-                        return
-                    self.board[row][col] = 0
-                
-                # Check if player can win in one move and block
-                for row, col in empty_cells:
-                    self.board[row][col] = 1
-                    if self.check_winner() == 1:
-                        self.board[row][col] = 0
-                        self.make_move(row, col)
-                        return
-                    self.board[row][col] = 0
-                
-                # Otherwise make a random move with preference for center and corners
-                weights = []
-                for row, col in empty_cells:
-                    if row == 1 and col == 1:  # Center
-                        weight = 3
-                    elif (row, col) in [(0,0), (0,2), (2,0), (2,2)]:  # Corners
-                        weight = 2
-                    else:  # Edges
-                        weight = 1
-                    weights.append(weight)
-                
-                total_weight = sum(weights)
-                choice = random.uniform(0, total_weight)
-                cumulative_weight = 0
-                for i, weight in enumerate(weights):
-                    cumulative_weight += weight
-                    if choice <= cumulative_weight:
-                        row, col = empty_cells[i]
-                        self.make_move(row, col)
-                        break
+    def start_replay(self, record, moves_per_second=2.0):
+        """Show record's game from the start, playing moves_per_second moves a second."""
+        if (record.width, record.height, record.win_length) != self.geometry.key:
+            raise ValueError(f"record is for {record.width}x{record.height} k={record.win_length}, "
+                             f"this game is {self.geometry.width}x{self.geometry.height} k={self.geometry.win_length}")
+        self.state = "game"
+        self.game_mode = "replay"
+        self.replay = Replay(record, moves_per_second)
+        self.reset()
+        self.status_alpha.current = 255
+        self.status_alpha.end = 255
+
+    def set_replay_speed(self, moves_per_second):
+        if self.replay is not None:
+            self.replay.moves_per_second = moves_per_second
+
+    def step_replay_speed(self, steps):
+        # Move to the next slower (-1) or faster (+1) entry of REPLAY_SPEEDS
+        if self.replay is None:
+            return
+        speed = self.replay.moves_per_second
+        if steps > 0:
+            faster = [s for s in REPLAY_SPEEDS if s > speed]
+            self.set_replay_speed(faster[0] if faster else REPLAY_SPEEDS[-1])
         else:
-            # Advanced AI with Minimax and Alpha-Beta pruning
-            best_score = float('-inf')
-            best_move = None
-            alpha = float('-inf')
-            beta = float('inf')
-            
-            # First check for immediate winning moves or blocking moves
-            empty_cells = [(r, c) for r in range(3) for c in range(3) if self.board[r][c] == 0]
-            
-            # Try to win in one move
-            for row, col in empty_cells:
-                self.board[row][col] = 2
-                if self.check_winner() == 2:
-                    self.board[row][col] = 0
-                    self.make_move(row, col)
-                    return
-                self.board[row][col] = 0
-            
-            # Block opponent's winning move
-            for row, col in empty_cells:
-                self.board[row][col] = 1
-                if self.check_winner() == 1:
-                    self.board[row][col] = 0
-                    self.make_move(row, col)
-                    return
-                self.board[row][col] = 0
-            
-            # If no immediate winning/blocking moves, use minimax with positional heuristics
-            for row in range(3):
-                for col in range(3):
-                    if self.board[row][col] == 0:
-                        self.board[row][col] = 2
-                        score = self.minimax(0, False, alpha, beta)
-                        self.board[row][col] = 0
-                        
-                        if score > best_score:
-                            best_score = score
-                            best_move = (row, col)
-                        
-                        alpha = max(alpha, best_score)
-                        if beta <= alpha:
-                            break
-            
-            if best_move:
-                self.make_move(best_move[0], best_move[1])
+            slower = [s for s in REPLAY_SPEEDS if s < speed]
+            self.set_replay_speed(slower[-1] if slower else REPLAY_SPEEDS[0])
+
+    def advance_replay(self, seconds=None):
+        """Play the replay moves that fell due; seconds defaults to the time since the last call."""
+        if self.replay is None or self.replay.done:
+            return
+        if seconds is None:
+            now = pygame.time.get_ticks()
+            seconds = 0 if self._replay_ticks is None else (now - self._replay_ticks) / 1000
+            self._replay_ticks = now
+        for index in self.replay.advance(seconds):
+            self._play_index(index)
+
+    def _play_index(self, index):
+        self.make_move(*self.geometry.cell(index))
+
+    def ai_move(self):
+        # Synchronous AI turn; the interactive loop uses request_ai_move instead
+        searcher = self._searcher_for(self.ai_difficulty)
+        searcher.nodes = 0  # Stays 0 when the move needs no search (easy, perfect, forced)
+        start = time.perf_counter()
+        index = choose_move(self._state, self.current_player, self.ai_difficulty, searcher=searcher)
+        # Per move rather than per frame, since AI turns happen between frames
+        self.profiler.record("ai", (time.perf_counter() - start) * 1000)
+        self.profiler.record("ai_nodes", searcher.nodes)
+        if index is not None:
+            self._play_index(index)
+
+    def _searcher_for(self, difficulty):
+        return self.mcts if difficulty == "mcts" else self.searcher
+
+    @property
+    def ai_thinking(self):
+        return self._ai_request is not None
+
+    def request_ai_move(self):
+        # Ask the background worker for a move; poll_ai applies it when ready
+        self.cancel_ai()
+        searcher = self._searcher_for(self.ai_difficulty)
+        searcher.nodes = 0
+        try:
+            future = self.ai_worker.request_move(self._state, self.current_player,
+                                                 self.ai_difficulty, searcher.time_budget_ms, searcher)
+        except Exception as error:
+            # A broken pool refuses new work at submit time
+            self._ai_worker_failed(error)
+            return
+        self._ai_request = (future, self._state.key(), time.perf_counter())
+
+    def poll_ai(self):
+        if self._ai_request is None:
+            return
+        future, key, requested = self._ai_request
+        if not future.done():
+            return
+        self._ai_request = None
+        # A request for a position that has since changed is stale
+        if future.cancelled() or key != self._state.key():
+            return
+        self.profiler.record("ai_latency", (time.perf_counter() - requested) * 1000)
+        if not self.ai_worker.use_processes:
+            # Worker processes search with their own searcher, so only threads report nodes
+            self.profiler.record("ai_nodes", self._searcher_for(self.ai_difficulty).nodes)
+        try:
+            index = future.result()
+        except Exception as error:
+            self._ai_worker_failed(error)
+            return
+        if index is not None:
+            self._play_index(index)
+
+    def _ai_worker_failed(self, error):
+        # Play this turn in-process; a pool with a dead worker is dropped for good
+        if isinstance(error, BrokenExecutor):
+            self.ai_worker.shutdown()
+            self.ai_worker = None
+        self.ai_move()
+        self.notice = f"AI worker failed; {self.status_text()[0]}"
+
+    def cancel_ai(self):
+        if self._ai_request is not None:
+            self._ai_request[0].cancel()
+            self._ai_request = None
 
     def evaluate_position(self):
         # Evaluate the current board state with positional heuristics
-        if self.check_winner() == 2:
-            return 100  # AI wins
-        elif self.check_winner() == 1:
-            return -100  # Player wins
-        elif self.check_winner() == 0:
-            return 0  # Tie
-        
-        score = 0
-        
-        # Prefer center position
-        if self.board[1][1] == 2:
-            score += 3
-        elif self.board[1][1] == 1:
-            score -= 3
-        
-        # Prefer corners
-        corners = [(0,0), (0,2), (2,0), (2,2)]
-        for row, col in corners:
-            if self.board[row][col] == 2:
-                score += 2
-            elif self.board[row][col] == 1:
-                score -= 2
-        
-        # Check for two-in-a-row opportunities
-        for i in range(3):
-            # Rows
-            row = self.board[i]
-            if np.sum(row == 2) == 2 and np.sum(row == 0) == 1:
-                score += 5
-            if np.sum(row == 1) == 2 and np.sum(row == 0) == 1:
-                score -= 5
-            
-            # Columns
-            col = self.board[:, i]
-            if np.sum(col == 2) == 2 and np.sum(col == 0) == 1:
-                score += 5
-            if np.sum(col == 1) == 2 and np.sum(col == 0) == 1:
-                score -= 5
-        
-        # Check diagonals
-        diag = np.diag(self.board)
-        if np.sum(diag == 2) == 2 and np.sum(diag == 0) == 1:
-            score += 5
-        if np.sum(diag == 1) == 2 and np.sum(diag == 0) == 1:
-            score -= 5
-        
-        anti_diag = np.diag(np.fliplr(self.board))
-        if np.sum(anti_diag == 2) == 2 and np.sum(anti_diag == 0) == 1:
-            score += 5
-        if np.sum(anti_diag == 1) == 2 and np.sum(anti_diag == 0) == 1:
-            score -= 5
-        
-        return score
-
-    def minimax(self, depth, is_maximizing, alpha, beta):
-        result = self.check_winner()
-        if result is not None:
-            return self.evaluate_position()
-        
-        if depth >= 5:  # Limit search depth for better performance
-            return self.evaluate_position()
-        
-        if is_maximizing:
-            best_score = float('-inf')
-            for row in range(3):
-                for col in range(3):
-                    if self.board[row][col] == 0:
-                        self.board[row][col] = 2
-                        score = self.minimax(depth + 1, False, alpha, beta)
-                        self.board[row][col] = 0
-                        best_score = max(score, best_score)
-                        alpha = max(alpha, best_score)
-                        if beta <= alpha:
-                            break
-            return best_score
-        else:
-            best_score = float('inf')
-            for row in range(3):
-                for col in range(3):
-                    if self.board[row][col] == 0:
-                        self.board[row][col] = 1
-                        score = self.minimax(depth + 1, True, alpha, beta)
-                        self.board[row][col] = 0
-                        best_score = min(score, best_score)
-                        beta = min(beta, best_score)
-                        if beta <= alpha:
-                            break
-            return best_score
+        return evaluate(self._state, self.check_winner())
 
     def check_winner(self) -> Optional[int]:
-        # Check rows, columns and diagonals
-        for player in [1, 2]:
-            # Rows and columns
-            for i in range(3):
-                if all(self.board[i, :] == player) or all(self.board[:, i] == player):
-                    return player
-            # Diagonals
-            if all(np.diag(self.board) == player) or all(np.diag(np.fliplr(self.board)) == player):
-                return player
-        
-        # Check for tie (board is full)
-        if np.all(self.board != 0):
-            return 0
-            
-        return None
+        # 1 or 2 for a completed line, 0 for a full board, None while in progress
+        return self.match.check_winner()
 
     def get_winning_line(self):
-        # Check rows
-        for i in range(3):
-            if all(self.board[i, :] == self.winner):
-                start_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-                end_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-                y = (WINDOW_SIZE - BOARD_SIZE) // 2 + i * CELL_SIZE + CELL_SIZE // 2
-                return ((start_x, y), (end_x, y))
-        
-        # Check columns
-        for i in range(3):
-            if all(self.board[:, i] == self.winner):
-                x = (WINDOW_SIZE - BOARD_SIZE) // 2 + i * CELL_SIZE + CELL_SIZE // 2
-                start_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-                end_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-                return ((x, start_y), (x, end_y))
-        
-        # Check diagonals
-        if all(np.diag(self.board) == self.winner):
-            start_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-            start_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-            end_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-            end_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-            return ((start_x, start_y), (end_x, end_y))
-        elif all(np.diag(np.fliplr(self.board)) == self.winner):
-            start_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-            start_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-            end_x = (WINDOW_SIZE - BOARD_SIZE) // 2 + CELL_SIZE // 2
-            end_y = (WINDOW_SIZE - BOARD_SIZE) // 2 + BOARD_SIZE - CELL_SIZE // 2
-            return ((start_x, start_y), (end_x, end_y))
-
-    def run(self):
-        clock = pygame.time.Clock()
+        # Window coordinates of the first and last cell of the completed line
+        cells = self.match.winning_line()
+        if cells is None:
+            return None
+        return (self.cell_center(*cells[0]), self.cell_center(*cells[-1]))
+
+    def is_animating(self):
+        """True while anything besides the ambient background can change without new input."""
+        return len(self.particles) > 0 or self._is_transitioning()
+
+    def _is_transitioning(self):
+        # Tweens, a pending AI move or a running replay
+        if self.ai_thinking or self.tweens.active > 0:
+            return True
+        return self.replay is not None and not self.replay.done and self.replay.moves_per_second > 0
+
+    def run(self, target_fps=DEFAULT_FPS, idle_fps=DEFAULT_IDLE_FPS, frames=None,
+            ambient_fps=DEFAULT_AMBIENT_FPS):
+        """Main loop; with frames set, return after presenting that many frames."""
+        # Full rate while something moves, the ambient rate for the background wave alone,
+        # otherwise sleep until input or the next idle frame
+        pacer = FramePacer(target_fps, idle_fps, ambient_fps)
+        open_window()
+        presented = 0
         
         while True:
-            for event in pygame.event.get():
+            for event in pacer.events(self.is_animating(), self.animated_background):
                 if event.type == pygame.QUIT:
+                    if self.ai_worker is not None:
+                        self.ai_worker.shutdown()
                     pygame.quit()
                     sys.exit()
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.dirty.full()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(event.pos)
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if self.state == "game":
                             self.state = "menu"
+                            self.replay = None
                             self.reset()
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                        self.step_replay_speed(1)
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.step_replay_speed(-1)
+                    elif event.key == pygame.K_F3:
+                        self.profiler.toggle()
+                        self.dirty.full()
+                    elif event.key == pygame.K_F4:
+                        self.profiler.export_json("profile.json")
+                        self.profiler.export_csv("profile.csv")
                 elif event.type == pygame.MOUSEMOTION:
                     # Update button hover states
                     mouse_pos = event.pos
@@ -779,36 +866,77 @@ class Game:
                                     button.hover_glow.animate_to(0)  # Fade out glow
                         
                         # Update board hover state
-                        offset = (WINDOW_SIZE - BOARD_SIZE) // 2
-                        if offset <= mouse_pos[0] <= offset + BOARD_SIZE and offset <= mouse_pos[1] <= offset + BOARD_SIZE:
-                            row = (mouse_pos[1] - offset) // CELL_SIZE
-                            col = (mouse_pos[0] - offset) // CELL_SIZE
-                            if 0 <= row < 3 and 0 <= col < 3:
-                                self.hover_cell = (row, col)
-                                if random.random() < 0.1:  # Occasionally add particles on hover
-                                    center_x = offset + col * CELL_SIZE + CELL_SIZE // 2
-                                    center_y = offset + row * CELL_SIZE + CELL_SIZE // 2
-                                    self.add_particles(center_x, center_y, GRID_COLOR)
-                        else:
-                            self.hover_cell = None
-            
-            # Clear screen
-            screen.fill(BACKGROUND)
+                        cell = self.cell_at(mouse_pos)
+                        self.hover_cell = cell
+                        if cell is not None and random.random() < 0.1:  # Occasionally add particles on hover
+                            center_x, center_y = self.cell_center(*cell)
+                            self.add_particles(center_x, center_y, GRID_COLOR)
             
-            # Draw current state
-            if self.state == "menu":
-                self.draw_menu()
-            else:
-                self.draw_board()
+            # Apply a finished background AI move, if any
+            self.poll_ai()
             
-            # Update display
-            pygame.display.flip()
-            clock.tick(60)
+            # Draw the current state, and push only the parts that changed
+            rects = self.render_frame()
+            if rects:
+                pygame.display.update(rects)
+                presented += 1
+                if self.first_frame_ms is None:
+                    self.first_frame_ms = (time.perf_counter() - STARTED) * 1000
+                    self.profiler.record("startup", self.first_frame_ms)
+                if frames is not None and presented >= frames:
+                    return
 
 if __name__ == "__main__":
-    pygame.init()
-    global screen
-    screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
-    pygame.display.set_caption("Tic Tac Toe!")
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Advanced Tic Tac Toe")
+    parser.add_argument("--width", type=int, default=3, help="board columns")
+    parser.add_argument("--height", type=int, default=3, help="board rows")
+    parser.add_argument("--win-length", type=int, default=3, help="pieces in a row needed to win")
+    parser.add_argument("--ai-time-ms", type=float, default=DEFAULT_TIME_BUDGET_MS,
+                        help="thinking time per hard AI move in milliseconds")
+    parser.add_argument("--ai-worker", choices=["process", "thread", "none"], default="process",
+                        help="where AI turns run; 'none' searches on the render thread")
+    parser.add_argument("--static-background", action="store_true",
+                        help="turn off the background wave and other idle motion; unchanged frames are not redrawn")
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS, help="frame rate while anything moves")
+    parser.add_argument("--idle-fps", type=float, default=DEFAULT_IDLE_FPS,
+                        help="wake-ups per second while nothing moves")
+    parser.add_argument("--ambient-fps", type=float, default=DEFAULT_AMBIENT_FPS,
+                        help="frame rate while only the background wave moves")
+    parser.add_argument("--profile", action="store_true",
+                        help="start with the profiling overlay on (toggle with F3, export with F4)")
+    parser.add_argument("--ai-parallel", type=int, default=0, metavar="N",
+                        help="split hard AI searches across N processes (implies a thread worker)")
+    parser.add_argument("--replay", default=None, metavar="FILE",
+                        help="play back a game from a record file written by selfplay.py --records")
+    parser.add_argument("--replay-index", type=int, default=0, help="which game in the record file to show")
+    parser.add_argument("--replay-speed", type=float, default=2.0, help="replay moves per second (-/+ to change)")
+    parser.add_argument("--time-startup", action="store_true",
+                        help="print the time from launch to the first frame on screen, then exit")
+    args = parser.parse_args()
+
+    record = None
+    if args.replay:
+        with RecordArchive(args.replay) as archive:
+            record = archive[args.replay_index]
+        # The board takes its size from the record
+        args.width, args.height, args.win_length = record.width, record.height, record.win_length
+    game = Game(args.width, args.height, args.win_length, args.ai_time_ms)
+    game.animated_background = not args.static_background
+    game.profiler.enabled = args.profile
+    if args.ai_parallel:
+        # The search itself fans out to processes, so it is driven from a thread
+        game.searcher = ParallelSearcher(args.ai_parallel, args.ai_time_ms)
+        if args.ai_worker == "process":
+            args.ai_worker = "thread"
+    if args.ai_worker != "none":
+        game.ai_worker = AIWorker(use_processes=args.ai_worker == "process")
+    if record is not None:
+        game.start_replay(record, args.replay_speed)
+    if args.time_startup:
+        game.run(args.fps, args.idle_fps, frames=1, ambient_fps=args.ambient_fps)
+        print(f"first frame after {game.first_frame_ms:.1f} ms")
+        if game.ai_worker is not None:
+            game.ai_worker.shutdown()
+        pygame.quit()
+    else:
+        game.run(args.fps, args.idle_fps, ambient_fps=args.ambient_fps)
@@ -0,0 +1,174 @@
+"""Monte Carlo Tree Search (UCT) for boards too large for full-width alpha-beta.
+
+Every leaf is scored by a batch of random playouts that run together in NumPy:
+each playout is a random ordering of the empty cells, and the game ends at
+the first line a single player completes, so the winner falls out of a few
+array reductions over ``Geometry.line_index_array``. The tree is kept between
+calls and re-rooted at the current position, so work from the previous move
+carries over.
+"""
+import math
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from bitboard import BitBoard
+from search import DEFAULT_TIME_BUDGET_MS, SearchResult
+
+DEFAULT_PLAYOUT_BATCH = 32
+EXPLORATION = math.sqrt(2)
+
+
+def random_playouts(state: BitBoard, player: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Winners (1, 2, or 0 for a draw) of count random games from state with player to move."""
+    geometry = state.geometry
+    cells = geometry.cells
+    owners = np.zeros((count, cells), dtype=np.int8)
+    times = np.full((count, cells), -1, dtype=np.int32)
+    for side in (1, 2):
+        stones = [i for i in range(cells) if state.bits[side] >> i & 1]
+        owners[:, stones] = side
+    empties = state.legal_moves()
+    if empties:
+        # A random permutation per playout: order[b, j] is when empty cell j gets played
+        order = np.argsort(rng.random((count, len(empties))), axis=1).astype(np.int32)
+        times[:, empties] = order
+        owners[:, empties] = np.where(order % 2 == 0, player, 3 - player)
+
+    lines = geometry.line_index_array
+    line_owners = owners[:, lines]
+    first = line_owners[:, :, 0]
+    complete = (first != 0) & (line_owners == first[:, :, None]).all(axis=2)
+    # Each playout ends when its first line is completed
+    never = np.iinfo(np.int32).max
+    finished_at = np.where(complete, times[:, lines].max(axis=2), never)
+    first_line = finished_at.argmin(axis=1)
+    rows = np.arange(count)
+    return np.where(finished_at[rows, first_line] < never, first[rows, first_line], 0)
+
+
+class Node:
+    __slots__ = ("move", "parent", "player", "children", "untried", "visits", "reward", "result")
+
+    def __init__(self, state: BitBoard, player: int, move: Optional[int] = None,
+                 parent: Optional["Node"] = None):
+        self.move = move
+        self.parent = parent
+        self.player = player  # side to move at this node
+        self.children: Dict[int, Node] = {}
+        self.visits = 0
+        self.reward = 0.0  # from the point of view of the player who moved into this node
+        self.result = None if move is None else state.result_after(move, 3 - player)
+        self.untried: List[int] = [] if self.result is not None else state.candidate_moves()
+
+    def best_child(self, exploration: float) -> "Node":
+        log_visits = math.log(self.visits)
+        best, best_value = None, -1.0
+        for child in self.children.values():
+            value = child.reward / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if value > best_value:
+                best, best_value = child, value
+        return best
+
+
+class MCTSSearcher:
+    """UCT search with the same ``search(state, player)`` interface as ``search.Searcher``.
+
+    Stop after ``iterations`` tree iterations when it is set, otherwise when
+    ``time_budget_ms`` runs out. The result score is the chosen move's win rate.
+    """
+
+    def __init__(self, time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                 iterations: Optional[int] = None,
+                 playout_batch: int = DEFAULT_PLAYOUT_BATCH,
+                 exploration: float = EXPLORATION, seed: Optional[int] = None):
+        self.time_budget_ms = time_budget_ms
+        self.iterations = iterations
+        self.playout_batch = playout_batch
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+        self.nodes = 0
+        self.reused_visits = 0
+        self._root: Optional[Node] = None
+        self._root_state: Optional[BitBoard] = None
+
+    def search(self, state: BitBoard, player: int) -> SearchResult:
+        start = time.perf_counter()
+        deadline = start + self.time_budget_ms / 1000
+        root = self._reuse_root(state, player)
+        self.reused_visits = root.visits
+        self.nodes = 0
+        if root.untried or root.children:
+            while True:
+                self._iterate(root, state)
+                self.nodes += 1
+                if self.iterations is not None:
+                    if self.nodes >= self.iterations:
+                        break
+                elif time.perf_counter() > deadline:
+                    break
+
+        if not root.children:
+            return SearchResult(None, 0, 0, self.nodes, 0.0, [])
+        pv = []
+        node = root
+        while node.children:
+            node = max(node.children.values(), key=lambda child: child.visits)
+            pv.append(node.move)
+        best = root.children[pv[0]]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return SearchResult(best.move, best.reward / best.visits, len(pv), self.nodes, elapsed_ms, pv)
+
+    def _iterate(self, root: Node, root_state: BitBoard):
+        state = root_state.copy()
+        node = root
+        # Selection
+        while not node.untried and node.children:
+            node = node.best_child(self.exploration)
+            state.make(node.move, 3 - node.player)
+        # Expansion
+        if node.untried:
+            move = node.untried.pop(self.rng.integers(len(node.untried)))
+            state.make(move, node.player)
+            child = Node(state, 3 - node.player, move, node)
+            node.children[move] = child
+            node = child
+        # Simulation
+        batch = self.playout_batch
+        if node.result is not None:
+            winners = np.full(batch, node.result)
+        else:
+            winners = random_playouts(state, node.player, batch, self.rng)
+        wins = {1: int(np.count_nonzero(winners == 1)), 2: int(np.count_nonzero(winners == 2))}
+        draws = batch - wins[1] - wins[2]
+        # Backpropagation
+        while node is not None:
+            node.visits += batch
+            mover = 3 - node.player
+            node.reward += wins[mover] + 0.5 * draws
+            node = node.parent
+
+    def _reuse_root(self, state: BitBoard, player: int) -> Node:
+        # Walk the old tree along the stones played since the last search
+        root, old = self._root, self._root_state
+        self._root_state = state.copy()
+        if root is not None and old.geometry.key == state.geometry.key:
+            added = {side: state.bits[side] & ~old.bits[side] for side in (1, 2)}
+            removed = any(old.bits[side] & ~state.bits[side] for side in (1, 2))
+            node, side = root, root.player
+            while node is not None and not removed and added[side]:
+                bit = added[side] & -added[side]
+                added[side] ^= bit
+                node = node.children.get(bit.bit_length() - 1)
+                side = 3 - side
+            if node is not None and not removed and not any(added.values()) and node.player == player:
+                node.parent = None
+                self._root = node
+                return node
+        self._root = Node(state, player)
+        return self._root
+
+    def reset(self):
+        self._root = None
+        self._root_state = None
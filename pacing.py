@@ -0,0 +1,50 @@
+"""Frame pacing for the interactive loop.
+
+While anything moves, frames run at ``target_fps`` through ``pygame.time.Clock``.
+When nothing does, ``FramePacer.events`` blocks in ``pygame.event.wait`` for up
+to one idle frame instead, so an untouched screen wakes only ``idle_fps`` times
+a second, and any input returns immediately at full rate. Ambient motion (a
+background that drifts on its own) asks for ``ambient_fps`` wake-ups instead:
+smooth enough for slow motion, a fraction of the cost of full rate.
+"""
+from typing import List
+
+import pygame
+
+DEFAULT_FPS = 60
+DEFAULT_IDLE_FPS = 4
+DEFAULT_AMBIENT_FPS = 12
+
+
+class FramePacer:
+    def __init__(self, target_fps: float = DEFAULT_FPS, idle_fps: float = DEFAULT_IDLE_FPS,
+                 ambient_fps: float = DEFAULT_AMBIENT_FPS):
+        if target_fps <= 0 or idle_fps <= 0 or ambient_fps <= 0:
+            raise ValueError("frame rates must be positive")
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.ambient_fps = ambient_fps
+        self.clock = pygame.time.Clock()
+        self.busy_frames = 0
+        self.idle_frames = 0
+
+    def events(self, busy: bool, ambient: bool = False) -> List[pygame.event.Event]:
+        """Wait out the rest of this frame and return the input that arrived.
+
+        busy runs at target_fps; otherwise ambient wakes at ambient_fps and a still
+        screen at idle_fps, either returning early on input.
+        """
+        if busy:
+            self.busy_frames += 1
+            self.clock.tick(self.target_fps)
+            return pygame.event.get()
+        self.idle_frames += 1
+        event = pygame.event.wait(int(1000 / (self.ambient_fps if ambient else self.idle_fps)))
+        # Keep the clock from counting the idle wait as one long frame
+        self.clock.tick()
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+
+    @property
+    def fps(self) -> float:
+        return self.clock.get_fps()
@@ -0,0 +1,200 @@
+"""Root-split parallel search across CPU cores.
+
+Each iteration of ``ParallelSearcher.search`` first searches the eldest root
+move (the previous principal variation) on its own, then splits the younger
+siblings across a ``ProcessPoolExecutor`` with the eldest's score as alpha:
+the Young Brothers Wait rule applied at the root. Workers publish better
+scores to a shared alpha that siblings starting later pick up. A sibling that
+fails low against that alpha only has an upper bound and is not a candidate;
+the sibling that raised the alpha is collected in the same iteration. Each
+worker process keeps its own transposition table across tasks; the tables are
+not shared between processes because the synchronisation would cost more
+than the hits are worth.
+
+In deterministic mode every task gets a fresh table, the shared alpha is not
+used, the time budget is ignored and ties are broken by root order, so the
+same position and depth always give the same move and score.
+
+Measure the speedup curve with, for example::
+
+    python parallel_search.py --width 7 --height 7 --win-length 4 --depth 4 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from bitboard import BitBoard, get_geometry
+from search import (DEFAULT_TIME_BUDGET_MS, WIN_SCORE, SearchResult, SearchTimeout,
+                    Searcher)
+from transposition import TranspositionTable
+
+# Per-process state, set up by _init_worker
+_shared_alpha = None
+_worker_searcher = None
+
+
+def _init_worker(shared_alpha):
+    global _shared_alpha, _worker_searcher
+    _shared_alpha = shared_alpha
+    _worker_searcher = Searcher(table=TranspositionTable())
+
+
+def _search_root_move(state, player, move, depth, alpha, budget_ms, pv, deterministic):
+    if deterministic:
+        searcher = Searcher(budget_ms, table=TranspositionTable())
+    else:
+        searcher = _worker_searcher
+        searcher.time_budget_ms = budget_ms
+        alpha = max(alpha, _shared_alpha.value)
+    # The alpha actually searched with is returned: scores at or below it are only upper bounds
+    try:
+        score, line = searcher.score_move(state, player, move, depth, alpha, pv=pv)
+    except SearchTimeout:
+        return move, None, [], searcher.nodes, alpha
+    if not deterministic and score > alpha:
+        with _shared_alpha.get_lock():
+            if score > _shared_alpha.value:
+                _shared_alpha.value = score
+    return move, score, line, searcher.nodes, alpha
+
+
+class ParallelSearcher:
+    """Drop-in replacement for ``search.Searcher`` that spreads root moves over processes."""
+
+    def __init__(self, workers: Optional[int] = None,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                 max_depth: Optional[int] = None, deterministic: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget_ms = time_budget_ms
+        self.max_depth = max_depth
+        self.deterministic = deterministic
+        self.nodes = 0
+        self._shared_alpha = multiprocessing.Value("d", -float('inf'))
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._shared_alpha,))
+
+    def search(self, state: BitBoard, player: int) -> SearchResult:
+        start = time.perf_counter()
+        deadline = float('inf') if self.deterministic else start + self.time_budget_ms / 1000
+        self.nodes = 0
+        moves = state.candidate_moves()
+        if not moves:
+            return SearchResult(None, 0, 0, 0, 0.0, [])
+        empties = len(state.legal_moves())
+        max_depth = empties if self.max_depth is None else min(self.max_depth, empties)
+
+        best_score, completed, pv = 0, 0, [moves[0]]
+        if len(moves) > 1:
+            for depth in range(1, max_depth + 1):
+                iteration = self._search_iteration(state, player, depth, moves, pv, deadline)
+                if iteration is None:
+                    break  # Not even the eldest brother finished in time
+                score, line, finished = iteration
+                best_score, pv = score, line
+                if not finished:
+                    break  # Best of the siblings that finished; the rest timed out
+                completed = depth
+                if abs(best_score) >= WIN_SCORE:
+                    break
+                # Principal variation first next iteration, everything else in its original order
+                moves = [pv[0]] + [move for move in moves if move != pv[0]]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return SearchResult(pv[0], best_score, completed, self.nodes, elapsed_ms, pv)
+
+    def _remaining_ms(self, deadline):
+        if deadline == float('inf'):
+            return float('inf')
+        return max(0.0, (deadline - time.perf_counter()) * 1000)
+
+    def _submit(self, state, player, move, depth, alpha, deadline, pv):
+        child_pv = pv if pv and pv[0] == move else None
+        return self._executor.submit(_search_root_move, state, player, move, depth, alpha,
+                                     self._remaining_ms(deadline), child_pv, self.deterministic)
+
+    def _search_iteration(self, state, player, depth, moves, pv, deadline):
+        # Young Brothers Wait: the eldest move is searched alone to establish alpha
+        self._shared_alpha.value = -float('inf')
+        _, score, line, nodes, _ = self._submit(state, player, moves[0], depth,
+                                                -float('inf'), deadline, pv).result()
+        self.nodes += nodes
+        if score is None:
+            return None
+        best_score, best_line = score, line
+        if not self.deterministic:
+            self._shared_alpha.value = score
+
+        futures = [self._submit(state, player, move, depth, best_score, deadline, pv)
+                   for move in moves[1:]]
+        finished = True
+        # Collect in root order so ties always resolve to the earlier move
+        for future in futures:
+            _, score, line, nodes, alpha = future.result()
+            self.nodes += nodes
+            if score is None:
+                finished = False
+            elif score > alpha and score > best_score:
+                best_score, best_line = score, line
+        return best_score, best_line, finished
+
+    def warm_up(self):
+        # Start every worker process so spawn cost is not billed to the first search
+        list(self._executor.map(abs, range(self.workers * 2)))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def measure_speedup(state: BitBoard, player: int, depth: int,
+                    worker_counts: Sequence[int] = (1, 2, 4)) -> List[dict]:
+    """Time a fixed-depth search per worker count; speedup is relative to the first count."""
+    rows = []
+    baseline = None
+    for workers in worker_counts:
+        with ParallelSearcher(workers, max_depth=depth, time_budget_ms=float('inf')) as searcher:
+            searcher.warm_up()
+            result = searcher.search(state, player)
+        seconds = result.elapsed_ms / 1000
+        if baseline is None:
+            baseline = seconds
+        rows.append({
+            "workers": workers,
+            "seconds": seconds,
+            "speedup": baseline / seconds if seconds else float('inf'),
+            "nodes": result.nodes,
+            "move": result.move,
+            "score": result.score,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure parallel search speedup by worker count")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    geometry = get_geometry(args.width, args.height, args.win_length)
+    state = BitBoard(geometry=geometry)
+    state.make(geometry.index(args.height // 2, args.width // 2), 1)
+
+    print(f"{args.width}x{args.height} k={args.win_length}, depth {args.depth}, O to move")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'nodes':>10}")
+    for row in measure_speedup(state, 2, args.depth, args.workers):
+        print(f"{row['workers']:>8} {row['seconds']:>9.3f} {row['speedup']:>8.2f} {row['nodes']:>10}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
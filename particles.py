@@ -0,0 +1,140 @@
+"""Fixed-capacity particle pool stored as NumPy arrays (one array per field).
+
+Particles are updated with whole-array operations and drawn by blitting
+pre-rendered star sprites, bucketed by color, size and alpha, in a single
+``Surface.blits`` call. Dead slots go back on a free list and are reused by
+the next ``spawn``, so nothing is allocated per particle.
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pygame
+
+Color = Tuple[int, int, int]
+
+DEFAULT_CAPACITY = 4096
+MIN_SIZE, MAX_SIZE = 4, 12  # Spawn sizes; particles shrink towards 1
+ALPHA_BUCKETS = 16
+GRAVITY = 0.2
+SHRINK = 0.99
+
+
+def star_sprite(color: Color, size: int, alpha: int) -> pygame.Surface:
+    """8-pointed star of radius size (inner points at size / 2) centred on a (2*size+1)^2 surface."""
+    surface = pygame.Surface((2 * size + 1, 2 * size + 1), pygame.SRCALPHA)
+    points = []
+    for i in range(8):
+        angle = i * math.pi / 4
+        radius = size if i % 2 == 0 else size / 2
+        points.append((size + math.cos(angle) * radius, size + math.sin(angle) * radius))
+    pygame.draw.polygon(surface, (*color, alpha), points)
+    return surface
+
+
+class ParticlePool:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.decay = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)  # Index into self.colors
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Stack of free slots; the top _free_count entries are available
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+        self.colors: List[Color] = []
+        self._color_index: Dict[Color, int] = {}
+        self._sprites: Dict[int, pygame.Surface] = {}
+        self.dropped = 0  # Spawns refused because the pool was full
+        self.frames = 0  # update() calls that moved at least one particle
+
+    def __len__(self):
+        return self.capacity - self._free_count
+
+    def _color_id(self, color: Color) -> int:
+        color = tuple(color[:3])
+        if color not in self._color_index:
+            self._color_index[color] = len(self.colors)
+            self.colors.append(color)
+        return self._color_index[color]
+
+    def spawn(self, x: float, y: float, color: Color, count: int = 20) -> int:
+        """Burst of count particles from (x, y); returns how many fitted in the pool."""
+        n = min(count, self._free_count)
+        self.dropped += count - n
+        if n == 0:
+            return 0
+        slots = self._free[self._free_count - n:self._free_count]
+        self._free_count -= n
+        angle = self.rng.uniform(0, 2 * math.pi, n)
+        speed = self.rng.uniform(3, 8, n)
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = np.cos(angle) * speed
+        self.vy[slots] = np.sin(angle) * speed
+        self.size[slots] = self.rng.integers(MIN_SIZE, MAX_SIZE + 1, n)
+        self.life[slots] = 1.0
+        self.decay[slots] = self.rng.uniform(0.01, 0.03, n)
+        self.color[slots] = self._color_id(color)
+        self.alive[slots] = True
+        return n
+
+    def update(self):
+        """Advance every live particle one frame and recycle the ones that died."""
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        self.frames += 1
+        self.x[live] += self.vx[live]
+        self.y[live] += self.vy[live]
+        self.vy[live] += GRAVITY
+        self.size[live] = np.maximum(1, self.size[live] * SHRINK)
+        self.life[live] -= self.decay[live]
+        dead = live[self.life[live] <= 0]
+        if len(dead):
+            self.alive[dead] = False
+            self._free[self._free_count:self._free_count + len(dead)] = dead
+            self._free_count += len(dead)
+
+    def bounds(self) -> Optional[pygame.Rect]:
+        """Screen area covered by live particles, or None when there are none."""
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return None
+        x, y = self.x[live], self.y[live]
+        reach = int(self.size[live].max()) + 1
+        left, top = int(x.min()) - reach, int(y.min()) - reach
+        return pygame.Rect(left, top, int(x.max()) + reach + 1 - left, int(y.max()) + reach + 1 - top)
+
+    def clear(self):
+        self.alive[:] = False
+        self._free[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = self.capacity
+
+    def _sprite(self, key: int) -> pygame.Surface:
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            color, rest = divmod(key, (MAX_SIZE + 1) * ALPHA_BUCKETS)
+            size, bucket = divmod(rest, ALPHA_BUCKETS)
+            alpha = (bucket + 1) * 255 // ALPHA_BUCKETS
+            sprite = self._sprites[key] = star_sprite(self.colors[color], size, alpha)
+        return sprite
+
+    def draw(self, surface: pygame.Surface):
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        sizes = self.size[live].astype(np.int32)
+        buckets = np.clip((self.life[live] * ALPHA_BUCKETS).astype(np.int32), 0, ALPHA_BUCKETS - 1)
+        keys = (self.color[live].astype(np.int32) * (MAX_SIZE + 1) + sizes) * ALPHA_BUCKETS + buckets
+        sprites = {key: self._sprite(key) for key in np.unique(keys).tolist()}
+        left = (self.x[live] - sizes).astype(np.int32).tolist()
+        top = (self.y[live] - sizes).astype(np.int32).tolist()
+        surface.blits([(sprites[key], (px, py)) for key, px, py in zip(keys.tolist(), left, top)],
+                      doreturn=False)
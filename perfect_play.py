@@ -0,0 +1,156 @@
+"""Exact perfect-play table for 3x3 tic tac toe.
+
+The generator solves every position for either side to move (a superset of
+the 5,478 positions reachable in real games) and stores one little-endian
+uint16 per position:
+
+    bits 0-8   mask of optimal moves (fastest win / slowest loss)
+    bits 9-10  game-theoretic value for the side to move (LOSS, DRAW, WIN)
+
+Positions are indexed by their base-3 encoding plus 3**9 when O is to move,
+so a lookup is two table reads and an add. Regenerate the shipped table with
+``python perfect_play.py``.
+"""
+import argparse
+import os
+import struct
+import sys
+from typing import List, Optional
+
+import numpy as np
+
+from bitboard import BitBoard, CELLS, FULL_MASK, LINE_MASKS
+
+LOSS = 0
+DRAW = 1
+WIN = 2
+
+MAGIC = b"TTTP"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")  # magic, version, entry count
+POSITIONS = 3 ** CELLS
+ENTRIES = 2 * POSITIONS
+MOVE_MASK = FULL_MASK
+VALUE_SHIFT = CELLS
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfect_play.bin")
+
+# Base-3 weight of every 9-bit mask, so index = TERNARY[x] + 2 * TERNARY[o]
+TERNARY = tuple(sum(3 ** i for i in range(CELLS) if mask >> i & 1) for mask in range(1 << CELLS))
+
+
+def position_index(x_bits: int, o_bits: int, player: int) -> int:
+    return TERNARY[x_bits] + 2 * TERNARY[o_bits] + (POSITIONS if player == 2 else 0)
+
+
+def _has_line(bits: int) -> bool:
+    for mask in LINE_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def solve() -> np.ndarray:
+    """Solve every position exactly and return the packed table."""
+    table = np.zeros(ENTRIES, dtype="<u2")
+    memo = {}
+
+    def search(bits, player):
+        # Score for the side to move: +/-(1 + empty cells) for a win/loss, 0 for a draw
+        key = (bits[1], bits[2], player)
+        if key in memo:
+            return memo[key]
+        opponent = 3 - player
+        empty = FULL_MASK & ~(bits[1] | bits[2])
+        empties = bin(empty).count("1")
+        best_mask = 0
+        if _has_line(bits[opponent]):
+            best = -(1 + empties)
+        elif _has_line(bits[player]):
+            best = 1 + empties
+        elif not empty:
+            best = 0
+        else:
+            best = None
+            for i in range(CELLS):
+                bit = 1 << i
+                if not empty & bit:
+                    continue
+                bits[player] |= bit
+                score = -search(bits, opponent)
+                bits[player] &= ~bit
+                if best is None or score > best:
+                    best, best_mask = score, bit
+                elif score == best:
+                    best_mask |= bit
+        value = WIN if best > 0 else LOSS if best < 0 else DRAW
+        table[position_index(bits[1], bits[2], player)] = best_mask | (value << VALUE_SHIFT)
+        memo[key] = best
+        return best
+
+    # Every arrangement of X and O pieces, for both sides to move
+    for x_bits in range(1 << CELLS):
+        for o_bits in range(1 << CELLS):
+            if x_bits & o_bits:
+                continue
+            for player in (1, 2):
+                search([0, x_bits, o_bits], player)
+    return table
+
+
+def write_table(table: np.ndarray, path: str = DEFAULT_PATH):
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(table)))
+        f.write(table.astype("<u2").tobytes())
+
+
+class PerfectPlayTable:
+    def __init__(self, entries: np.ndarray):
+        if len(entries) != ENTRIES:
+            raise ValueError(f"expected {ENTRIES} entries, got {len(entries)}")
+        self._entries = entries
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "PerfectPlayTable":
+        with open(path, "rb") as f:
+            magic, version, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} perfect play table")
+        return cls(np.memmap(path, dtype="<u2", mode="r", offset=HEADER.size, shape=(count,)))
+
+    def entry(self, state: BitBoard, player: int) -> int:
+        return int(self._entries[position_index(state.bits[1], state.bits[2], player)])
+
+    def value(self, state: BitBoard, player: int) -> int:
+        return self.entry(state, player) >> VALUE_SHIFT
+
+    def best_moves(self, state: BitBoard, player: int) -> List[int]:
+        mask = self.entry(state, player) & MOVE_MASK
+        return [i for i in range(CELLS) if mask >> i & 1]
+
+
+_table: Optional[PerfectPlayTable] = None
+
+
+def get_table() -> PerfectPlayTable:
+    """Load the shipped table once per process, solving in memory if it is missing."""
+    global _table
+    if _table is None:
+        try:
+            _table = PerfectPlayTable.load()
+        except (OSError, ValueError):
+            _table = PerfectPlayTable(solve())
+    return _table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the perfect play lookup table")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="where to write the table")
+    args = parser.parse_args(argv)
+    table = solve()
+    write_table(table, args.output)
+    print(f"Wrote {len(table)} entries to {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Opt-in frame profiler: per-stage timers, counters and rolling percentiles.
+
+Wrap a stage in ``with profiler.stage("grid"):``. Stage times are summed
+within a frame, and ``end_frame`` adds them and the frame total to rolling
+windows of the last ``window`` frames. Counters such as nodes searched per AI
+move go in with ``record``. While ``enabled`` is False, ``stage`` hands back a
+shared no-op context manager and ``record`` returns at once, so instrumented
+code costs about one attribute lookup and call per stage.
+"""
+import csv
+import json
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+
+DEFAULT_WINDOW = 600  # 10 seconds at 60 FPS
+PERCENTILES = (50, 95, 99)
+FRAME = "frame"
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        frame = self.profiler._frame
+        frame[self.name] = frame.get(self.name, 0.0) + (time.perf_counter() - self.start) * 1000
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.window = window
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._frame: Dict[str, float] = {}
+        self._stages: Dict[str, _Stage] = {}
+        self._frame_start: Optional[float] = None
+        self.frames = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self._frame.clear()
+        self._frame_start = None
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_STAGE
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def record(self, name: str, value: float):
+        """Add one sample outside the frame timers, e.g. nodes per AI move."""
+        if self.enabled:
+            self.samples[name].append(value)
+
+    def begin_frame(self):
+        if self.enabled:
+            self._frame.clear()
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        for name, ms in self._frame.items():
+            self.samples[name].append(ms)
+        self.samples[FRAME].append((time.perf_counter() - self._frame_start) * 1000)
+        self._frame.clear()
+        self._frame_start = None
+        self.frames += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99, mean, max and sample count for every stage and counter."""
+        result = {}
+        for name, values in self.samples.items():
+            if not values:
+                continue
+            data = np.fromiter(values, dtype=float, count=len(values))
+            stats = {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(data, PERCENTILES))}
+            stats.update(mean=float(data.mean()), max=float(data.max()), count=len(data))
+            result[name] = stats
+        return result
+
+    def export_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump({"window": self.window, "frames": self.frames, "stages": self.summary()}, f, indent=2)
+
+    def export_csv(self, path: str):
+        fields = [f"p{p}" for p in PERCENTILES] + ["mean", "max", "count"]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage"] + fields)
+            for name, stats in sorted(self.summary().items()):
+                writer.writerow([name] + [round(stats[field], 4) for field in fields])
+
+    def overlay_lines(self):
+        # One line per stage, slowest p95 first, frame total on top
+        summary = self.summary()
+        lines = []
+        for name, stats in sorted(summary.items(), key=lambda item: (item[0] != FRAME, -item[1]["p95"])):
+            lines.append(f"{name:<12} p50 {stats['p50']:7.2f}  p95 {stats['p95']:7.2f}  p99 {stats['p99']:7.2f}")
+        return lines
@@ -0,0 +1,203 @@
+"""Compact binary game records, streamed or memory-mapped, and move-by-move replay.
+
+File layout::
+
+    b"TTTR" version:u8                       file header, written once
+    length:u16 | width:u8 height:u8 k:u8 winner:u8 | move:u8 * n   one record, repeated
+
+``length`` counts the bytes after it, so a reader can skip a record without
+decoding it. ``winner`` is 0 for a draw, 1 or 2 for a win and 255 for an
+unfinished game, and each move is a cell index (row * width + col), so a
+board may have at most 255 cells. Files are append-only: ``RecordWriter``
+adds to the end of an existing file. ``read_records`` streams a file of any
+size with constant memory, and ``RecordArchive`` memory-maps one and indexes
+record offsets for random access.
+"""
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from bitboard import Geometry
+
+MAGIC = b"TTTR"
+VERSION = 1
+FILE_HEADER = MAGIC + bytes([VERSION])
+_LENGTH = struct.Struct("<H")
+_HEADER = struct.Struct("<BBBB")
+UNFINISHED = 255
+MAX_CELLS = 255
+
+
+class RecordError(ValueError):
+    pass
+
+
+class GameRecord(NamedTuple):
+    width: int
+    height: int
+    win_length: int
+    winner: Optional[int]  # None for an unfinished game
+    moves: bytes
+
+    @classmethod
+    def from_moves(cls, geometry: Geometry, moves: Sequence[int], winner: Optional[int]) -> "GameRecord":
+        if geometry.cells > MAX_CELLS:
+            raise RecordError(f"{geometry.width}x{geometry.height} has more than {MAX_CELLS} cells")
+        return cls(geometry.width, geometry.height, geometry.win_length, winner, bytes(moves))
+
+    @classmethod
+    def from_match(cls, match) -> "GameRecord":
+        return cls.from_moves(match.geometry, match.history, match.winner)
+
+    def encode(self) -> bytes:
+        winner = UNFINISHED if self.winner is None else self.winner
+        payload = _HEADER.pack(self.width, self.height, self.win_length, winner) + bytes(self.moves)
+        return _LENGTH.pack(len(payload)) + payload
+
+    @classmethod
+    def decode(cls, payload) -> "GameRecord":
+        """Record from the bytes after its length prefix."""
+        width, height, win_length, winner = _HEADER.unpack_from(payload)
+        return cls(width, height, win_length, None if winner == UNFINISHED else winner,
+                   bytes(payload[_HEADER.size:]))
+
+
+def _check_header(header: bytes, path: str):
+    if len(header) < len(FILE_HEADER) or header[:len(MAGIC)] != MAGIC:
+        raise RecordError(f"{path} is not a game record file")
+    if header[len(MAGIC)] != VERSION:
+        raise RecordError(f"{path} has record format version {header[len(MAGIC)]}, expected {VERSION}")
+
+
+class RecordWriter:
+    """Append records to path, creating it with a file header if needed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Check an existing file before opening it for append, so a bad one leaks no handle
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                _check_header(f.read(len(FILE_HEADER)), path)
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER)
+        self.written = 0
+
+    def write(self, record: GameRecord):
+        self._file.write(record.encode())
+        self.written += 1
+
+    def write_all(self, records: Iterable[GameRecord]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_records(path: str) -> Iterator[GameRecord]:
+    """Yield every record in path in order, reading through a buffered file."""
+    with open(path, "rb") as f:
+        _check_header(f.read(len(FILE_HEADER)), path)
+        while True:
+            prefix = f.read(_LENGTH.size)
+            if not prefix:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = f.read(length)
+            if len(prefix) < _LENGTH.size or len(payload) < length:
+                raise RecordError(f"{path} ends in the middle of a record")
+            yield GameRecord.decode(payload)
+
+
+class RecordArchive:
+    """Random access to a record file through mmap.
+
+    Opening scans only the length prefixes to build ``offsets``, an array of
+    where each record's payload starts; records are decoded on access.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < len(FILE_HEADER):
+            self._file.close()
+            raise RecordError(f"{path} is not a game record file")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _check_header(self._map[:len(FILE_HEADER)], path)
+            self.offsets, self.lengths = self._index(size)
+        except RecordError:
+            self.close()
+            raise
+
+    def _index(self, size: int):
+        offsets = array("q")
+        lengths = array("H")
+        data, position = self._map, len(FILE_HEADER)
+        while position < size:
+            if position + _LENGTH.size > size:
+                raise RecordError(f"{self.path} ends in the middle of a record")
+            (length,) = _LENGTH.unpack_from(data, position)
+            position += _LENGTH.size
+            if position + length > size:
+                raise RecordError(f"{self.path} ends in the middle of a record")
+            offsets.append(position)
+            lengths.append(length)
+            position += length
+        return offsets, lengths
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> GameRecord:
+        start = self.offsets[index]
+        return GameRecord.decode(self._map[start:start + self.lengths[index]])
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Replay:
+    """Steps through a record's moves at moves_per_second; a speed of 0 pauses."""
+
+    def __init__(self, record: GameRecord, moves_per_second: float = 2.0):
+        self.record = record
+        self.moves_per_second = moves_per_second
+        self.position = 0
+        self._elapsed = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.position >= len(self.record.moves)
+
+    def advance(self, seconds: float) -> List[int]:
+        """Moves that fall due in the next seconds of playback."""
+        if self.done or self.moves_per_second <= 0:
+            return []
+        self._elapsed += seconds * self.moves_per_second
+        due = min(int(self._elapsed), len(self.record.moves) - self.position)
+        self._elapsed -= due
+        moves = list(self.record.moves[self.position:self.position + due])
+        self.position += due
+        return moves
@@ -0,0 +1,209 @@
+"""Iterative-deepening alpha-beta search with a wall-clock budget.
+
+Scores follow ``Game.evaluate_position``: positive is good for player 2 (the
+AI), +/-100 is a decided game. Inside the search they are negated as needed
+so every node scores from the side to move.
+"""
+import time
+from typing import List, NamedTuple, Optional
+
+from bitboard import BitBoard, popcount
+from transposition import TranspositionTable, shared_table
+
+WIN_SCORE = 100
+DEFAULT_TIME_BUDGET_MS = 200
+
+# How many nodes to visit between clock reads
+_CLOCK_INTERVAL = 256
+
+# Ordering priorities: previous principal variation, then killers, then history
+_PV_PRIORITY = 1 << 60
+_KILLER_PRIORITY = 1 << 50
+
+
+def evaluate(state: BitBoard, result: Optional[int] = None) -> int:
+    """Heuristic score from player 2's point of view; result is the known game result, if any."""
+    if result == 2:
+        return WIN_SCORE  # AI wins
+    elif result == 1:
+        return -WIN_SCORE  # Player wins
+    elif result == 0:
+        return 0  # Tie
+
+    geometry = state.geometry
+    ai_bits = state.bits[2]
+    player_bits = state.bits[1]
+    score = 0
+
+    # Prefer center position
+    score += 3 * (popcount(ai_bits & geometry.center_mask) - popcount(player_bits & geometry.center_mask))
+
+    # Prefer corners
+    score += 2 * (popcount(ai_bits & geometry.corner_mask) - popcount(player_bits & geometry.corner_mask))
+
+    # Check for one-short-of-a-line opportunities (k-1 pieces, the rest empty)
+    threat = geometry.win_length - 1
+    for mask in geometry.line_masks:
+        ai_line = ai_bits & mask
+        player_line = player_bits & mask
+        if not player_line and popcount(ai_line) == threat:
+            score += 5
+        elif not ai_line and popcount(player_line) == threat:
+            score -= 5
+
+    return score
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult(NamedTuple):
+    move: Optional[int]
+    score: float  # from the searching player's point of view
+    depth: int  # last fully completed iteration
+    nodes: int
+    elapsed_ms: float
+    pv: List[int]
+
+
+class Searcher:
+    def __init__(self, time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                 max_depth: Optional[int] = None,
+                 table: Optional[TranspositionTable] = None):
+        self.time_budget_ms = time_budget_ms
+        self.max_depth = max_depth
+        self.table = table if table is not None else shared_table()
+        self.nodes = 0
+        self._deadline = 0.0
+        self._partial = None
+
+    def search(self, state: BitBoard, player: int) -> SearchResult:
+        """Best move for player, deepening until the budget runs out or the game is solved."""
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget_ms / 1000
+        self.nodes = 0
+        # Work on a copy so an interrupted iteration never leaves the caller's board dirty
+        state = state.copy()
+        self._reset_ordering(state.geometry.cells)
+
+        moves = state.candidate_moves()
+        if not moves:
+            return SearchResult(None, 0, 0, 0, 0.0, [])
+        empties = len(state.legal_moves())
+        max_depth = empties if self.max_depth is None else min(self.max_depth, empties)
+
+        best_move, best_score, completed, pv = moves[0], 0, 0, []
+        if len(moves) > 1:
+            for depth in range(1, max_depth + 1):
+                self._partial = None
+                try:
+                    best_score, pv = self._search_root(state, player, depth, pv)
+                except SearchTimeout:
+                    # Moves searched before the timeout are still real results at this depth
+                    if self._partial is not None:
+                        best_score, pv = self._partial
+                    break
+                best_move, completed = pv[0], depth
+                if abs(best_score) >= WIN_SCORE:
+                    break  # Proven win or loss, deeper search cannot change it
+            if pv:
+                best_move = pv[0]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return SearchResult(best_move, best_score, completed, self.nodes, elapsed_ms, pv)
+
+    def score_move(self, state: BitBoard, player: int, move: int, depth: int,
+                   alpha: float = -float('inf'), beta: float = float('inf'),
+                   pv: Optional[List[int]] = None):
+        """Search one root move to depth and return (score, pv) from player's point of view.
+
+        Scores at or below alpha are upper bounds, as in any fail-soft alpha-beta.
+        pv, if given, is a previous principal variation starting with move.
+        Raises SearchTimeout when the budget runs out.
+        """
+        self._deadline = time.perf_counter() + self.time_budget_ms / 1000
+        self.nodes = 0
+        state = state.copy()
+        self._reset_ordering(state.geometry.cells)
+        state.make(move, player)
+        child_pv = pv[1:] if pv and pv[0] == move else None
+        score, line = self._negamax(state, 3 - player, depth - 1, 1, -beta, -alpha, move, child_pv)
+        return -score, [move] + line
+
+    def _reset_ordering(self, cells: int):
+        self.killers = [[None, None] for _ in range(cells + 1)]
+        self.history = [None, [0] * cells, [0] * cells]
+
+    def _sign(self, player: int) -> int:
+        return 1 if player == 2 else -1
+
+    def _order(self, state: BitBoard, player: int, ply: int, pv: Optional[List[int]]) -> List[int]:
+        pv_move = pv[0] if pv else None
+        killers = self.killers[ply]
+        history = self.history[player]
+
+        def priority(move):
+            if move == pv_move:
+                return _PV_PRIORITY
+            if move in killers:
+                return _KILLER_PRIORITY
+            return history[move]
+
+        return sorted(state.candidate_moves(), key=priority, reverse=True)
+
+    def _search_root(self, state: BitBoard, player: int, depth: int, pv: List[int]):
+        opponent = 3 - player
+        alpha, beta = -float('inf'), float('inf')
+        best_score, best_line = None, []
+        for move in self._order(state, player, 0, pv):
+            child_pv = pv[1:] if pv and pv[0] == move else None
+            state.make(move, player)
+            score, line = self._negamax(state, opponent, depth - 1, 1, -beta, -alpha, move, child_pv)
+            state.unmake(move, player)
+            score = -score
+            if best_score is None or score > best_score:
+                best_score, best_line = score, [move] + line
+                self._partial = (best_score, best_line)
+            alpha = max(alpha, score)
+        return best_score, best_line
+
+    def _negamax(self, state, player, depth, ply, alpha, beta, last_move, pv):
+        self.nodes += 1
+        if not self.nodes % _CLOCK_INTERVAL and time.perf_counter() > self._deadline:
+            raise SearchTimeout
+
+        # Only lines through the opponent's last move can have ended the game
+        opponent = 3 - player
+        result = state.result_after(last_move, opponent)
+        if result is not None or depth == 0:
+            return self._sign(player) * evaluate(state, result), []
+
+        key = (state.geometry.key, state.canonical_key(), player)
+        alpha_orig, beta_orig = alpha, beta
+        cached, alpha, beta = self.table.lookup(key, depth, alpha, beta)
+        if cached is not None:
+            return cached, []
+
+        best_score, best_line = -float('inf'), []
+        for move in self._order(state, player, ply, pv):
+            child_pv = pv[1:] if pv and pv[0] == move else None
+            state.make(move, player)
+            score, line = self._negamax(state, opponent, depth - 1, ply + 1, -beta, -alpha, move, child_pv)
+            state.unmake(move, player)
+            score = -score
+            if score > best_score:
+                best_score, best_line = score, [move] + line
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self._record_cutoff(move, player, ply, depth)
+                break
+
+        self.table.record(key, best_score, depth, alpha_orig, beta_orig)
+        return best_score, best_line
+
+    def _record_cutoff(self, move, player, ply, depth):
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[player][move] += depth * depth
@@ -0,0 +1,148 @@
+"""Headless AI-vs-AI self-play for regression-testing AI strength and throughput.
+
+Examples::
+
+    python selfplay.py --games 100000 --x easy --o hard
+    python selfplay.py --games 1000000 --x hard --o hard --workers 8 --output games.csv
+    python selfplay.py --games 200 --x mcts --o hard --width 7 --height 7 --win-length 4 --time-ms 50
+
+Results stream to the output file one CSV row per game (game, x, o, winner,
+space-separated move indices) as chunks finish, so memory stays flat no
+matter how many games are played. ``--records`` also (or instead) appends
+every game to a compact binary archive (see record.py), one byte per move,
+which ``main.py --replay`` can play back. Progress and the final games/sec go to
+stderr/stdout.
+"""
+import argparse
+import csv
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ai import DIFFICULTIES, choose_move
+from bitboard import Geometry, get_geometry
+from core import Match
+from record import MAX_CELLS, GameRecord, RecordWriter
+from search import DEFAULT_TIME_BUDGET_MS, Searcher
+
+CSV_HEADER = ["game", "x", "o", "winner", "moves"]
+DEFAULT_CHUNK_SIZE = 250
+
+GameRow = Tuple[int, int, List[int]]  # game id, winner, moves
+
+
+def make_searchers(difficulties: Tuple[str, str], time_budget_ms: float) -> Dict[int, object]:
+    # One engine per side so MCTS trees and search state never mix between players
+    searchers = {}
+    for player, difficulty in zip((1, 2), difficulties):
+        if difficulty == "mcts":
+            from mcts import MCTSSearcher  # Pulls in NumPy, so only when an MCTS side plays
+            searchers[player] = MCTSSearcher(time_budget_ms)
+        elif difficulty == "hard":
+            searchers[player] = Searcher(time_budget_ms)
+    return searchers
+
+
+def play_game(geometry: Geometry, difficulties: Tuple[str, str], time_budget_ms: float,
+              searchers: Optional[Dict[int, object]] = None) -> Match:
+    """Play one AI-vs-AI game to the end; difficulties are for X and O."""
+    if searchers is None:
+        searchers = make_searchers(difficulties, time_budget_ms)
+    match = Match(geometry=geometry)
+    while not match.is_over:
+        player = match.current_player
+        index = choose_move(match.state, player, difficulties[player - 1], time_budget_ms,
+                            searchers.get(player))
+        match.play(index)
+    return match
+
+
+def _play_chunk(task) -> List[GameRow]:
+    geometry_key, difficulties, time_budget_ms, seed, first_game, count = task
+    geometry = get_geometry(*geometry_key)
+    searchers = make_searchers(difficulties, time_budget_ms)
+    rows = []
+    for game in range(first_game, first_game + count):
+        if seed is not None:
+            random.seed(seed + game)
+        match = play_game(geometry, difficulties, time_budget_ms, searchers)
+        rows.append((game, match.winner, match.history))
+    return rows
+
+
+def run_selfplay(games: int, difficulties: Tuple[str, str], geometry: Geometry,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS, workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, seed: Optional[int] = None) -> Iterator[GameRow]:
+    """Yield (game, winner, moves) for every game, in completion order."""
+    tasks = [(geometry.key, difficulties, time_budget_ms, seed, start, min(chunk_size, games - start))
+             for start in range(0, games, chunk_size)]
+    if workers <= 1:
+        for task in tasks:
+            yield from _play_chunk(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        for rows in pool.imap_unordered(_play_chunk, tasks):
+            yield from rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI games headlessly")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--x", choices=DIFFICULTIES, default="easy", help="AI playing X (moves first)")
+    parser.add_argument("--o", choices=DIFFICULTIES, default="hard", help="AI playing O")
+    parser.add_argument("--width", type=int, default=3)
+    parser.add_argument("--height", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--time-ms", type=float, default=DEFAULT_TIME_BUDGET_MS,
+                        help="search budget per hard/mcts move")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="CSV file to stream results to")
+    parser.add_argument("--records", default=None, help="binary record file to append games to")
+    parser.add_argument("--progress-every", type=float, default=5.0, metavar="SECONDS")
+    args = parser.parse_args(argv)
+
+    geometry = get_geometry(args.width, args.height, args.win_length)
+    if args.records and geometry.cells > MAX_CELLS:
+        parser.error(f"--records supports boards of up to {MAX_CELLS} cells")
+    difficulties = (args.x, args.o)
+    out = open(args.output, "w", newline="") if args.output else None
+    writer = csv.writer(out) if out else None
+    if writer:
+        writer.writerow(CSV_HEADER)
+    records = RecordWriter(args.records) if args.records else None
+
+    results = Counter()
+    start = last_report = time.perf_counter()
+    try:
+        for game, winner, moves in run_selfplay(args.games, difficulties, geometry, args.time_ms,
+                                                args.workers, args.chunk_size, args.seed):
+            results[winner] += 1
+            if writer:
+                writer.writerow([game, args.x, args.o, winner, " ".join(map(str, moves))])
+            if records:
+                records.write(GameRecord.from_moves(geometry, moves, winner))
+            now = time.perf_counter()
+            if now - last_report >= args.progress_every:
+                done = sum(results.values())
+                print(f"{done}/{args.games} games, {done / (now - start):.0f} games/sec", file=sys.stderr)
+                last_report = now
+    finally:
+        if out:
+            out.close()
+        if records:
+            records.close()
+
+    elapsed = time.perf_counter() - start
+    total = sum(results.values())
+    print(f"{total} games of {args.x} (X) vs {args.o} (O) on {args.width}x{args.height} k={args.win_length}")
+    print(f"X wins {results[1]}, O wins {results[2]}, draws {results[0]}")
+    print(f"{elapsed:.2f}s, {total / elapsed if elapsed else 0:.0f} games/sec")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""Asyncio game server: many concurrent human-vs-AI matches in one process.
+
+Examples::
+
+    python server.py --port 7777
+    python server.py --port 7777 --workers 4 --max-sessions 20000 --idle-timeout 120
+
+Each TCP connection is one session holding one ``Match`` at a time. The
+protocol is one JSON object per line each way::
+
+    {"op": "new", "difficulty": "hard", "width": 3, "height": 3, "win_length": 3, "ai_first": false}
+    {"op": "move", "index": 4}
+    {"op": "state"}
+    {"op": "quit"}
+
+and every request gets one reply: ``{"ok": true, "board": ".X..O....",
+"to_move": 1, "winner": null, "ai_move": 4, "moves": 2}`` or ``{"ok": false,
+"error": "..."}``. After a legal human move the server answers with the AI's
+reply already played. If the AI search fails (a crashed worker, for example)
+the human move is taken back and the reply is an error; the session stays open.
+
+AI moves go to an ``AIWorker`` pool, so the event loop only parses lines and
+applies moves. At most ``max_pending_ai`` searches are queued at once; sessions
+beyond that wait without reading further input, which pushes back on their
+clients through TCP. Connections beyond ``max_sessions`` are refused, and a
+session that sends nothing for ``idle_timeout`` seconds is closed. A board
+shape that is not in the bounded geometry cache is built on a thread, since
+a large one takes a noticeable fraction of a second.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+from ai import DIFFICULTIES
+from ai_worker import AIWorker
+from bitboard import Geometry, cached_geometry, get_geometry
+from core import Match
+from search import DEFAULT_TIME_BUDGET_MS
+
+DEFAULT_PORT = 7777
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_MAX_PENDING_AI = 64
+DEFAULT_IDLE_TIMEOUT = 60.0
+MAX_LINE = 4096  # Longest request line, in bytes
+MAX_BOARD_CELLS = 400
+SYMBOLS = ".XO"
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class AIError(Exception):
+    """The worker pool could not produce a move."""
+
+
+def check_new_game(width: int, height: int, win_length: int, difficulty: str):
+    if difficulty not in DIFFICULTIES:
+        raise ProtocolError(f"unknown difficulty {difficulty!r}")
+    if not (1 <= win_length <= max(width, height) and width * height <= MAX_BOARD_CELLS
+            and width > 0 and height > 0):
+        raise ProtocolError(f"unsupported board {width}x{height} k={win_length}")
+
+
+class Session:
+    """One connection's match and AI settings."""
+
+    __slots__ = ("id", "match", "difficulty", "task")
+
+    def __init__(self, session_id: int, task: Optional[asyncio.Task] = None):
+        self.id = session_id
+        self.match: Optional[Match] = None
+        self.difficulty = "hard"
+        self.task = task  # The connection's handler, cancelled by GameServer.close
+
+    def new_game(self, geometry: Geometry, difficulty: str):
+        # Reuse the match when the board size has not changed
+        if self.match is not None and self.match.geometry.key == geometry.key:
+            self.match.reset()
+        else:
+            self.match = Match(geometry=geometry)
+        self.difficulty = difficulty
+
+    def snapshot(self, ai_move: Optional[int] = None) -> dict:
+        match = self.match
+        x_bits, o_bits = match.state.bits[1], match.state.bits[2]
+        board = "".join(SYMBOLS[(x_bits >> i & 1) + 2 * (o_bits >> i & 1)] for i in range(match.geometry.cells))
+        return {"ok": True, "board": board, "to_move": match.current_player, "winner": match.winner,
+                "ai_move": ai_move, "moves": len(match.history)}
+
+
+class GameServer:
+    def __init__(self, ai_worker: Optional[AIWorker] = None, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 max_pending_ai: int = DEFAULT_MAX_PENDING_AI, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS):
+        self.ai_worker = ai_worker or AIWorker(use_processes=True, max_workers=os.cpu_count() or 1)
+        self.max_sessions = max_sessions
+        self.max_pending_ai = max_pending_ai
+        self.idle_timeout = idle_timeout
+        self.time_budget_ms = time_budget_ms
+        self.sessions = {}
+        self._next_id = 0
+        self._building: Dict[tuple, asyncio.Future] = {}  # Geometries being built, by shape
+        self._ai_slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.peak_sessions = 0
+        self.moves = 0  # Human and AI moves applied
+        self.ai_moves = 0
+        self.refused = 0  # Connections turned away at max_sessions
+        self.timeouts = 0
+        self.ai_failures = 0  # Searches that raised, e.g. on a broken worker pool
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        self._ai_slots = asyncio.Semaphore(self.max_pending_ai)
+        self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop accepting, end every open session, then shut down the worker pool."""
+        if self._server is not None:
+            self._server.close()
+            # Handlers would otherwise sit in readline until their idle timeout
+            tasks = [session.task for session in self.sessions.values() if session.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+        self.ai_worker.shutdown()
+
+    def stats(self) -> dict:
+        return {"sessions": len(self.sessions), "peak_sessions": self.peak_sessions, "moves": self.moves,
+                "ai_moves": self.ai_moves, "refused": self.refused, "timeouts": self.timeouts,
+                "ai_failures": self.ai_failures}
+
+    async def _send(self, writer: asyncio.StreamWriter, reply: dict):
+        writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+        # Wait for slow readers instead of buffering without bound
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self.sessions) >= self.max_sessions:
+            self.refused += 1
+            await self._send(writer, {"ok": False, "error": "server full"})
+            writer.close()
+            return
+        self._next_id += 1
+        session = self.sessions[self._next_id] = Session(self._next_id, asyncio.current_task())
+        self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    await self._send(writer, {"ok": False, "error": "idle timeout"})
+                    break
+                except ValueError:
+                    # Longer than MAX_LINE; the stream cannot be resynchronised
+                    await self._send(writer, {"ok": False, "error": "line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("request must be a JSON object")
+                    if request.get("op") == "quit":
+                        break
+                    reply = await self.dispatch(session, request)
+                except (ProtocolError, AIError, ValueError, TypeError) as error:
+                    reply = {"ok": False, "error": str(error)}
+                await self._send(writer, reply)
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # close() ending the session; the streams callback logs handlers that end cancelled
+            pass
+        finally:
+            del self.sessions[session.id]
+            writer.close()
+
+    async def dispatch(self, session: Session, request: dict) -> dict:
+        op = request.get("op")
+        if op == "new":
+            shape = tuple(int(request.get(name, 3)) for name in ("width", "height", "win_length"))
+            difficulty = request.get("difficulty", "hard")
+            check_new_game(*shape, difficulty)
+            session.new_game(await self.geometry(*shape), difficulty)
+            ai_move = await self.ai_move(session) if request.get("ai_first") else None
+            return session.snapshot(ai_move)
+        if session.match is None:
+            raise ProtocolError("no game; send a 'new' request first")
+        if op == "state":
+            return session.snapshot()
+        if op == "move":
+            index = int(request["index"]) if "index" in request else None
+            if index is None or not session.match.play(index):
+                raise ProtocolError(f"illegal move {request.get('index')!r}")
+            self.moves += 1
+            if session.match.is_over:
+                return session.snapshot()
+            try:
+                ai_move = await self.ai_move(session)
+            except AIError:
+                # Give the turn back so the client can retry the move
+                session.match.undo()
+                self.moves -= 1
+                raise
+            return session.snapshot(ai_move)
+        raise ProtocolError(f"unknown op {op!r}")
+
+    async def geometry(self, width: int, height: int, win_length: int) -> Geometry:
+        """The board geometry, built on a thread when not cached so the loop keeps serving."""
+        geometry = cached_geometry(width, height, win_length)
+        if geometry is not None:
+            return geometry
+        key = (width, height, win_length)
+        building = self._building.get(key)
+        if building is None:
+            # Sessions asking for the same new shape share one build
+            building = self._building[key] = asyncio.get_running_loop().run_in_executor(
+                None, get_geometry, width, height, win_length)
+            building.add_done_callback(lambda _: self._building.pop(key, None))
+        return await asyncio.shield(building)
+
+    async def ai_move(self, session: Session) -> Optional[int]:
+        """Search in the worker pool and play the result; the loop keeps serving meanwhile."""
+        match = session.match
+        key = match.state.key()
+        searcher = None
+        if session.difficulty == "mcts" and not self.ai_worker.use_processes:
+            # The shared default MCTS tree is not safe to grow from several threads
+            from mcts import MCTSSearcher
+            searcher = MCTSSearcher(self.time_budget_ms)
+        async with self._ai_slots:
+            try:
+                future = self.ai_worker.request_move(match.state, match.current_player, session.difficulty,
+                                                     self.time_budget_ms, searcher)
+                index = await asyncio.wrap_future(future)
+            except Exception as error:
+                self.ai_failures += 1
+                raise AIError(f"AI move failed: {error!r}") from error
+        if index is None or match.state.key() != key or not match.play(index):
+            return None
+        self.moves += 1
+        self.ai_moves += 1
+        return index
+
+
+async def serve(args):
+    worker = AIWorker(use_processes=args.ai_worker == "process", max_workers=args.workers)
+    server = GameServer(worker, args.max_sessions, args.max_pending_ai, args.idle_timeout, args.ai_time_ms)
+    await server.start(args.host, args.port)
+    print(f"serving on {args.host}:{server.port}", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        while True:
+            await asyncio.sleep(args.stats_every)
+            stats = server.stats()
+            rate = stats["moves"] / (time.perf_counter() - start)
+            print(f"{stats['sessions']} sessions (peak {stats['peak_sessions']}), {stats['moves']} moves, "
+                  f"{rate:.0f} moves/sec, {stats['refused']} refused, {stats['timeouts']} timed out, "
+                  f"{stats['ai_failures']} AI failures",
+                  file=sys.stderr)
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve human-vs-AI matches over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ai-worker", choices=["process", "thread"], default="process")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="AI worker pool size")
+    parser.add_argument("--ai-time-ms", type=float, default=DEFAULT_TIME_BUDGET_MS)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument("--max-pending-ai", type=int, default=DEFAULT_MAX_PENDING_AI,
+                        help="AI searches queued at once; further sessions wait")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, metavar="SECONDS")
+    parser.add_argument("--stats-every", type=float, default=10.0, metavar="SECONDS")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
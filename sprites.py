@@ -0,0 +1,135 @@
+"""Pre-rendered glyph sprites for the board and buttons.
+
+X and O glyphs, grid lines and button faces/glows only ever change in scale
+and alpha, so each is drawn once per size (glyph scales are rounded to
+``1 / SCALE_STEPS``) at full opacity with the same draw calls ``main`` used
+to make every frame, and then blitted with a per-surface alpha.
+"""
+from typing import Callable, Dict, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+SCALE_STEPS = 20
+GRID_LINE_PAD = 4  # Room around a grid line sprite for its thickest stroke
+
+
+def quantize_scale(scale: float) -> float:
+    return round(scale * SCALE_STEPS) / SCALE_STEPS
+
+
+def set_alpha(sprite: pygame.Surface, alpha: int) -> pygame.Surface:
+    # Per-surface alpha multiplies the sprite's own per-pixel alpha
+    sprite.set_alpha(max(0, min(255, int(alpha))))
+    return sprite
+
+
+class SpriteAtlas:
+    def __init__(self):
+        self._sprites: Dict[tuple, pygame.Surface] = {}
+        self.renders = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def _cached(self, key: tuple, render: Callable[[], pygame.Surface]) -> pygame.Surface:
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = render()
+            self.renders += 1
+        return sprite
+
+    def clear(self):
+        self._sprites.clear()
+
+    def x_glyph(self, cell_size: int, scale: float, color: Color) -> pygame.Surface:
+        """X with its glow, centred on the sprite; blit with get_rect(center=...)."""
+        scale = quantize_scale(scale)
+        return self._cached(("x", cell_size, scale, color), lambda: self._render_x(cell_size, scale, color))
+
+    def o_glyph(self, cell_size: int, scale: float, color: Color) -> pygame.Surface:
+        scale = quantize_scale(scale)
+        return self._cached(("o", cell_size, scale, color), lambda: self._render_o(cell_size, scale, color))
+
+    @staticmethod
+    def _glyph_metrics(cell_size: int, scale: float):
+        # Glyphs were tuned for 200px cells; strokes scale with the cell size
+        size = int(cell_size * 0.3 * scale)
+        thickness = max(1, int(15 * scale * cell_size / 200))
+        return size, thickness
+
+    def _render_x(self, cell_size: int, scale: float, color: Color) -> pygame.Surface:
+        size, thickness = self._glyph_metrics(cell_size, scale)
+        half = size + thickness + 8
+        sprite = pygame.Surface((2 * half + 1, 2 * half + 1), pygame.SRCALPHA)
+        for i in range(3):
+            glow_alpha = 255 // (i + 2)
+            glow_thickness = thickness + i * 2
+            pygame.draw.line(sprite, (*color, glow_alpha),
+                             (half - size - i, half - size - i), (half + size + i, half + size + i),
+                             glow_thickness)
+            pygame.draw.line(sprite, (*color, glow_alpha),
+                             (half + size + i, half - size - i), (half - size - i, half + size + i),
+                             glow_thickness)
+        return sprite
+
+    def _render_o(self, cell_size: int, scale: float, color: Color) -> pygame.Surface:
+        radius, thickness = self._glyph_metrics(cell_size, scale)
+        half = radius + 4
+        sprite = pygame.Surface((2 * half + 1, 2 * half + 1), pygame.SRCALPHA)
+        for i in range(3):
+            pygame.draw.circle(sprite, (*color, 255 // (i + 2)), (half, half), radius + i, thickness + i * 2)
+        return sprite
+
+    def grid_line(self, length: int, vertical: bool, color: Color) -> pygame.Surface:
+        """Glowing grid line of length px, padded by GRID_LINE_PAD on every side."""
+        return self._cached(("grid", length, vertical, color), lambda: self._render_grid_line(length, vertical, color))
+
+    def _render_grid_line(self, length: int, vertical: bool, color: Color) -> pygame.Surface:
+        pad = GRID_LINE_PAD
+        size = (2 * pad, length + 2 * pad) if vertical else (length + 2 * pad, 2 * pad)
+        sprite = pygame.Surface(size, pygame.SRCALPHA)
+        end = (pad, pad + length) if vertical else (pad + length, pad)
+        for thickness in range(6, 0, -1):
+            alpha = 60 if thickness == 6 else 25
+            pygame.draw.line(sprite, (*color, alpha), (pad, pad), end, thickness)
+        return sprite
+
+    def button_face(self, size: Tuple[int, int], color: Color, alpha: int,
+                    border_color: Optional[Color] = None) -> pygame.Surface:
+        key = ("button", tuple(size), color, alpha, border_color)
+        return self._cached(key, lambda: self._render_button_face(size, color, alpha, border_color))
+
+    @staticmethod
+    def _render_button_face(size, color, alpha, border_color) -> pygame.Surface:
+        sprite = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(sprite, (*color, alpha), sprite.get_rect(), border_radius=25)
+        if border_color is not None:
+            pygame.draw.rect(sprite, (*border_color, alpha), sprite.get_rect(), border_radius=25, width=3)
+        return sprite
+
+    def button_glow(self, size: Tuple[int, int], color: Color) -> pygame.Surface:
+        """20px glow around a button of size, at full strength; scale it with set_alpha."""
+        return self._cached(("glow", tuple(size), color), lambda: self._render_button_glow(size, color))
+
+    @staticmethod
+    def _render_button_glow(size, color) -> pygame.Surface:
+        width, height = size
+        sprite = pygame.Surface((width + 40, height + 40), pygame.SRCALPHA)
+        for i in range(20, 0, -2):
+            alpha = int(30 - (i * 1.5))
+            pygame.draw.rect(sprite, (*color, alpha), pygame.Rect(20 - i, 20 - i, width + i * 2, height + i * 2),
+                             border_radius=25 + i)
+        return sprite
+
+
+_shared_atlas = None
+
+
+def shared_atlas() -> SpriteAtlas:
+    """Process-wide atlas shared by the board and every Button."""
+    global _shared_atlas
+    if _shared_atlas is None:
+        _shared_atlas = SpriteAtlas()
+    return _shared_atlas
@@ -0,0 +1,70 @@
+"""Reusable scratch surfaces for per-frame drawing, with allocation counters.
+
+``SurfacePool.acquire(name, size)`` hands back the same surface every frame
+for a given name, size and flags, cleared only over the area the previous
+frame marked dirty, instead of a fresh ``pygame.Surface`` per call. Surfaces
+that pygame has to create anyway (``transform.rotozoom`` results) are counted
+with ``note_transient`` so the per-frame numbers stay honest.
+"""
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+TRANSPARENT = (0, 0, 0, 0)
+
+
+class SurfacePool:
+    def __init__(self):
+        self._surfaces: Dict[tuple, pygame.Surface] = {}
+        self._dirty: Dict[tuple, Optional[pygame.Rect]] = {}
+        self.allocations = 0  # Surfaces created by the pool
+        self.transients = 0   # Surfaces created outside the pool, reported by callers
+        self.reuses = 0
+        self.frame_allocations = 0  # allocations + transients since begin_frame
+
+    def begin_frame(self):
+        self.frame_allocations = 0
+
+    def acquire(self, name: str, size: Tuple[int, int], flags: int = pygame.SRCALPHA,
+                clear: bool = True) -> pygame.Surface:
+        """Scratch surface for name; transparent unless clear is False.
+
+        The whole surface counts as dirty after acquire, so callers that only
+        draw into part of it should narrow that with ``mark_dirty``.
+        """
+        key = (name, tuple(size), flags)
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = pygame.Surface(size, flags)
+            self.allocations += 1
+            self.frame_allocations += 1
+        else:
+            self.reuses += 1
+            dirty = self._dirty.get(key)
+            if clear and dirty is not None:
+                surface.fill(TRANSPARENT, dirty)
+        self._dirty[key] = surface.get_rect()
+        return surface
+
+    def mark_dirty(self, name: str, size: Tuple[int, int], rect: Optional[pygame.Rect],
+                   flags: int = pygame.SRCALPHA):
+        """Record the area drawn this frame (None for nothing) so the next acquire clears only that."""
+        self._dirty[(name, tuple(size), flags)] = None if rect is None else pygame.Rect(rect)
+
+    def note_transient(self, count: int = 1):
+        self.transients += count
+        self.frame_allocations += count
+
+    def release_all(self):
+        # Drop every pooled surface, e.g. after the window or board size changed
+        self._surfaces.clear()
+        self._dirty.clear()
+
+    def stats(self) -> dict:
+        return {
+            "surfaces": len(self._surfaces),
+            "allocations": self.allocations,
+            "transients": self.transients,
+            "reuses": self.reuses,
+            "frame_allocations": self.frame_allocations,
+        }
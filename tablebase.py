@@ -0,0 +1,322 @@
+"""Disk-backed retrograde tablebase for small m,n,k boards such as 4x4 and 5x4 k=4.
+
+Every position with a legal stone count (X has as many stones as O, or one
+more) gets one signed byte: ``DECISIVE - d`` when the side to move wins in d
+plies with best play, ``-(DECISIVE - d)`` when it loses in d plies, and 0 for
+a draw. Positions are numbered by a minimal perfect hash: grouped into layers
+by stone count, then ranked by which cells are occupied and which of those
+hold X, using the combinatorial number system. 4x4 has 10.2 million such
+positions (10 MB) and 5x4 has 741 million (741 MB).
+
+Stones are never removed, so every move leads to the next layer. Layers are
+solved from the full board back to the empty one, in chunks of
+``chunk_size`` positions: each chunk is unranked, its children ranked and
+their values read back from the file through ``numpy.memmap``. Memory stays
+bounded by the chunk size rather than the table size. After every chunk the
+data is flushed and the position reached is saved next to the table, so an
+interrupted build picks up where it stopped when run again::
+
+    python tablebase.py --width 4 --height 4 --win-length 4
+    python tablebase.py --width 5 --height 4 --win-length 4 --chunk-size 65536
+
+Tables live in ``tablebases/`` as ``<w>x<h>k<k>.tb``; ``choose_move`` plays
+from them, when one exists for the board, instead of searching.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from math import comb
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bitboard import BitBoard, Geometry, get_geometry
+from perfect_play import DRAW, LOSS, WIN
+
+MAGIC = b"TTTB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBB")  # magic, version, width, height, win_length, complete
+DECISIVE = 100  # Score of winning on this move; wins in d plies score DECISIVE - d
+MAX_CELLS = 25
+DEFAULT_CHUNK_SIZE = 1 << 15
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebases")
+
+
+def layer_sizes(cells: int) -> List[int]:
+    # Positions with n stones: which cells are occupied, then which of them are X
+    return [comb(cells, n) * comb(n, (n + 1) // 2) for n in range(cells + 1)]
+
+
+def position_index(x_bits: int, o_bits: int, cells: int) -> Tuple[int, int]:
+    """(stone count, index within that layer) of a position."""
+    occupied_rank = x_rank = stones = x_stones = 0
+    for i in range(cells):
+        if (x_bits | o_bits) >> i & 1:
+            stones += 1
+            occupied_rank += comb(i, stones)
+            if x_bits >> i & 1:
+                x_stones += 1
+                x_rank += comb(stones - 1, x_stones)
+    return stones, occupied_rank * comb(stones, (stones + 1) // 2) + x_rank
+
+
+def _comb_table(cells: int) -> np.ndarray:
+    return np.array([[comb(i, k) for k in range(cells + 2)] for i in range(cells + 2)], dtype=np.int64)
+
+
+def _unrank(indices: np.ndarray, n: int, cells: int, table: np.ndarray):
+    """X and O bitboards for an array of indices into layer n."""
+    occupied_rank, x_rank = np.divmod(indices, table[n, (n + 1) // 2])
+    occupied = np.zeros_like(indices)
+    remaining = np.full_like(indices, n)
+    for i in range(cells - 1, -1, -1):
+        value = table[i, remaining]
+        take = (remaining > 0) & (occupied_rank >= value)
+        occupied |= take.astype(np.int64) << i
+        occupied_rank -= np.where(take, value, 0)
+        remaining -= take
+    # Which occupied slots, counted from the lowest cell, hold X
+    slots = np.zeros_like(indices)
+    remaining = np.full_like(indices, (n + 1) // 2)
+    for slot in range(n - 1, -1, -1):
+        value = table[slot, remaining]
+        take = (remaining > 0) & (x_rank >= value)
+        slots |= take.astype(np.int64) << slot
+        x_rank -= np.where(take, value, 0)
+        remaining -= take
+    x_bits = np.zeros_like(indices)
+    slot = np.zeros_like(indices)
+    for i in range(cells):
+        here = occupied >> i & 1
+        x_bits |= (slots >> slot & here) << i
+        slot += here
+    return x_bits, occupied & ~x_bits
+
+
+def _has_line(bits: np.ndarray, line_masks) -> np.ndarray:
+    result = np.zeros(len(bits), dtype=bool)
+    for mask in line_masks:
+        result |= bits & mask == mask
+    return result
+
+
+def _exclusive_prefix(values: np.ndarray) -> np.ndarray:
+    return np.cumsum(values, axis=0) - values
+
+
+def _exclusive_suffix(values: np.ndarray) -> np.ndarray:
+    return np.cumsum(values[::-1], axis=0)[::-1] - values
+
+
+def _solve_chunk(x_bits: np.ndarray, o_bits: np.ndarray, n: int, geometry: Geometry,
+                 table: np.ndarray, children: Optional[np.ndarray]) -> np.ndarray:
+    """Scores for positions in layer n, given the solved layer n + 1."""
+    cells = geometry.cells
+    x_to_move = n % 2 == 0
+    mover, other = (x_bits, o_bits) if x_to_move else (o_bits, x_bits)
+    lost = _has_line(other, geometry.line_masks)
+    # Only reachable by hand-built positions; the side to move has already won
+    won = _has_line(mover, geometry.line_masks) & ~lost
+    terminal = np.where(lost, -DECISIVE, np.where(won, DECISIVE, 0)).astype(np.int8)
+    if n == cells:
+        return terminal
+
+    # Rank each child (one more stone on cell c) from prefix and suffix sums over cells
+    cell = np.arange(cells)[:, None]
+    occupied = (x_bits | o_bits)[None, :] >> cell & 1
+    xs = x_bits[None, :] >> cell & 1
+    below = _exclusive_prefix(occupied)  # Occupied cells below each cell
+    x_below = _exclusive_prefix(xs)
+    occupied_rank = (_exclusive_prefix(occupied * table[cell, below + 1]) + table[cell, below + 1]
+                     + _exclusive_suffix(occupied * table[cell, below + 2]))
+    x_rank = _exclusive_prefix(xs * table[below, x_below + 1])
+    if x_to_move:
+        x_rank += table[below, x_below + 1] + _exclusive_suffix(xs * table[below + 1, x_below + 2])
+    else:
+        x_rank += _exclusive_suffix(xs * table[below + 1, x_below + 1])
+    child = occupied_rank * table[n + 1, (n + 2) // 2] + x_rank
+    empty = occupied == 0
+
+    # A child lost in d plies is a win in d + 1 for us, and the other way round
+    flipped = -children[np.where(empty, child, 0)].astype(np.int16)
+    best = np.where(empty, flipped - np.sign(flipped), -DECISIVE - 1).max(axis=0)
+    return np.where(lost | won, terminal, best).astype(np.int8)
+
+
+def _read_header(path: str):
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a tablebase")
+    magic, version, width, height, win_length, complete = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} tablebase")
+    return (width, height, win_length), bool(complete)
+
+
+def build(geometry: Geometry, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+          max_chunks: Optional[int] = None, report=None) -> bool:
+    """Solve geometry into path, resuming a partial build; True once the table is complete.
+
+    max_chunks stops early (as an interruption would) after that many chunks;
+    report(done, total) is called after each chunk.
+    """
+    cells = geometry.cells
+    if cells > MAX_CELLS:
+        raise ValueError(f"{geometry} has more than {MAX_CELLS} cells")
+    sizes = layer_sizes(cells)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    total = int(offsets[-1])
+    progress_path = path + ".progress"
+
+    layer, done = cells, 0
+    if os.path.exists(path):
+        key, complete = _read_header(path)
+        if key != geometry.key:
+            raise ValueError(f"{path} holds a tablebase for {key}, not {geometry.key}")
+        if complete:
+            return True
+        if os.path.exists(progress_path):
+            with open(progress_path) as f:
+                progress = json.load(f)
+            layer, done = progress["layer"], progress["done"]
+    else:
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, *geometry.key, 0))
+            f.truncate(HEADER.size + total)
+
+    data = np.memmap(path, dtype=np.int8, mode="r+", offset=HEADER.size, shape=(total,))
+    table = _comb_table(cells)
+    chunks = 0
+    try:
+        for n in range(layer, -1, -1):
+            start = offsets[n]
+            children = data[offsets[n + 1]:offsets[n + 2]] if n < cells else None
+            for first in range(done if n == layer else 0, sizes[n], chunk_size):
+                if max_chunks is not None and chunks >= max_chunks:
+                    return False
+                last = min(first + chunk_size, sizes[n])
+                x_bits, o_bits = _unrank(np.arange(first, last, dtype=np.int64), n, cells, table)
+                data[start + first:start + last] = _solve_chunk(x_bits, o_bits, n, geometry, table, children)
+                data.flush()
+                # Written only after the data, so a resumed build never skips unsaved work
+                with open(progress_path + ".tmp", "w") as f:
+                    json.dump({"layer": n, "done": last}, f)
+                os.replace(progress_path + ".tmp", progress_path)
+                chunks += 1
+                if report is not None:
+                    report(int(total - offsets[n + 1]) + last, total)
+    finally:
+        del data
+    with open(path, "r+b") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, *geometry.key, 1))
+    os.remove(progress_path)
+    return True
+
+
+class Tablebase:
+    def __init__(self, path: str):
+        key, complete = _read_header(path)
+        if not complete:
+            raise ValueError(f"{path} is only partly built; run tablebase.py again to finish it")
+        self.geometry = get_geometry(*key)
+        sizes = layer_sizes(self.geometry.cells)
+        self._offsets = np.concatenate(([0], np.cumsum(sizes)))
+        self._data = np.memmap(path, dtype=np.int8, mode="r", offset=HEADER.size, shape=(int(self._offsets[-1]),))
+
+    def score(self, x_bits: int, o_bits: int) -> int:
+        n, index = position_index(x_bits, o_bits, self.geometry.cells)
+        return int(self._data[self._offsets[n] + index])
+
+    def _covers(self, state: BitBoard, player: int) -> bool:
+        x_stones, o_stones = bin(state.bits[1]).count("1"), bin(state.bits[2]).count("1")
+        return (state.geometry.key == self.geometry.key and x_stones - o_stones in (0, 1)
+                and player == (1 if x_stones == o_stones else 2))
+
+    def probe(self, state: BitBoard, player: int) -> Optional[Tuple[int, Optional[int]]]:
+        """(value, plies to the end) for the side to move, or None for positions not in the table.
+
+        value is perfect_play's WIN, DRAW or LOSS; draws have no distance.
+        """
+        if not self._covers(state, player):
+            return None
+        score = self.score(state.bits[1], state.bits[2])
+        if score == 0:
+            return DRAW, None
+        return (WIN, DECISIVE - score) if score > 0 else (LOSS, DECISIVE + score)
+
+    def best_moves(self, state: BitBoard, player: int) -> List[int]:
+        """Moves that win fastest, hold the draw, or lose slowest."""
+        if not self._covers(state, player) or state.winner() is not None:
+            return []
+        best, moves = None, []
+        bits = [state.bits[1], state.bits[2]]
+        for index in state.legal_moves():
+            bits[player - 1] |= 1 << index
+            flipped = -self.score(*bits)
+            bits[player - 1] &= ~(1 << index)
+            value = flipped - (flipped > 0) + (flipped < 0)
+            if best is None or value > best:
+                best, moves = value, [index]
+            elif value == best:
+                moves.append(index)
+        return moves
+
+    def close(self):
+        del self._data
+
+
+def tablebase_path(geometry: Geometry, directory: str = DEFAULT_DIR) -> str:
+    width, height, win_length = geometry.key
+    return os.path.join(directory, f"{width}x{height}k{win_length}.tb")
+
+
+_tablebases: Dict[Tuple[int, int, int], Optional[Tablebase]] = {}
+
+
+def get_tablebase(geometry: Geometry) -> Optional[Tablebase]:
+    """The finished tablebase for geometry in DEFAULT_DIR, or None; looked up once per process."""
+    if geometry.key not in _tablebases:
+        try:
+            _tablebases[geometry.key] = Tablebase(tablebase_path(geometry))
+        except (OSError, ValueError):
+            _tablebases[geometry.key] = None
+    return _tablebases[geometry.key]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a retrograde tablebase (resumable)")
+    parser.add_argument("--width", type=int, default=4)
+    parser.add_argument("--height", type=int, default=4)
+    parser.add_argument("--win-length", type=int, default=4)
+    parser.add_argument("--output", default=None, help="defaults to tablebases/<w>x<h>k<k>.tb")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="positions solved per step; bounds memory use")
+    args = parser.parse_args(argv)
+
+    geometry = get_geometry(args.width, args.height, args.win_length)
+    path = args.output or tablebase_path(geometry)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    start = last_report = time.perf_counter()
+
+    def report(done, total):
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            print(f"{done}/{total} positions ({done / total:.1%})", file=sys.stderr)
+            last_report = now
+
+    build(geometry, path, args.chunk_size, report=report)
+    table = Tablebase(path)
+    value, distance = table.probe(BitBoard(geometry=geometry), 1)
+    outcome = {WIN: f"X wins in {distance} plies", DRAW: "a draw", LOSS: f"O wins in {distance} plies"}[value]
+    print(f"{path}: {len(table._data)} positions in {time.perf_counter() - start:.1f}s; "
+          f"with best play the game is {outcome}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
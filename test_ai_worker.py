@@ -0,0 +1,86 @@
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from ai_worker import AIWorker
+from bitboard import BitBoard, get_geometry
+import main
+from main import Game
+
+
+class TestAIWorker(unittest.TestCase):
+    def test_thread_worker(self):
+        """Test that a threaded worker returns the winning move."""
+        state = BitBoard.from_array([[2, 2, 0], [1, 1, 0], [1, 0, 0]])
+        with AIWorker() as worker:
+            future = worker.request_move(state, 2, "hard", 100)
+            self.assertEqual(future.result(timeout=5), 2)
+
+    def test_process_worker(self):
+        """Test that boards and geometries survive the trip to a worker process."""
+        geometry = get_geometry(5, 5, 4)
+        state = BitBoard(geometry=geometry)
+        state.make(geometry.index(2, 2), 1)
+        with AIWorker(use_processes=True) as worker:
+            move = worker.request_move(state, 2, "hard", 50).result(timeout=30)
+        self.assertIn(move, state.candidate_moves())
+
+
+class TestGameBackgroundAI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        main.open_window()
+
+    def setUp(self):
+        self.game = Game()
+        self.game.state = "game"
+        self.game.game_mode = "ai"
+        self.game.ai_difficulty = "hard"
+        self.game.ai_worker = AIWorker()
+
+    def tearDown(self):
+        self.game.ai_worker.shutdown(wait=True)
+
+    def test_request_and_poll(self):
+        """Test that the AI reply is applied by poll_ai, not by handle_click."""
+        self.game.handle_click(self.game.cell_center(0, 0))
+        self.assertTrue(self.game.ai_thinking)
+        # Clicks are ignored while the AI is thinking
+        self.game.handle_click(self.game.cell_center(2, 2))
+        self.assertEqual(self.game.board[2, 2], 0)
+        self.game._ai_request[0].result(timeout=5)
+        self.game.poll_ai()
+        self.assertFalse(self.game.ai_thinking)
+        self.assertEqual(self.game.board[1, 1], 2)
+        self.assertEqual(self.game.current_player, 1)
+
+    def test_worker_failure_falls_back(self):
+        """Test that a failed request is dropped and the move is searched in-process instead."""
+        future = Future()
+        future.set_exception(BrokenProcessPool("a worker process died"))
+        self.game.make_move(0, 0)
+        self.game._ai_request = (future, self.game._state.key(), 0.0)
+        worker = self.game.ai_worker
+        self.game.poll_ai()
+        self.assertFalse(self.game.ai_thinking)
+        self.assertIsNone(self.game.ai_worker)
+        self.assertEqual(self.game.board[1, 1], 2)
+        self.assertEqual(self.game.current_player, 1)
+        self.assertEqual(self.game.status_text()[0], "AI worker failed; Player X's turn")
+        self.game.make_move(0, 1)
+        self.assertEqual(self.game.status_text()[0], "Player O's turn")
+        self.game.ai_worker = worker  # For tearDown
+
+    def test_reset_discards_stale_request(self):
+        """Test that a reply for a reset game is never played."""
+        self.game.handle_click(self.game.cell_center(0, 0))
+        future = self.game._ai_request[0]
+        self.game.reset()
+        self.assertFalse(self.game.ai_thinking)
+        if not future.cancelled():
+            future.result(timeout=5)
+        self.game.poll_ai()
+        self.assertEqual(int(self.game.board.sum()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import pygame
+from background import GradientBackground
+
+TOP = (78, 29, 112)
+BOTTOM = (144, 58, 168)
+FILL = (1, 2, 3)
+
+
+def draw_lines(surface, offset):
+    # The per-row loop the cached background replaced
+    width, height = surface.get_size()
+    for y in range(height):
+        progress = y / height
+        color = tuple(int(a + (b - a) * progress) for a, b in zip(TOP, BOTTOM))
+        pygame.draw.line(surface, color, (max(0, offset), y), (width + min(0, offset), y))
+
+
+class TestGradientBackground(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.background = GradientBackground(TOP, BOTTOM)
+
+    def render(self, size, offset):
+        expected = pygame.Surface(size)
+        expected.fill(FILL)
+        draw_lines(expected, offset)
+        actual = pygame.Surface(size)
+        actual.fill(FILL)
+        self.background.draw(actual, lambda y: np.full(len(y), offset))
+        return pygame.surfarray.array3d(expected), pygame.surfarray.array3d(actual)
+
+    def test_matches_line_loop(self):
+        """Test that shifted strips produce the same pixels as the old draw.line loop."""
+        for offset in (0, 7, -5):
+            expected, actual = self.render((120, 90), offset)
+            self.assertTrue(np.array_equal(expected, actual), offset)
+
+    def test_cached_until_resize(self):
+        """Test that the gradient is only rendered again for a new size or palette."""
+        target = pygame.Surface((100, 80))
+        for _ in range(5):
+            self.background.draw(target, lambda y: np.sin(y))
+        self.assertEqual(self.background.builds, 1)
+        self.background.draw(pygame.Surface((100, 60)))
+        self.assertEqual(self.background.builds, 2)
+        self.background.set_palette(BOTTOM, TOP)
+        self.background.draw(pygame.Surface((100, 60)))
+        self.assertEqual(self.background.builds, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import random
+import unittest
+import numpy as np
+from batch_eval import IN_PROGRESS, batch_scores, batch_threats, batch_winners, states_to_array
+from bitboard import BitBoard, get_geometry
+from search import evaluate
+
+
+def random_states(geometry, count, seed):
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        state = BitBoard(geometry=geometry)
+        player = 1
+        for _ in range(rng.randint(0, geometry.cells)):
+            moves = state.legal_moves()
+            if not moves or state.winner() is not None:
+                break
+            state.make(rng.choice(moves), player)
+            player = 3 - player
+        states.append(state)
+    return states
+
+
+class TestBatchEval(unittest.TestCase):
+    def test_matches_scalar_code(self):
+        """Test winners and scores against BitBoard.winner and search.evaluate."""
+        for geometry in (get_geometry(), get_geometry(7, 6, 4)):
+            states = random_states(geometry, 300, seed=geometry.cells)
+            boards = states_to_array(states)
+            winners = batch_winners(boards, geometry.win_length)
+            scores = batch_scores(boards, geometry.win_length)
+            for state, board, winner, score in zip(states, boards, winners, scores):
+                self.assertTrue(np.array_equal(board, state.to_array()))
+                expected = state.winner()
+                self.assertEqual(winner, IN_PROGRESS if expected is None else expected)
+                self.assertEqual(score, evaluate(state, expected))
+
+    def test_threat_counts(self):
+        """Test two-in-a-row counting on a single 3x3 board."""
+        boards = np.array([[[1, 1, 0], [0, 2, 0], [2, 0, 0]]])
+        # X: top row; O: anti-diagonal through the center
+        self.assertEqual(batch_threats(boards).tolist(), [[1, 1]])
+
+    def test_rejects_single_board(self):
+        """Test that a lone (H, W) board is rejected instead of misread."""
+        with self.assertRaises(ValueError):
+            batch_winners(np.zeros((3, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from benchmark import BENCHMARKS, compare, measure, position
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_corpus_positions(self):
+        """Test that the fixed positions are legal, unfinished and give the right side to move."""
+        for name in ("opening", "midgame", "endgame", "7x7_midgame"):
+            state, player = position(name)
+            self.assertIsNone(state.winner(), name)
+            stones = bin(state.occupied).count("1")
+            self.assertEqual(player, 1 + stones % 2)
+
+    def test_measure(self):
+        """Test that a benchmark reports throughput and allocation."""
+        benchmark = next(b for b in BENCHMARKS if b.name == "winner_3x3")
+        result = measure(benchmark.setup(), min_time=0.01, rounds=1)
+        self.assertGreater(result["per_sec"], 0)
+        self.assertGreaterEqual(result["peak_alloc_bytes"], 0)
+
+    def test_compare_threshold(self):
+        """Test that only drops beyond the threshold count as regressions."""
+        baseline = {"a": {"per_sec": 100.0, "peak_alloc_bytes": 1000, "unit": "ops"},
+                    "b": {"per_sec": 100.0, "peak_alloc_bytes": 1000, "unit": "ops"}}
+        results = {"a": {"per_sec": 80.0, "peak_alloc_bytes": 1000, "unit": "ops"},
+                   "b": {"per_sec": 70.0, "peak_alloc_bytes": 1000, "unit": "ops"},
+                   "new": {"per_sec": 1.0, "peak_alloc_bytes": 10 ** 9, "unit": "ops"}}
+        failures = compare(results, baseline, threshold=0.25)
+        self.assertEqual(len(failures), 1)
+        self.assertTrue(failures[0].startswith("b:"))
+        results["a"]["peak_alloc_bytes"] = 10 ** 6
+        self.assertEqual(len(compare(results, baseline, threshold=0.25)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import bitboard
+from bitboard import BitBoard, LINE_MASKS, FULL_MASK, get_geometry
+
+
+class TestBitBoard(unittest.TestCase):
+    def test_round_trip_array(self):
+        """Test conversion between ndarray boards and bitboards."""
+        board = np.array([
+            [1, 2, 0],
+            [0, 1, 0],
+            [2, 0, 0]
+        ])
+        state = BitBoard.from_array(board)
+        self.assertTrue(np.array_equal(state.to_array(), board))
+        self.assertEqual(state.get(0, 1), 2)
+        self.assertEqual(state.get(2, 2), 0)
+
+    def test_make_unmake(self):
+        """Test that unmake restores the previous position."""
+        state = BitBoard()
+        state.make(4, 1)
+        self.assertEqual(state.get(1, 1), 1)
+        self.assertEqual(state.legal_mask(), FULL_MASK & ~(1 << 4))
+        state.unmake(4, 1)
+        self.assertEqual(state.key(), (0, 0))
+        self.assertEqual(len(state.legal_moves()), 9)
+
+    def test_winner(self):
+        """Test win and tie detection against the line masks."""
+        self.assertEqual(len(LINE_MASKS), 8)
+        state = BitBoard.from_array([[2, 1, 0], [2, 1, 0], [2, 0, 0]])
+        self.assertEqual(state.winner(), 2)
+        self.assertTrue(state.wins_with(7, 1))
+        self.assertFalse(state.wins_with(8, 1))
+        tie = BitBoard.from_array([[1, 2, 1], [1, 2, 2], [2, 1, 1]])
+        self.assertEqual(tie.winner(), 0)
+        self.assertIsNone(BitBoard().winner())
+
+
+class TestGeometry(unittest.TestCase):
+    def test_line_counts(self):
+        """Test the number of k-windows on larger boards."""
+        # 7x7 k=4: 7*4 rows + 7*4 columns + 2 * 4*4 diagonals
+        self.assertEqual(len(get_geometry(7, 7, 4).line_masks), 88)
+        # 15x15 k=5: 15*11 rows + 15*11 columns + 2 * 11*11 diagonals
+        self.assertEqual(len(get_geometry(15, 15, 5).line_masks), 572)
+
+    def test_cache_is_bounded(self):
+        """Test that only the most recently used shapes stay cached."""
+        recent = get_geometry(4, 4, 3)
+        for width in range(5, 5 + bitboard.GEOMETRY_CACHE_SIZE):
+            get_geometry(width, 4, 3)
+            get_geometry(4, 4, 3)
+        self.assertEqual(len(bitboard._geometries), bitboard.GEOMETRY_CACHE_SIZE)
+        self.assertIs(get_geometry(4, 4, 3), recent)
+        self.assertIsNone(bitboard.cached_geometry(5, 4, 3))
+        self.assertEqual(get_geometry(5, 4, 3).key, (5, 4, 3))
+
+    def test_incremental_win(self):
+        """Test that wins_with only needs the lines through the last move."""
+        geometry = get_geometry(7, 6, 4)
+        state = BitBoard(geometry=geometry)
+        for col in (1, 2, 4):
+            state.make(geometry.index(5, col), 1)
+        self.assertFalse(state.wins_with(geometry.index(5, 0), 1))
+        self.assertTrue(state.wins_with(geometry.index(5, 3), 1))
+        for row, col in ((0, 6), (1, 5), (2, 4)):
+            state.make(geometry.index(row, col), 2)
+        self.assertTrue(state.wins_with(geometry.index(3, 3), 2))
+        self.assertEqual(state.result_after(geometry.index(0, 0), 2), None)
+
+    def test_neighbours_do_not_wrap(self):
+        """Test that the neighbourhood mask stops at the board edges."""
+        geometry = get_geometry(4, 4, 3)
+        grown = geometry.neighbours(geometry.mask_of([(1, 3)]))
+        self.assertEqual(grown, geometry.mask_of(
+            [(r, c) for r in range(3) for c in range(2, 4)]))
+
+    def test_rectangular_symmetries(self):
+        """Test that non-square boards only use their four symmetries."""
+        geometry = get_geometry(5, 4, 4)
+        self.assertEqual(len(geometry.symmetry_tables), 4)
+        left = BitBoard.from_array(np.array([[1, 0, 0, 0, 0]] + [[0] * 5] * 3), geometry)
+        right = BitBoard.from_array(np.array([[0, 0, 0, 0, 0]] * 3 + [[0, 0, 0, 0, 1]]), geometry)
+        self.assertEqual(left.canonical_key(), right.canonical_key())
+
+
+if __name__ == '__main__':
+    unittest.main()
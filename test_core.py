@@ -0,0 +1,83 @@
+import subprocess
+import sys
+import tracemalloc
+import unittest
+from core import Match
+from bitboard import get_geometry
+from selfplay import play_game, run_selfplay
+
+
+class TestMatch(unittest.TestCase):
+    def test_play_and_win(self):
+        """Test turn order, illegal moves, history and win detection."""
+        match = Match()
+        self.assertTrue(match.play_at(0, 0))
+        self.assertFalse(match.play_at(0, 0))
+        self.assertEqual(match.current_player, 2)
+        for row, col in [(1, 0), (0, 1), (1, 1), (0, 2)]:
+            match.play_at(row, col)
+        self.assertEqual(match.winner, 1)
+        self.assertEqual(match.history, [0, 3, 1, 4, 2])
+        self.assertEqual(match.winning_line(), ((0, 0), (0, 1), (0, 2)))
+        self.assertFalse(match.play_at(2, 2))  # game is over
+
+    def test_undo(self):
+        """Test that undo takes back moves, including a winning one, and restores the side to move."""
+        match = Match()
+        self.assertIsNone(match.undo())
+        for index in [0, 3, 1, 4, 2]:
+            match.play(index)
+        self.assertEqual(match.undo(), 2)
+        self.assertEqual((match.winner, match.current_player, match.history), (None, 1, [0, 3, 1, 4]))
+        self.assertEqual(match.undo(), 4)
+        self.assertEqual(match.current_player, 2)
+        self.assertEqual(match.state.bits[2], 1 << 3)
+
+    def test_tie(self):
+        """Test that a full board without a line is a tie."""
+        match = Match()
+        for index in [0, 1, 2, 4, 3, 5, 7, 6, 8]:
+            match.play(index)
+        self.assertEqual(match.winner, 0)
+        self.assertIsNone(match.winning_line())
+
+    def test_no_pygame_import(self):
+        """Test that the headless modules never import pygame."""
+        code = "import core, selfplay, sys; sys.exit('pygame' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
+
+    def test_idle_match_footprint(self):
+        """Test that matches carry no per-instance dict and stay small enough to hold 100k at once."""
+        self.assertFalse(hasattr(Match(), "__dict__"))
+        geometry = get_geometry()
+        tracemalloc.start()
+        try:
+            matches = []
+            for i in range(10000):
+                match = Match(geometry=geometry)
+                match.play(4)
+                match.play(i % 4)
+                matches.append(match)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak / len(matches), 400)
+        self.assertEqual(matches[-1].last_move, 3)
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_perfect_never_loses(self):
+        """Test a batch of easy vs perfect games on the standard board."""
+        rows = list(run_selfplay(50, ("easy", "perfect"), get_geometry(), chunk_size=20, seed=7))
+        self.assertEqual(sorted(game for game, _, _ in rows), list(range(50)))
+        self.assertNotIn(1, [winner for _, winner, _ in rows])
+
+    def test_larger_board_game_finishes(self):
+        """Test that a 5x5 k=4 game between search AIs runs to completion."""
+        match = play_game(get_geometry(5, 5, 4), ("hard", "mcts"), 5)
+        self.assertIsNotNone(match.winner)
+        self.assertEqual(len(match.history), len(set(match.history)))
+
+
+if __name__ == '__main__':
+    unittest.main()
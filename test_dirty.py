@@ -0,0 +1,36 @@
+import unittest
+import pygame
+from dirty import DirtyTracker, merge_rects
+
+
+class TestDirtyTracker(unittest.TestCase):
+    def setUp(self):
+        self.tracker = DirtyTracker((800, 800))
+        self.assertEqual(self.tracker.end_frame(), [pygame.Rect(0, 0, 800, 800)])
+
+    def test_unchanged_is_clean(self):
+        """Test that a widget with the same bounds and signature is not redrawn."""
+        self.tracker.track("button", pygame.Rect(10, 10, 50, 20), "idle")
+        self.assertEqual(self.tracker.end_frame(), [pygame.Rect(10, 10, 50, 20)])
+        self.tracker.track("button", pygame.Rect(10, 10, 50, 20), "idle")
+        self.assertEqual(self.tracker.end_frame(), [])
+
+    def test_move_dirties_old_and_new_bounds(self):
+        """Test that moving a widget redraws where it was and where it is."""
+        self.tracker.track("button", pygame.Rect(10, 10, 50, 20))
+        self.tracker.end_frame()
+        self.tracker.track("button", pygame.Rect(300, 300, 50, 20))
+        self.assertEqual(self.tracker.end_frame(), [pygame.Rect(10, 10, 50, 20), pygame.Rect(300, 300, 50, 20)])
+        # Not tracked any more: clear its last position
+        self.assertEqual(self.tracker.end_frame(), [pygame.Rect(300, 300, 50, 20)])
+
+    def test_merge_and_full_redraw(self):
+        """Test that overlapping rects merge and large areas become one full-screen rect."""
+        self.assertEqual(merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10), pygame.Rect(50, 50, 1, 1)]),
+                         [pygame.Rect(0, 0, 15, 15), pygame.Rect(50, 50, 1, 1)])
+        self.tracker.track("board", pygame.Rect(0, 0, 800, 700), 1)
+        self.assertEqual(self.tracker.end_frame(), [pygame.Rect(0, 0, 800, 800)])
+
+
+if __name__ == '__main__':
+    unittest.main()
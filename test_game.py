@@ -1,13 +1,18 @@
+import itertools
 import unittest
 import numpy as np
 import pygame
+import main
 from main import Game, AnimatedValue, Button
 
 class TestTicTacToe(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Open the window once for every test in the class."""
+        main.open_window()
+
     def setUp(self):
-        """Initialize pygame and create a new game instance before each test."""
-        pygame.init()
-        pygame.display.set_mode((800, 800))
+        """Create a new game instance before each test."""
         self.game = Game()
 
     def test_initial_state(self):
@@ -103,6 +108,27 @@ class TestTicTacToe(unittest.TestCase):
         self.game.ai_move()
         self.assertEqual(self.game.board[0, 2], 2)  # AI should win at (0,2)
 
+    def test_ai_move_perfect(self):
+        """Test AI behavior in perfect mode."""
+        self.game.state = "game"
+        self.game.game_mode = "ai"
+        self.game.ai_difficulty = "perfect"
+        
+        # Test AI answers a corner opening with the center
+        self.game.make_move(0, 0)
+        self.game.ai_move()
+        self.assertEqual(self.game.board[1, 1], 2)
+        
+        # Test AI takes winning move
+        self.game.board = np.array([
+            [2, 2, 0],
+            [1, 1, 0],
+            [1, 0, 0]
+        ])
+        self.game.current_player = 2
+        self.game.ai_move()
+        self.assertEqual(self.game.board[0, 2], 2)
+
     def test_evaluate_position(self):
         """Test the position evaluation function."""
         # Test winning position
@@ -143,6 +169,21 @@ class TestTicTacToe(unittest.TestCase):
         self.assertIsNone(self.game.winner)
         self.assertTrue(np.array_equal(self.game.board, np.zeros((3, 3))))
 
+    def test_larger_board(self):
+        """Test an m,n,k board: layout, click mapping and k-in-a-row wins."""
+        game = Game(7, 6, 4)
+        self.assertEqual(game.board.shape, (6, 7))
+        self.assertEqual(game.cell_size, 600 // 7)
+        self.assertEqual(game.cell_at(game.cell_center(5, 6)), (5, 6))
+        self.assertIsNone(game.cell_at((0, 0)))
+        for col in range(3):
+            game.make_move(5, col)
+            game.make_move(0, col)
+        self.assertIsNone(game.winner)
+        game.make_move(5, 3)
+        self.assertEqual(game.winner, 1)
+        self.assertEqual(game.winning_line, (game.cell_center(5, 0), game.cell_center(5, 3)))
+
     def test_animated_value(self):
         """Test AnimatedValue behavior."""
         anim = AnimatedValue(0, 10, duration=20)
@@ -169,5 +210,94 @@ class TestTicTacToe(unittest.TestCase):
         self.assertEqual(button.rect.height, 50)
         self.assertFalse(button.is_hovered)
 
+    def test_draw_board_steady_state(self):
+        """Test that redrawing an upright board allocates no new surfaces."""
+        main.screen = pygame.display.get_surface()
+        self.game.state = "game"
+        self.game.draw_board()
+        for _ in range(3):
+            self.game.surfaces.begin_frame()
+            self.game.draw_board()
+            self.assertEqual(self.game.surfaces.frame_allocations, 0)
+
+    def test_idle_game_not_animating(self):
+        """Test that the default animated background alone does not count as animating."""
+        self.assertTrue(self.game.animated_background)
+        self.assertFalse(self.game.is_animating())
+        for state in ("menu", "game"):
+            self.game.state = state
+            for _ in range(100):
+                self.game.update_animations()
+            self.assertFalse(self.game.is_animating())
+        self.game.make_move(0, 0)
+        self.assertTrue(self.game.is_animating())
+
+    def test_dirty_rect_rendering(self):
+        """Test that a static screen is not redrawn and a move redraws only part of it."""
+        main.screen = pygame.display.get_surface()
+        self.game.animated_background = False
+        # Tweens run on elapsed time; step it one frame per clock read so the test does not depend on speed
+        frames = itertools.count()
+        self.game.tweens.clock = lambda: next(frames) / 60
+        self.game.state = "game"
+        self.assertEqual(self.game.render_frame(), [main.screen.get_rect()])
+        for _ in range(5):
+            self.assertEqual(self.game.render_frame(), [])
+
+        self.game.make_move(1, 1)
+        self.assertTrue(self.game.is_animating())
+        self.assertTrue(self.game.render_frame())
+        # Once the move's animations and particles finish, frames are empty again
+        for _ in range(200):
+            rects = self.game.render_frame()
+        self.assertEqual(rects, [])
+
+        self.assertFalse(self.game.is_animating())
+
+        # Hovering a cell redraws just that cell
+        self.game.hover_cell = (0, 2)
+        rects = self.game.render_frame()
+        self.assertEqual(len(rects), 1)
+        self.assertTrue(rects[0].contains(self.game.cell_bounds(0, 2).clip(main.screen.get_rect())))
+        self.assertLess(rects[0].width, 300)
+
+    def test_profiler_stages(self):
+        """Test that an enabled profiler times the drawing stages and AI nodes."""
+        main.screen = pygame.display.get_surface()
+        self.game.profiler.enabled = True
+        self.game.state = "game"
+        self.game.game_mode = "ai"
+        self.game.ai_difficulty = "hard"
+        self.game.make_move(0, 0)
+        self.game.ai_move()
+        for _ in range(3):
+            self.game.render_frame()
+        summary = self.game.profiler.summary()
+        for stage in ("frame", "background", "grid", "pieces", "rotozoom", "text", "particles", "ai"):
+            self.assertIn(stage, summary)
+        self.assertGreater(summary["ai_nodes"]["max"], 0)
+
+    def test_replay(self):
+        """Test that a replay plays a record's moves over time and ignores board clicks."""
+        from record import GameRecord
+        record = GameRecord(3, 3, 3, 1, bytes([0, 3, 1, 4, 2]))
+        self.game.start_replay(record, moves_per_second=4)
+        self.assertEqual(self.game.game_mode, "replay")
+        self.assertTrue(self.game.is_animating())
+        self.game.handle_click(self.game.cell_center(0, 1))
+        self.assertEqual(self.game.match.history, [])
+        self.game.advance_replay(0.5)
+        self.assertEqual(self.game.match.history, [0, 3])
+        self.game.step_replay_speed(1)
+        self.assertEqual(self.game.replay.moves_per_second, 8)
+        self.game.advance_replay(1.0)
+        self.assertEqual(self.game.match.history, list(record.moves))
+        self.assertEqual(self.game.winner, 1)
+        self.game.reset()
+        self.assertEqual(self.game.match.history, [])
+        self.assertEqual(self.game.replay.position, 0)
+        with self.assertRaises(ValueError):
+            self.game.start_replay(GameRecord(7, 7, 4, None, b""))
+
 if __name__ == '__main__':
     unittest.main()
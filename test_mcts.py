@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from bitboard import BitBoard, get_geometry
+from mcts import MCTSSearcher, random_playouts
+
+
+class TestMCTS(unittest.TestCase):
+    def test_playout_statistics(self):
+        """Test vectorized playouts against the known random-play odds on 3x3."""
+        winners = random_playouts(BitBoard(), 1, 20000, np.random.default_rng(0))
+        draw, x_wins, o_wins = np.bincount(winners, minlength=3) / len(winners)
+        # Uniformly random tic tac toe: X 58.5%, O 28.8%, draw 12.7%
+        self.assertAlmostEqual(x_wins, 0.585, delta=0.02)
+        self.assertAlmostEqual(o_wins, 0.288, delta=0.02)
+        self.assertAlmostEqual(draw, 0.127, delta=0.02)
+
+    def test_playout_stops_at_first_line(self):
+        """Test that a playout is decided by the first completed line."""
+        # X to move wins immediately on the only empty cell of its row
+        state = BitBoard.from_array([[1, 1, 0], [2, 2, 1], [2, 1, 2]])
+        winners = random_playouts(state, 1, 8, np.random.default_rng(1))
+        self.assertTrue((winners == 1).all())
+
+    def test_iteration_budget_and_move(self):
+        """Test that MCTS finds the forced win within an iteration budget."""
+        searcher = MCTSSearcher(iterations=1000, seed=3)
+        state = BitBoard.from_array([[1, 0, 0], [0, 2, 0], [2, 0, 1]])
+        result = searcher.search(state, 1)
+        self.assertEqual(result.nodes, 1000)
+        self.assertEqual(result.move, 2)
+
+    def test_tree_reuse(self):
+        """Test that the tree is re-rooted after the AI's and the opponent's moves."""
+        searcher = MCTSSearcher(iterations=300, seed=4)
+        geometry = get_geometry(7, 7, 4)
+        state = BitBoard(geometry=geometry)
+        state.make(geometry.index(3, 3), 1)
+        move = searcher.search(state, 2).move
+        state.make(move, 2)
+        reply = next(iter(searcher._root.children[move].children))
+        state.make(reply, 1)
+        searcher.search(state, 2)
+        self.assertGreater(searcher.reused_visits, 0)
+        # An unrelated position starts a fresh tree
+        searcher.search(BitBoard(geometry=geometry), 1)
+        self.assertEqual(searcher.reused_visits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import unittest
+import pygame
+import main
+from pacing import FramePacer
+
+
+class TestFramePacer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        main.open_window()
+
+    def setUp(self):
+        pygame.event.clear()
+        self.pacer = FramePacer(target_fps=60, idle_fps=5)
+
+    def test_idle_wait_times_out(self):
+        """Test that an idle frame sleeps for about one idle period without input."""
+        start = time.perf_counter()
+        self.assertEqual([e for e in self.pacer.events(False) if e.type == pygame.USEREVENT], [])
+        self.assertGreater(time.perf_counter() - start, 0.1)
+        self.assertEqual(self.pacer.idle_frames, 1)
+
+    def test_ambient_frames(self):
+        """Test that ambient-only frames wait one ambient period rather than an idle one."""
+        pacer = FramePacer(target_fps=60, idle_fps=1, ambient_fps=20)
+        start = time.perf_counter()
+        pacer.events(False, ambient=True)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(time.perf_counter() - start, 0.03)
+        self.assertEqual(pacer.idle_frames, 1)
+
+    def test_input_wakes_idle_wait(self):
+        """Test that pending input returns from an idle frame straight away."""
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        start = time.perf_counter()
+        events = self.pacer.events(False)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertIn(pygame.USEREVENT, [event.type for event in events])
+
+    def test_busy_frames(self):
+        """Test that busy frames return events at the target rate."""
+        pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+        events = self.pacer.events(True)
+        self.assertIn(pygame.USEREVENT, [event.type for event in events])
+        self.assertEqual(self.pacer.busy_frames, 1)
+
+    def test_rates_must_be_positive(self):
+        """Test that a zero frame rate is rejected."""
+        with self.assertRaises(ValueError):
+            FramePacer(target_fps=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from concurrent.futures import Future
+from bitboard import BitBoard, get_geometry
+from parallel_search import ParallelSearcher, measure_speedup
+from search import Searcher
+from transposition import TranspositionTable
+
+
+class TestParallelSearch(unittest.TestCase):
+    def setUp(self):
+        geometry = get_geometry(5, 5, 4)
+        self.state = BitBoard(geometry=geometry)
+        for row, col, player in ((2, 2, 1), (1, 1, 2), (2, 3, 1)):
+            self.state.make(geometry.index(row, col), player)
+
+    def test_deterministic_matches_serial(self):
+        """Test that deterministic mode agrees with the serial search for any worker count."""
+        serial = Searcher(float('inf'), max_depth=3, table=TranspositionTable()).search(self.state, 2)
+        for workers in (1, 2):
+            with ParallelSearcher(workers, max_depth=3, deterministic=True) as searcher:
+                result = searcher.search(self.state, 2)
+            self.assertEqual((result.move, result.score, result.depth),
+                             (serial.move, serial.score, serial.depth))
+
+    def test_finds_forced_win(self):
+        """Test the shared-alpha mode on a 3x3 fork."""
+        state = BitBoard.from_array([[1, 0, 0], [0, 2, 0], [2, 0, 1]])
+        with ParallelSearcher(2, time_budget_ms=5000) as searcher:
+            result = searcher.search(state, 1)
+        self.assertEqual(result.move, 2)
+        self.assertEqual(result.score, 100)
+
+    def test_speedup_report(self):
+        """Test that the speedup report has one row per worker count."""
+        rows = measure_speedup(self.state, 2, 2, (1, 2))
+        self.assertEqual([row["workers"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["speedup"], 1.0)
+        # The best move at this depth is unique, so every worker count must agree on it
+        self.assertEqual((rows[0]["move"], rows[0]["score"]), (rows[1]["move"], rows[1]["score"]))
+
+    def test_bounded_scores_are_not_candidates(self):
+        """Test that a fail-low bound from the shared alpha never beats the sibling that set it."""
+        # (move, score, line, nodes, alpha used): move 1 started after move 2 raised the
+        # shared alpha to 5 and failed low, so its 5 is only an upper bound
+        results = {0: (0, 0, [0], 1, -float('inf')), 1: (1, 5, [1], 1, 5), 2: (2, 5, [2, 9], 1, 0)}
+
+        class CannedSearcher(ParallelSearcher):
+            def _submit(self, state, player, move, depth, alpha, deadline, pv):
+                future = Future()
+                future.set_result(results[move])
+                return future
+
+        with CannedSearcher(1) as searcher:
+            iteration = searcher._search_iteration(self.state, 2, 1, [0, 1, 2], [0], float('inf'))
+        self.assertEqual(iteration, (5, [2, 9], True))
+
+
+if __name__ == '__main__':
+    unittest.main()
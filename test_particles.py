@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import pygame
+from particles import ParticlePool
+
+
+class TestParticlePool(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.pool = ParticlePool(capacity=100, seed=1)
+
+    def test_spawn_and_expire(self):
+        """Test that particles live until their life runs out and then free their slots."""
+        self.assertEqual(self.pool.spawn(10, 10, (255, 0, 0), 20), 20)
+        self.assertEqual(len(self.pool), 20)
+        self.pool.update()
+        self.assertEqual(len(self.pool), 20)
+        for _ in range(101):  # decay is at least 0.01 per frame
+            self.pool.update()
+        self.assertEqual(len(self.pool), 0)
+        self.assertFalse(self.pool.alive.any())
+
+    def test_capacity_and_recycling(self):
+        """Test that a full pool drops new spawns and reuses slots once particles die."""
+        self.assertEqual(self.pool.spawn(0, 0, (0, 255, 0), 150), 100)
+        self.assertEqual(self.pool.dropped, 50)
+        self.assertEqual(self.pool.spawn(0, 0, (0, 255, 0)), 0)
+        self.pool.life[:10] = 0.001
+        self.pool.update()
+        self.assertEqual(len(self.pool), 90)
+        self.assertEqual(self.pool.spawn(5, 5, (0, 0, 255), 20), 10)
+        self.assertTrue(self.pool.alive.all())
+
+    def test_update_physics(self):
+        """Test position, gravity, shrink and decay for one frame."""
+        self.pool.spawn(100, 100, (255, 255, 255), 5)
+        live = self.pool.alive.copy()
+        vx, vy = self.pool.vx[live].copy(), self.pool.vy[live].copy()
+        size, life = self.pool.size[live].copy(), self.pool.life[live].copy()
+        self.pool.update()
+        np.testing.assert_allclose(self.pool.x[live], 100 + vx, rtol=1e-6)
+        np.testing.assert_allclose(self.pool.vy[live], vy + 0.2, rtol=1e-6)
+        np.testing.assert_allclose(self.pool.size[live], np.maximum(1, size * 0.99), rtol=1e-6)
+        np.testing.assert_allclose(self.pool.life[live], life - self.pool.decay[live], rtol=1e-6)
+
+    def test_draw(self):
+        """Test that drawing puts colored pixels on the surface and reuses sprites."""
+        surface = pygame.Surface((200, 200), pygame.SRCALPHA)
+        self.pool.spawn(100, 100, (255, 0, 0), 30)
+        self.pool.draw(surface)
+        sprites = len(self.pool._sprites)
+        self.assertGreater(surface.get_at((100, 100)).a, 0)
+        self.pool.draw(surface)
+        self.assertEqual(len(self.pool._sprites), sprites)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from bitboard import BitBoard
+import perfect_play
+from perfect_play import PerfectPlayTable, DRAW, WIN, LOSS
+
+
+class TestPerfectPlay(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.solved = perfect_play.solve()
+
+    def test_shipped_table_matches_solver(self):
+        """Test that the committed binary table is up to date."""
+        shipped = PerfectPlayTable.load()
+        self.assertTrue(np.array_equal(np.asarray(shipped._entries), self.solved))
+
+    def test_game_values(self):
+        """Test known game-theoretic values."""
+        table = PerfectPlayTable(self.solved)
+        self.assertEqual(table.value(BitBoard(), 1), DRAW)
+        # X must block at (0, 2), which also forks the top row and right column
+        fork = BitBoard.from_array([[1, 0, 0], [0, 2, 0], [2, 0, 1]])
+        self.assertEqual(table.value(fork, 1), WIN)
+        self.assertEqual(table.best_moves(fork, 1), [2])
+        lost = BitBoard.from_array([[1, 1, 1], [2, 2, 0], [0, 0, 0]])
+        self.assertEqual(table.value(lost, 2), LOSS)
+        self.assertEqual(table.best_moves(lost, 2), [])
+
+    def test_write_and_load(self):
+        """Test the binary round trip through a memory map."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.bin")
+            perfect_play.write_table(self.solved, path)
+            loaded = PerfectPlayTable.load(path)
+            state = BitBoard.from_array([[1, 0, 0], [0, 0, 0], [0, 0, 0]])
+            self.assertEqual(loaded.best_moves(state, 2), [4])
+            del loaded
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from profiler import FRAME, FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        """Test that a disabled profiler hands out a shared no-op stage and keeps no samples."""
+        profiler = FrameProfiler()
+        self.assertIs(profiler.stage("grid"), profiler.stage("text"))
+        profiler.begin_frame()
+        with profiler.stage("grid"):
+            pass
+        profiler.record("ai_nodes", 10)
+        profiler.end_frame()
+        self.assertEqual(profiler.summary(), {})
+
+    def test_stages_sum_per_frame(self):
+        """Test that repeated stages add up within a frame and the frame total is recorded."""
+        profiler = FrameProfiler(enabled=True, window=3)
+        for _ in range(5):
+            profiler.begin_frame()
+            for _ in range(2):
+                with profiler.stage("grid"):
+                    sum(range(1000))
+            profiler.end_frame()
+        summary = profiler.summary()
+        self.assertEqual(summary["grid"]["count"], 3)  # rolling window
+        self.assertEqual(summary[FRAME]["count"], 3)
+        self.assertGreaterEqual(summary[FRAME]["p50"], summary["grid"]["p50"])
+        self.assertLessEqual(summary["grid"]["p50"], summary["grid"]["p99"])
+
+    def test_percentiles_and_export(self):
+        """Test percentile values and the JSON/CSV exports."""
+        profiler = FrameProfiler(enabled=True)
+        for value in range(1, 101):
+            profiler.record("ai_nodes", value)
+        stats = profiler.summary()["ai_nodes"]
+        self.assertAlmostEqual(stats["p50"], 50.5)
+        self.assertAlmostEqual(stats["p99"], 99.01)
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.export_json(os.path.join(tmp, "profile.json"))
+            profiler.export_csv(os.path.join(tmp, "profile.csv"))
+            with open(os.path.join(tmp, "profile.json")) as f:
+                self.assertEqual(json.load(f)["stages"]["ai_nodes"]["count"], 100)
+            with open(os.path.join(tmp, "profile.csv")) as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0][:4], ["stage", "p50", "p95", "p99"])
+            self.assertEqual(rows[1][0], "ai_nodes")
+
+
+if __name__ == '__main__':
+    unittest.main()
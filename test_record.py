@@ -0,0 +1,114 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from bitboard import get_geometry
+from core import Match
+from record import GameRecord, RecordArchive, RecordError, RecordWriter, Replay, read_records
+
+
+def played(moves, geometry=None):
+    match = Match(geometry=geometry or get_geometry())
+    for index in moves:
+        match.play(index)
+    return match
+
+
+class TestRecord(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.rec")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_encode_round_trip(self):
+        """Test that a record is six bytes of framing plus one byte per move."""
+        record = GameRecord.from_match(played([4, 0, 8, 2, 1, 7, 6]))
+        data = record.encode()
+        self.assertEqual(len(data), 6 + 7)
+        self.assertEqual(GameRecord.decode(data[2:]), record)
+        unfinished = GameRecord.from_match(played([4]))
+        self.assertIsNone(GameRecord.decode(unfinished.encode()[2:]).winner)
+
+    def test_too_many_cells(self):
+        """Test that boards whose cells do not fit in a byte are refused."""
+        with self.assertRaises(RecordError):
+            GameRecord.from_match(Match(16, 16, 5))
+
+    def test_stream_and_append(self):
+        """Test that writers append to an existing file and the reader returns every record in order."""
+        records = [GameRecord.from_match(played([i, (i + 1) % 9])) for i in range(9)]
+        with RecordWriter(self.path) as writer:
+            writer.write_all(records[:5])
+        with RecordWriter(self.path) as writer:
+            writer.write_all(records[5:])
+        self.assertEqual(list(read_records(self.path)), records)
+
+    def test_archive_random_access(self):
+        """Test that the memory-mapped archive indexes records for random access."""
+        geometry = get_geometry(7, 7, 4)
+        records = [GameRecord.from_match(played(range(i), geometry)) for i in range(20)]
+        with RecordWriter(self.path) as writer:
+            writer.write_all(records)
+        with RecordArchive(self.path) as archive:
+            self.assertEqual(len(archive), 20)
+            self.assertEqual(archive[13], records[13])
+            self.assertEqual(archive[-1], records[-1])
+            self.assertEqual(list(archive), records)
+
+    def test_rejects_bad_files(self):
+        """Test that foreign and truncated files raise RecordError."""
+        with open(self.path, "wb") as f:
+            f.write(b"not a record file")
+        with self.assertRaises(RecordError):
+            list(read_records(self.path))
+        with self.assertRaises(RecordError):
+            RecordArchive(self.path)
+        os.remove(self.path)
+        with RecordWriter(self.path) as writer:
+            writer.write(GameRecord.from_match(played([0, 1, 2])))
+        with open(self.path, "ab") as f:
+            f.write(b"\x09\x00\x03")
+        with self.assertRaises(RecordError):
+            list(read_records(self.path))
+        with self.assertRaises(RecordError):
+            RecordArchive(self.path)
+
+    def test_short_header(self):
+        """Test that a file cut off inside its header is rejected without leaking open files."""
+        with open(self.path, "wb") as f:
+            f.write(b"TTTR")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            with self.assertRaises(RecordError):
+                list(read_records(self.path))
+            with self.assertRaises(RecordError):
+                RecordArchive(self.path)
+            with self.assertRaises(RecordError):
+                RecordWriter(self.path)
+            with open(self.path, "ab") as f:
+                f.write(b"\x01\x09\x00\x03")  # Full header, truncated record
+            with self.assertRaises(RecordError):
+                RecordArchive(self.path)
+            gc.collect()
+        self.assertEqual([w for w in caught if issubclass(w.category, ResourceWarning)], [])
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"TTTR\x01\x09\x00\x03")
+
+    def test_replay_speed(self):
+        """Test that replay releases moves at the requested rate and pauses at speed 0."""
+        replay = Replay(GameRecord.from_match(played([4, 0, 8, 2, 1, 7, 6])), moves_per_second=2)
+        self.assertEqual(replay.advance(0.25), [])
+        self.assertEqual(replay.advance(0.25), [4])
+        self.assertEqual(replay.advance(1.0), [0, 8])
+        replay.moves_per_second = 0
+        self.assertEqual(replay.advance(10), [])
+        replay.moves_per_second = 100
+        self.assertEqual(replay.advance(10), [2, 1, 7, 6])
+        self.assertTrue(replay.done)
+
+
+if __name__ == "__main__":
+    unittest.main()
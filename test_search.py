@@ -0,0 +1,40 @@
+import unittest
+from bitboard import BitBoard, get_geometry
+from search import Searcher, WIN_SCORE, evaluate
+from transposition import TranspositionTable
+
+
+class TestSearcher(unittest.TestCase):
+    def test_finds_forced_win(self):
+        """Test that the search proves a fork win and stops deepening."""
+        state = BitBoard.from_array([[1, 0, 0], [0, 2, 0], [2, 0, 1]])
+        result = Searcher(1000, table=TranspositionTable()).search(state, 1)
+        self.assertEqual(result.move, 2)
+        self.assertEqual(result.score, WIN_SCORE)
+        self.assertEqual(result.pv[0], result.move)
+
+    def test_solves_empty_board_as_draw(self):
+        """Test a full-depth solve of the opening within the budget."""
+        result = Searcher(5000, table=TranspositionTable()).search(BitBoard(), 1)
+        self.assertEqual(result.score, 0)
+        self.assertEqual(result.depth, 9)
+
+    def test_respects_time_budget(self):
+        """Test that a tiny budget still returns a legal move on a big board."""
+        geometry = get_geometry(15, 15, 5)
+        state = BitBoard(geometry=geometry)
+        state.make(geometry.index(7, 7), 1)
+        result = Searcher(5, table=TranspositionTable()).search(state, 2)
+        self.assertIn(result.move, state.candidate_moves())
+        self.assertLess(result.elapsed_ms, 250)
+        self.assertEqual(state.bits[2], 0)  # caller's board is untouched
+
+    def test_evaluate_is_symmetric(self):
+        """Test that the heuristic is the same for mirrored positions."""
+        left = BitBoard.from_array([[2, 0, 0], [2, 0, 0], [0, 0, 1]])
+        right = BitBoard.from_array([[0, 0, 2], [0, 0, 2], [1, 0, 0]])
+        self.assertEqual(evaluate(left), evaluate(right))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import bitboard
+from ai_worker import AIWorker
+from loadgen import run_load
+from server import GameServer
+
+
+class BrokenWorker(AIWorker):
+    """Worker whose searches fail the way a pool with a dead process does."""
+
+    def request_move(self, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("a worker process died"))
+        return future
+
+
+class TestServer(unittest.TestCase):
+    def run_with_server(self, scenario, worker=None, **options):
+        async def main():
+            server = GameServer(worker or AIWorker(use_processes=False, max_workers=2), time_budget_ms=20, **options)
+            await server.start("127.0.0.1", 0)
+            try:
+                return await scenario(server)
+            finally:
+                await server.close()
+        return asyncio.run(main())
+
+    @staticmethod
+    async def connect(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+        async def request(message):
+            writer.write((message if isinstance(message, bytes) else json.dumps(message).encode()) + b"\n")
+            await writer.drain()
+            return json.loads(await reader.readline())
+        return reader, writer, request
+
+    def test_move_protocol(self):
+        """Test that a human move is answered with the AI's reply already played."""
+        async def scenario(server):
+            _, writer, request = await self.connect(server)
+            reply = await request({"op": "new", "difficulty": "hard"})
+            self.assertEqual(reply["board"], "." * 9)
+            reply = await request({"op": "move", "index": 0})
+            self.assertEqual(reply["moves"], 2)
+            self.assertEqual(reply["board"][0], "X")
+            self.assertEqual(reply["board"][reply["ai_move"]], "O")
+            self.assertEqual(reply["to_move"], 1)
+            # Occupied cells, bad JSON and unknown ops are errors that keep the session open
+            self.assertFalse((await request({"op": "move", "index": 0}))["ok"])
+            self.assertFalse((await request(b"{not json"))["ok"])
+            self.assertFalse((await request({"op": "fly"}))["ok"])
+            self.assertEqual((await request({"op": "state"}))["moves"], 2)
+            writer.close()
+        self.run_with_server(scenario)
+
+    def test_refuses_beyond_max_sessions(self):
+        """Test that connections past max_sessions are refused."""
+        async def scenario(server):
+            _, first, request = await self.connect(server)
+            await request({"op": "new"})
+            reader, second = await asyncio.open_connection("127.0.0.1", server.port)
+            reply = json.loads(await reader.readline())
+            self.assertEqual(reply["error"], "server full")
+            self.assertEqual(server.stats()["refused"], 1)
+            first.close()
+            second.close()
+        self.run_with_server(scenario, max_sessions=1)
+
+    def test_idle_timeout(self):
+        """Test that a silent session is closed after the idle timeout."""
+        async def scenario(server):
+            reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+            reply = json.loads(await reader.readline())
+            self.assertEqual(reply["error"], "idle timeout")
+            self.assertEqual(await reader.readline(), b"")
+            await asyncio.sleep(0)
+            self.assertEqual(server.stats()["sessions"], 0)
+            writer.close()
+        self.run_with_server(scenario, idle_timeout=0.1)
+
+    def test_close_with_open_sessions(self):
+        """Test that closing the server ends live sessions at once and logs no errors."""
+        async def main():
+            server = GameServer(AIWorker(use_processes=False), time_budget_ms=20)
+            await server.start("127.0.0.1", 0)
+            reader, writer, request = await self.connect(server)
+            await request({"op": "new"})
+            with self.assertNoLogs("asyncio", level="ERROR"):
+                await asyncio.wait_for(server.close(), 5)
+            self.assertEqual(server.stats()["sessions"], 0)
+            self.assertEqual(await reader.readline(), b"")
+            writer.close()
+        asyncio.run(main())
+
+    def test_ai_failure_keeps_session(self):
+        """Test that a failed AI search is an error reply that takes back the move and keeps the session."""
+        async def scenario(server):
+            _, writer, request = await self.connect(server)
+            await request({"op": "new", "difficulty": "hard"})
+            reply = await request({"op": "move", "index": 4})
+            self.assertFalse(reply["ok"])
+            self.assertIn("BrokenProcessPool", reply["error"])
+            self.assertFalse((await request({"op": "new", "ai_first": True}))["ok"])
+            state = await request({"op": "state"})
+            self.assertEqual((state["board"], state["to_move"]), ("." * 9, 1))
+            self.assertEqual(server.stats()["ai_failures"], 2)
+            self.assertEqual(server.stats()["moves"], 0)
+            writer.close()
+        self.run_with_server(scenario, worker=BrokenWorker())
+
+    def test_many_board_shapes(self):
+        """Test that cycling through board shapes keeps the geometry cache within its bound."""
+        async def scenario(server):
+            _, writer, request = await self.connect(server)
+            shapes = [(width, height, 3) for width in range(3, 9) for height in range(3, 9)]
+            self.assertGreater(len(shapes), bitboard.GEOMETRY_CACHE_SIZE)
+            for width, height, win_length in shapes:
+                reply = await request({"op": "new", "difficulty": "easy", "width": width,
+                                       "height": height, "win_length": win_length})
+                self.assertEqual(len(reply["board"]), width * height)
+                self.assertLessEqual(len(bitboard._geometries), bitboard.GEOMETRY_CACHE_SIZE)
+            self.assertFalse(server._building)
+            self.assertFalse((await request({"op": "new", "width": 30, "height": 30}))["ok"])
+            writer.close()
+        self.run_with_server(scenario)
+
+    def test_load_generator(self):
+        """Test that many concurrent sessions all finish their games through a small AI queue."""
+        async def scenario(server):
+            summary = await run_load("127.0.0.1", server.port, sessions=100, games=2, seed=0)
+            self.assertEqual(summary["failed"], 0)
+            self.assertGreater(server.stats()["peak_sessions"], 1)
+            self.assertGreater(summary["moves_per_sec"], 0)
+            self.assertGreaterEqual(summary["p99_ms"], summary["p50_ms"])
+            self.assertEqual(summary["moves"], server.stats()["moves"])
+        self.run_with_server(scenario, max_pending_ai=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import pygame
+from sprites import SpriteAtlas, set_alpha
+
+COLOR = (255, 89, 94)
+
+
+class TestSpriteAtlas(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.atlas = SpriteAtlas()
+
+    def test_glyphs_cached_per_scale_step(self):
+        """Test that nearby scales share a sprite and distinct steps do not."""
+        glyph = self.atlas.x_glyph(200, 1.0, COLOR)
+        self.assertIs(self.atlas.x_glyph(200, 0.999, COLOR), glyph)
+        self.assertIsNot(self.atlas.x_glyph(200, 0.5, COLOR), glyph)
+        self.assertIsNot(self.atlas.o_glyph(200, 1.0, COLOR), glyph)
+        self.assertEqual(self.atlas.renders, 3)
+
+    def test_glyph_is_centred(self):
+        """Test that the X and O are drawn around the sprite's centre pixel."""
+        for glyph in (self.atlas.x_glyph(120, 1.0, COLOR), self.atlas.o_glyph(120, 1.0, COLOR)):
+            rect = glyph.get_bounding_rect()
+            self.assertAlmostEqual(rect.centerx, glyph.get_width() // 2, delta=2)
+            self.assertAlmostEqual(rect.centery, glyph.get_height() // 2, delta=2)
+
+    def test_alpha_blit(self):
+        """Test that per-surface alpha fades a pre-rendered sprite."""
+        line = self.atlas.grid_line(100, True, COLOR)
+        full = pygame.Surface(line.get_size(), pygame.SRCALPHA)
+        full.blit(set_alpha(line, 255), (0, 0))
+        faded = pygame.Surface(line.get_size(), pygame.SRCALPHA)
+        faded.blit(set_alpha(line, 128), (0, 0))
+        self.assertGreater(full.get_at((4, 50)).a, faded.get_at((4, 50)).a)
+        self.assertGreater(faded.get_at((4, 50)).a, 0)
+
+    def test_button_assets(self):
+        """Test that button faces and glows are reused for the same size."""
+        face = self.atlas.button_face((300, 60), COLOR, 255)
+        self.assertIs(self.atlas.button_face((300, 60), COLOR, 255), face)
+        self.assertEqual(self.atlas.button_glow((300, 60), COLOR).get_size(), (340, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
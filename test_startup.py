@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENV = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=ENV,
+                            capture_output=True, text=True, timeout=60)
+    if result.returncode:
+        raise AssertionError(result.stderr)
+    return result.stdout.split()
+
+
+class TestStartup(unittest.TestCase):
+    def test_headless_modules_skip_pygame_and_numpy(self):
+        """Test that the rules, AI, server and record modules import without pygame or NumPy."""
+        loaded = run_python(
+            "import sys, core, search, ai, server, selfplay, record\n"
+            "print('pygame' in sys.modules, 'numpy' in sys.modules)")
+        self.assertEqual(loaded, ["False", "False"])
+
+    def test_main_import_has_no_side_effects(self):
+        """Test that importing main starts no pygame subsystem and a Game needs no window."""
+        state = run_python(
+            "import pygame, main\n"
+            "print(pygame.get_init(), pygame.display.get_init(), main.screen is None)\n"
+            "game = main.Game()\n"
+            "print(pygame.display.get_init())")
+        self.assertEqual(state, ["False", "False", "True", "False"])
+
+    def test_time_startup(self):
+        """Test that --time-startup presents one frame and reports how long it took."""
+        result = subprocess.run([sys.executable, "main.py", "--time-startup", "--ai-worker", "none"],
+                                cwd=HERE, env=ENV, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertRegex(result.stdout, r"first frame after \d+\.\d ms")
+
+
+if __name__ == "__main__":
+    unittest.main()
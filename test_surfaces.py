@@ -0,0 +1,44 @@
+import unittest
+import pygame
+from surfaces import SurfacePool
+
+
+class TestSurfacePool(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.pool = SurfacePool()
+
+    def test_reuse(self):
+        """Test that acquiring the same name and size returns the same surface."""
+        first = self.pool.acquire("board", (50, 40))
+        self.pool.begin_frame()
+        second = self.pool.acquire("board", (50, 40))
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.allocations, 1)
+        self.assertEqual(self.pool.frame_allocations, 0)
+        self.assertIsNot(self.pool.acquire("board", (60, 40)), first)
+        self.assertEqual(self.pool.stats()["surfaces"], 2)
+
+    def test_clears_dirty_region_only(self):
+        """Test that only the area marked dirty is cleared on the next acquire."""
+        surface = self.pool.acquire("layer", (20, 20))
+        surface.fill((255, 0, 0, 255))
+        self.pool.mark_dirty("layer", (20, 20), pygame.Rect(0, 0, 10, 10))
+        surface = self.pool.acquire("layer", (20, 20))
+        self.assertEqual(surface.get_at((5, 5)).a, 0)
+        self.assertEqual(surface.get_at((15, 15)).a, 255)
+        # Without mark_dirty the whole surface is cleared next time
+        surface = self.pool.acquire("layer", (20, 20))
+        self.assertEqual(surface.get_at((15, 15)).a, 0)
+
+    def test_transients_count_per_frame(self):
+        """Test that transient surfaces show up in the frame counter."""
+        self.pool.note_transient()
+        self.assertEqual(self.pool.frame_allocations, 1)
+        self.pool.begin_frame()
+        self.assertEqual(self.pool.frame_allocations, 0)
+        self.assertEqual(self.pool.transients, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
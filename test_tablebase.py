@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from ai import choose_move
+from bitboard import BitBoard, get_geometry
+import perfect_play
+import tablebase
+from perfect_play import DRAW, LOSS, WIN
+from tablebase import Tablebase, build, position_index
+
+
+class TestTablebase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_matches_perfect_play(self):
+        """Test that the 3x3 tablebase agrees with the perfect play table on every open position."""
+        geometry = get_geometry()
+        self.assertTrue(build(geometry, self.path("3x3.tb")))
+        table, perfect = Tablebase(self.path("3x3.tb")), perfect_play.get_table()
+        checked = 0
+        for x_bits in range(1 << 9):
+            for o_bits in range(1 << 9):
+                x_stones, o_stones = bin(x_bits).count("1"), bin(o_bits).count("1")
+                if x_bits & o_bits or x_stones - o_stones not in (0, 1):
+                    continue
+                state, player = BitBoard(x_bits, o_bits), 1 if x_stones == o_stones else 2
+                if state.winner() is not None:
+                    continue
+                self.assertEqual(table.probe(state, player)[0], perfect.value(state, player))
+                self.assertEqual(sorted(table.best_moves(state, player)), perfect.best_moves(state, player))
+                checked += 1
+        self.assertEqual(checked, 4520)
+        self.assertEqual(table.probe(BitBoard(), 1), (DRAW, None))
+        # Wrong side to move for the stone count
+        self.assertIsNone(table.probe(BitBoard(), 2))
+
+    def test_perfect_hash(self):
+        """Test that position indices fill each layer without gaps or collisions."""
+        geometry = get_geometry(4, 3, 3)
+        seen = [set() for _ in range(geometry.cells + 1)]
+        for x_bits in range(1 << geometry.cells):
+            x_stones = bin(x_bits).count("1")
+            rest = geometry.full_mask & ~x_bits
+            o_bits = rest
+            while True:
+                if x_stones - bin(o_bits).count("1") in (0, 1):
+                    layer, index = position_index(x_bits, o_bits, geometry.cells)
+                    seen[layer].add(index)
+                if not o_bits:
+                    break
+                o_bits = (o_bits - 1) & rest
+        self.assertEqual([len(s) for s in seen], tablebase.layer_sizes(geometry.cells))
+        self.assertEqual([max(s) + 1 for s in seen], tablebase.layer_sizes(geometry.cells))
+
+    def test_resume_after_interruption(self):
+        """Test that a build stopped part way resumes to the same table as an uninterrupted one."""
+        geometry = get_geometry(4, 3, 3)
+        self.assertTrue(build(geometry, self.path("full.tb"), chunk_size=4096))
+        self.assertFalse(build(geometry, self.path("resumed.tb"), chunk_size=4096, max_chunks=10))
+        self.assertTrue(os.path.exists(self.path("resumed.tb.progress")))
+        with self.assertRaises(ValueError):
+            Tablebase(self.path("resumed.tb"))
+        self.assertFalse(build(geometry, self.path("resumed.tb"), chunk_size=4096, max_chunks=10))
+        self.assertTrue(build(geometry, self.path("resumed.tb"), chunk_size=4096))
+        self.assertFalse(os.path.exists(self.path("resumed.tb.progress")))
+        with open(self.path("full.tb"), "rb") as full, open(self.path("resumed.tb"), "rb") as resumed:
+            self.assertEqual(full.read(), resumed.read())
+        with self.assertRaises(ValueError):
+            build(get_geometry(3, 4, 3), self.path("full.tb"))
+
+    def test_distance_and_ai(self):
+        """Test distances to the end and that choose_move plays from an available tablebase."""
+        geometry = get_geometry(4, 3, 3)
+        build(geometry, self.path("4x3.tb"))
+        table = Tablebase(self.path("4x3.tb"))
+        self.assertEqual(table.probe(BitBoard(geometry=geometry), 1), (WIN, 7))
+        # X to move with two in a row on the top row wins at once
+        state = BitBoard.from_array([[1, 1, 0, 0], [2, 2, 0, 0], [0, 0, 0, 0]], geometry)
+        self.assertEqual(table.probe(state, 1), (WIN, 1))
+        self.assertEqual(sorted(table.best_moves(state, 1)), [2])
+        won = state.copy()
+        won.make(2, 1)
+        self.assertEqual(table.probe(won, 2), (LOSS, 0))
+        # Any other X move lets O complete the middle row
+        state.make(10, 1)
+        self.assertEqual(table.probe(state, 2), (WIN, 1))
+        tablebase._tablebases[geometry.key] = table
+        try:
+            empty = BitBoard(geometry=geometry)
+            self.assertIn(choose_move(empty, 1, "hard"), table.best_moves(empty, 1))
+        finally:
+            del tablebase._tablebases[geometry.key]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import pygame
+from text_cache import TextCache, get_font
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.cache = TextCache()
+
+    def test_font_registry(self):
+        """Test that a font size is only loaded once."""
+        self.assertIs(get_font(32), get_font(32))
+        self.assertIsNot(get_font(32), get_font(40))
+
+    def test_render_cached(self):
+        """Test that the same (font, text, color) reuses the rendered surface."""
+        first = self.cache.render(32, "Hello", (255, 255, 255))
+        self.assertIs(self.cache.render(32, "Hello", (255, 255, 255)), first)
+        self.assertIsNot(self.cache.render(32, "Hello", (255, 0, 0)), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_shadowed_is_centred(self):
+        """Test that the composite is padded evenly around the main text."""
+        plain = self.cache.render(40, "Player X's turn", (255, 89, 94))
+        shadowed = self.cache.shadowed(40, "Player X's turn", (255, 89, 94), (40, 10, 60), [(3, 3), (1, 1)])
+        self.assertEqual(shadowed.get_size(), (plain.get_width() + 6, plain.get_height() + 6))
+        self.assertIs(self.cache.shadowed(40, "Player X's turn", (255, 89, 94), (40, 10, 60), [(3, 3), (1, 1)]),
+                      shadowed)
+
+    def test_memory_bound(self):
+        """Test that least recently used surfaces are evicted past max_bytes."""
+        size = self.cache.render(32, "0", (255, 255, 255))
+        per_surface = size.get_width() * size.get_height() * size.get_bytesize()
+        cache = TextCache(max_bytes=per_surface * 3)
+        for digit in "0123456789":
+            cache.render(32, digit, (255, 255, 255))
+            self.assertLessEqual(cache.bytes, cache.max_bytes)
+        self.assertGreater(cache.evictions, 0)
+        self.assertLess(len(cache), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from bitboard import BitBoard
+from transposition import TranspositionTable, EXACT, LOWER, UPPER
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def test_symmetric_positions_share_key(self):
+        """Test that rotations and reflections canonicalize to one key."""
+        corner = BitBoard.from_array([[1, 0, 0], [0, 2, 0], [0, 0, 0]])
+        rotated = BitBoard.from_array([[0, 0, 1], [0, 2, 0], [0, 0, 0]])
+        edge = BitBoard.from_array([[0, 1, 0], [0, 2, 0], [0, 0, 0]])
+        self.assertEqual(corner.canonical_key(), rotated.canonical_key())
+        self.assertNotEqual(corner.canonical_key(), edge.canonical_key())
+
+    def test_lru_eviction_and_counters(self):
+        """Test bounded capacity, LRU eviction and hit/miss counters."""
+        table = TranspositionTable(capacity=2)
+        table.store("a", 1, 1, EXACT)
+        table.store("b", 2, 1, EXACT)
+        self.assertIsNotNone(table.probe("a"))  # "b" is now least recent
+        table.store("c", 3, 1, EXACT)
+        self.assertIsNone(table.probe("b"))
+        self.assertEqual(len(table), 2)
+        self.assertEqual(table.evictions, 1)
+        self.assertEqual((table.hits, table.misses), (1, 1))
+
+    def test_depth_preferred_replacement(self):
+        """Test that a shallower result never overwrites a deeper one."""
+        table = TranspositionTable()
+        table.store("k", 10, 4, EXACT)
+        table.store("k", -10, 2, EXACT)
+        self.assertEqual(table.probe("k").value, 10)
+
+    def test_bounds_respect_window(self):
+        """Test that bound entries only cut off when they settle the window."""
+        table = TranspositionTable()
+        table.store("low", 5, 3, LOWER)
+        table.store("up", -5, 3, UPPER)
+        self.assertEqual(table.lookup("low", 3, 0, 4)[0], 5)
+        self.assertIsNone(table.lookup("low", 3, 0, 10)[0])
+        self.assertEqual(table.lookup("up", 3, 0, 10)[0], -5)
+        self.assertIsNone(table.lookup("up", 4, 0, 10)[0])  # too shallow
+
+
+if __name__ == '__main__':
+    unittest.main()
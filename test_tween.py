@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+from tween import AnimatedValue, TweenManager, register_easing
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTweenManager(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tweens = TweenManager(capacity=2, clock=self.clock)
+
+    def test_elapsed_time_not_frames(self):
+        """Test that progress depends on elapsed time, however many updates happen."""
+        fast = AnimatedValue(0, 0, duration=60, easing="linear", tweens=self.tweens)
+        fast.animate_to(100)
+        for _ in range(30):
+            self.clock.now += 0.5 / 30
+            self.tweens.update()
+        slow = AnimatedValue(0, 0, duration=60, easing="linear", tweens=TweenManager(clock=self.clock))
+        self.clock.now = 0.0
+        slow.animate_to(100)
+        self.clock.now = 0.5
+        slow.tweens.update()
+        self.assertAlmostEqual(fast.current, 50)
+        self.assertAlmostEqual(slow.current, 50)
+        self.clock.now = 2.0
+        self.tweens.update()
+        self.assertEqual(fast.current, 100)
+        self.assertFalse(fast.is_animating)
+
+    def test_only_active_tweens_are_stored(self):
+        """Test that finished and cancelled tweens leave the arrays, keeping the rest correct."""
+        values = [AnimatedValue(0, 0, duration=6 * (i + 1), easing="linear", tweens=self.tweens) for i in range(10)]
+        for value in values:
+            value.animate_to(10)
+        self.assertEqual(self.tweens.active, 10)
+        values[3].current = 7  # Cancels the tween
+        self.assertEqual(self.tweens.active, 9)
+        self.clock.now = 0.35
+        self.tweens.update()
+        # Durations are 0.1 s apart; the first three have finished
+        self.assertEqual(self.tweens.active, 6)
+        self.assertEqual([v.current for v in values[:4]], [10, 10, 10, 7])
+        for i, value in enumerate(values[4:], start=4):
+            self.assertAlmostEqual(value.current, 10 * 0.35 / (0.1 * (i + 1)))
+        self.clock.now = 10
+        self.tweens.update()
+        self.assertEqual(self.tweens.active, 0)
+        self.tweens.update()  # Nothing to do
+
+    def test_callbacks_and_easings(self):
+        """Test completion callbacks, retargeting a running tween and custom easing curves."""
+        register_easing("step", lambda t: np.where(t < 1, 0.0, 1.0))
+        done = []
+        stepped = AnimatedValue(0, 0, duration=60, easing="step", tweens=self.tweens)
+        cubic = AnimatedValue(0, 0, duration=60, tweens=self.tweens)
+        stepped.animate_to(5, on_complete=lambda: done.append("stepped"))
+        cubic.animate_to(8)
+        cubic.animate_to(4, on_complete=lambda: done.append("cubic"))
+        self.assertEqual(self.tweens.active, 2)
+        self.clock.now = 0.5
+        self.tweens.update()
+        self.assertEqual(stepped.current, 0)
+        self.assertAlmostEqual(cubic.current, 4 * (1 - 0.5 ** 3))
+        self.clock.now = 1.0
+        self.tweens.update()
+        self.assertEqual(sorted(done), ["cubic", "stepped"])
+        self.assertEqual((stepped.current, cubic.current), (5, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""Shared fonts and a bounded LRU cache of rendered text surfaces.
+
+``get_font`` keeps one ``pygame.font.Font`` per (name, size) for the whole
+process. ``TextCache`` keeps rendered strings keyed on (font, text, color)
+and evicts least recently used surfaces once their pixel memory passes
+``max_bytes``. ``TextCache.shadowed`` composites a string and its drop
+shadows into one cached surface, so a shadowed label is a single blit.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+FontKey = Tuple[Optional[str], int]
+
+DEFAULT_MAX_BYTES = 4 << 20
+
+_fonts: Dict[FontKey, pygame.font.Font] = {}
+
+
+def get_font(size: int, name: Optional[str] = None) -> pygame.font.Font:
+    """The process-wide font for name (None for pygame's default) at size."""
+    if not pygame.font.get_init():
+        # Fonts from before a pygame.quit() cannot be used any more
+        _fonts.clear()
+        pygame.font.init()
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.Font(name, size)
+    return font
+
+
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class TextCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        surface = self._entries.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def _put(self, key, surface: pygame.Surface) -> pygame.Surface:
+        self._entries[key] = surface
+        self.bytes += _surface_bytes(surface)
+        # Keep at least the surface just rendered, even if it alone is over budget
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.bytes -= _surface_bytes(old)
+            self.evictions += 1
+        return surface
+
+    def render(self, size: int, text: str, color: Color, font_name: Optional[str] = None) -> pygame.Surface:
+        """Antialiased text, rendered once per (font, text, color)."""
+        key = ("text", font_name, size, text, tuple(color))
+        surface = self._get(key)
+        if surface is None:
+            surface = self._put(key, get_font(size, font_name).render(text, True, color))
+        return surface
+
+    def shadowed(self, size: int, text: str, color: Color, shadow_color: Color,
+                 offsets: Sequence[Tuple[int, int]], shadow_alpha: int = 255,
+                 font_name: Optional[str] = None) -> pygame.Surface:
+        """Text with its shadows already drawn underneath at offsets.
+
+        The surface is padded equally on every side, so its centre is the
+        centre of the main text and ``get_rect(center=...)`` places it like
+        the plain string.
+        """
+        key = ("shadowed", font_name, size, text, tuple(color), tuple(shadow_color),
+               tuple(offsets), shadow_alpha)
+        surface = self._get(key)
+        if surface is not None:
+            return surface
+        main = self.render(size, text, color, font_name)
+        shadow = get_font(size, font_name).render(text, True, shadow_color)
+        shadow.set_alpha(shadow_alpha)
+        pad = max((max(abs(dx), abs(dy)) for dx, dy in offsets), default=0)
+        surface = pygame.Surface((main.get_width() + 2 * pad, main.get_height() + 2 * pad), pygame.SRCALPHA)
+        for dx, dy in offsets:
+            surface.blit(shadow, (pad + dx, pad + dy))
+        surface.blit(main, (pad, pad))
+        return self._put(key, surface)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+
+_shared_cache = None
+
+
+def shared_text_cache() -> TextCache:
+    """Process-wide cache used by every Button and Game."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TextCache()
+    return _shared_cache
@@ -0,0 +1,115 @@
+"""Bounded transposition table for the alpha-beta search.
+
+Entries are keyed on a symmetry-reduced position key (see
+``bitboard.canonical_key``) and remember the searched value, the remaining
+search depth and whether the value is exact or only a bound.
+"""
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+EXACT = 0
+LOWER = 1  # value is a lower bound (search failed high)
+UPPER = 2  # value is an upper bound (search failed low)
+
+DEFAULT_CAPACITY = 1 << 16
+
+
+class Entry(NamedTuple):
+    value: float
+    depth: int
+    flag: int
+
+
+class TranspositionTable:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def probe(self, key) -> Optional[Entry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(self, key, value, depth, flag):
+        entries = self._entries
+        old = entries.get(key)
+        if old is not None:
+            # Depth-preferred: never replace a deeper result with a shallower one
+            if old.depth > depth:
+                entries.move_to_end(key)
+                return
+        elif len(entries) >= self.capacity:
+            # Least recently used entry goes first
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = Entry(value, depth, flag)
+        entries.move_to_end(key)
+        self.stores += 1
+
+    def lookup(self, key, depth, alpha, beta):
+        """Return (value, alpha, beta); value is set when the entry settles the node."""
+        entry = self.probe(key)
+        if entry is None or entry.depth < depth:
+            return None, alpha, beta
+        if entry.flag == EXACT:
+            return entry.value, alpha, beta
+        if entry.flag == LOWER:
+            alpha = max(alpha, entry.value)
+        else:
+            beta = min(beta, entry.value)
+        if alpha >= beta:
+            return entry.value, alpha, beta
+        return None, alpha, beta
+
+    def record(self, key, value, depth, alpha_orig, beta_orig):
+        if value <= alpha_orig:
+            flag = UPPER
+        elif value >= beta_orig:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.store(key, value, depth, flag)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+
+_shared_table = None
+
+
+def shared_table() -> TranspositionTable:
+    """Process-wide table reused by every Game so later moves hit earlier searches."""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = TranspositionTable()
+    return _shared_table
@@ -0,0 +1,176 @@
+"""Central tween scheduler: every running animation advanced in one NumPy step.
+
+``TweenManager`` keeps only active tweens, packed at the front of parallel
+arrays (start, end, begin time, duration, easing), and ``update`` computes all
+of their values at once from the clock, so progress follows real elapsed time
+rather than frames drawn. Idle values are not in the arrays at all, and a
+manager with nothing running returns immediately.
+
+``AnimatedValue`` is the handle the UI holds. Its ``current`` reads the
+manager's array while a tween runs and a plain float otherwise; setting it
+cancels the tween. Durations are given in frames at ``NOMINAL_FPS`` for
+compatibility with the values tuned before the scheduler existed.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+NOMINAL_FPS = 60
+DEFAULT_EASING = "ease_out_cubic"
+
+EASINGS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda t: t,
+    "ease_in_cubic": lambda t: t ** 3,
+    "ease_out_cubic": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_out_cubic": lambda t: np.where(t < 0.5, 4 * t ** 3, 1 - (2 - 2 * t) ** 3 / 2),
+}
+_easing_names: List[str] = list(EASINGS)
+
+
+def register_easing(name: str, curve: Callable[[np.ndarray], np.ndarray]):
+    """Add an easing curve: a vectorized map of [0, 1] onto [0, 1] with curve(1) == 1."""
+    if name not in EASINGS:
+        _easing_names.append(name)
+    EASINGS[name] = curve
+
+
+class FrameClock:
+    """Clock that only moves on tick(), one nominal frame at a time."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def tick(self):
+        self.frames += 1
+
+    def __call__(self) -> float:
+        return self.frames / NOMINAL_FPS
+
+
+class TweenManager:
+    def __init__(self, capacity: int = 64, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.active = 0
+        self.start = np.zeros(capacity)
+        self.end = np.zeros(capacity)
+        self.begin = np.zeros(capacity)
+        self.duration = np.ones(capacity)
+        self.easing = np.zeros(capacity, dtype=np.int16)
+        self.values = np.zeros(capacity)
+        self._owners: List["AnimatedValue"] = []
+        self._callbacks: List[Optional[Callable[[], None]]] = []
+
+    def _grow(self):
+        for name in ("start", "end", "begin", "duration", "easing", "values"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+
+    def animate(self, owner: "AnimatedValue", start: float, end: float, seconds: float,
+                easing: str = DEFAULT_EASING, on_complete: Optional[Callable[[], None]] = None):
+        """Tween owner from start to end over seconds, replacing any tween it already has."""
+        slot = owner._slot
+        if slot is None:
+            if self.active == len(self.start):
+                self._grow()
+            slot = owner._slot = self.active
+            self.active += 1
+            self._owners.append(owner)
+            self._callbacks.append(on_complete)
+        else:
+            self._callbacks[slot] = on_complete
+        self.start[slot] = self.values[slot] = start
+        self.end[slot] = end
+        self.begin[slot] = self.clock()
+        self.duration[slot] = max(seconds, 1e-9)
+        self.easing[slot] = _easing_names.index(easing)
+
+    def _remove(self, slot: int):
+        # Move the last active tween into the gap so the arrays stay contiguous
+        last = self.active - 1
+        owner = self._owners[slot]
+        owner._slot = None
+        if slot != last:
+            for array in (self.start, self.end, self.begin, self.duration, self.easing, self.values):
+                array[slot] = array[last]
+            moved = self._owners[slot] = self._owners[last]
+            moved._slot = slot
+            self._callbacks[slot] = self._callbacks[last]
+        self._owners.pop()
+        self._callbacks.pop()
+        self.active = last
+
+    def cancel(self, owner: "AnimatedValue"):
+        if owner._slot is not None:
+            self._remove(owner._slot)
+
+    def update(self, now: Optional[float] = None):
+        """Set every active tween's value for time now (the clock by default) and retire finished ones."""
+        count = self.active
+        if not count:
+            return
+        now = self.clock() if now is None else now
+        t = np.clip((now - self.begin[:count]) / self.duration[:count], 0.0, 1.0)
+        codes = self.easing[:count]
+        first = codes[0]
+        if (codes == first).all():
+            eased = EASINGS[_easing_names[first]](t)
+        else:
+            eased = np.empty(count)
+            for code in np.unique(codes):
+                mask = codes == code
+                eased[mask] = EASINGS[_easing_names[code]](t[mask])
+        start = self.start[:count]
+        self.values[:count] = start + (self.end[:count] - start) * eased
+        finished = np.flatnonzero(t >= 1.0)
+        if not len(finished):
+            return
+        callbacks = []
+        # Highest slot first, so swapping the last tween in never moves one still to be retired
+        for slot in finished[::-1].tolist():
+            owner = self._owners[slot]
+            owner._current = float(self.end[slot])
+            if self._callbacks[slot] is not None:
+                callbacks.append(self._callbacks[slot])
+            self._remove(slot)
+        for callback in callbacks:
+            callback()
+
+
+class AnimatedValue:
+    def __init__(self, start=0, end=0, duration=20, easing=DEFAULT_EASING,
+                 tweens: Optional[TweenManager] = None):
+        self.start = start
+        self.end = end
+        self.duration = duration  # Frames at NOMINAL_FPS
+        self.easing = easing
+        # A value made without a manager gets its own, stepped one frame per update()
+        self.tweens = tweens if tweens is not None else TweenManager(capacity=1, clock=FrameClock())
+        self._current = start
+        self._slot: Optional[int] = None
+
+    @property
+    def current(self):
+        if self._slot is None:
+            return self._current
+        return float(self.tweens.values[self._slot])
+
+    @current.setter
+    def current(self, value):
+        self.tweens.cancel(self)
+        self._current = value
+
+    @property
+    def is_animating(self) -> bool:
+        return self._slot is not None
+
+    def animate_to(self, end, on_complete: Optional[Callable[[], None]] = None):
+        self.start = self.current
+        self.end = end
+        self.tweens.animate(self, self.start, end, self.duration / NOMINAL_FPS, self.easing, on_complete)
+
+    def update(self):
+        # Only needed for values without a shared manager; shared ones move in TweenManager.update
+        if isinstance(self.tweens.clock, FrameClock):
+            self.tweens.clock.tick()
+        self.tweens.update()